@@ -1,24 +1,34 @@
 """
 Pipedrive Activities Generator
 Generates CRM activities based on lead form type and trial path
+
+Run with --shards N to write Parquet parts instead, N per form type, generated
+in a process pool with per-shard RNG streams (see form_shards)
 """
 import dlt
-import pandas as pd
 from datetime import datetime, timedelta
-import random
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
+sys.path.append(os.path.dirname(__file__))
 from shared_config import *
+from rng_streams import random_stream, faker_stream
+import input_cache
+from arrow_chunks import arrow_rows, rows_to_table, CHUNK_SIZE
+from table_schemas import arrow_schema, resource_hints
+from form_shards import PURCHASED, form_type_counts, form_fill_total, write_part, run_shards, parse_args, report
 
-from faker import Faker
 
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
+fake = faker_stream('pipedrive', 'activities', seed=SEED)
+rand = random_stream('pipedrive', 'activities', seed=SEED)
 
 SALES_REPS = [1, 2, 3, 4, 5]
 
+ACTIVITIES_SCHEMA = arrow_schema('pipedrive', 'activities')
+
+TRIAL_PATHS = list(TRIAL_CONVERSION_PATHS)
+TRIAL_WEIGHTS = [TRIAL_CONVERSION_PATHS[p]['weight'] for p in TRIAL_PATHS]
+
 # Activity subject templates by type
 ACTIVITY_SUBJECTS = {
     'trial_started': "Trial Account Created - {company}",
@@ -96,9 +106,10 @@ def get_activity_template_for_lead(lead):
     return None
 
 
-def generate_activities_for_lead(lead, activity_id_start):
-    """Generate all activities for a single lead"""
+def generate_activities_for_lead(lead, activity_id_start, rand=rand, faker=fake, now=None):
+    """Generate all activities for a single lead (rand/faker/now default to the shared global state)"""
     activities = []
+    now = now or datetime.now()
     
     # Get activity template
     template_key = get_activity_template_for_lead(lead)
@@ -109,33 +120,33 @@ def generate_activities_for_lead(lead, activity_id_start):
     
     # Lead details
     lead_id = lead.get('id')
-    company = lead.get('company', fake.company())
-    owner_id = lead.get('owner_id', random.choice(SALES_REPS))
-    person_id = lead.get('person_id', random.randint(1000, 999999))
-    org_id = lead.get('organization_id', random.randint(1000, 999999))
+    company = lead.get('company', faker.company())
+    owner_id = lead.get('owner_id', rand.choice(SALES_REPS))
+    person_id = lead.get('person_id', rand.randint(1000, 999999))
+    org_id = lead.get('organization_id', rand.randint(1000, 999999))
     deal_id = None  # Will be set in deals generator
     
     # Parse lead add_time
     try:
         lead_add_time = datetime.fromisoformat(lead.get('add_time').replace('+00:00', '').replace('Z', ''))
     except:
-        lead_add_time = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 30))
+        lead_add_time = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA - 30))
     
     # Generate activities based on template
     activity_id = activity_id_start
     
     for activity_config in activity_template:
         # Check probability
-        if random.random() > activity_config['probability']:
+        if rand.random() > activity_config['probability']:
             continue
         
         # Calculate due date
         days_offset = activity_config['day_offset']
-        due_datetime = lead_add_time + timedelta(days=days_offset, hours=random.randint(9, 17))
+        due_datetime = lead_add_time + timedelta(days=days_offset, hours=rand.randint(9, 17))
         
         # Determine if activity is done (if due date is in the past)
-        is_done = due_datetime < datetime.now()
-        marked_time = due_datetime + timedelta(hours=random.randint(0, 4)) if is_done else None
+        is_done = due_datetime < now
+        marked_time = due_datetime + timedelta(hours=rand.randint(0, 4)) if is_done else None
         
         # Get activity type details
         activity_key = activity_config['type']
@@ -171,15 +182,15 @@ def generate_activities_for_lead(lead, activity_id_start):
             'participants': [{'person_id': person_id, 'primary': True}],
             'attendees': [],
             
-            'conference_meeting_client': 'zoom' if activity_type == 'meeting' and random.random() < 0.8 else None,
-            'conference_meeting_url': f"https://zoom.us/j/{random.randint(100000000, 999999999)}" if activity_type == 'meeting' else None,
+            'conference_meeting_client': 'zoom' if activity_type == 'meeting' and rand.random() < 0.8 else None,
+            'conference_meeting_url': f"https://zoom.us/j/{rand.randint(100000000, 999999999)}" if activity_type == 'meeting' else None,
             'conference_meeting_id': None,
             
-            'public_description': fake.sentence() if random.random() < 0.3 else None,
+            'public_description': faker.sentence() if rand.random() < 0.3 else None,
             'priority': 2 if lead.get('sales_priority') == 'high' else 1,
-            'note': fake.paragraph() if random.random() < 0.4 else None,
+            'note': faker.paragraph() if rand.random() < 0.4 else None,
             
-            '_generated_at': datetime.now().isoformat(),
+            '_generated_at': now.isoformat(),
             '_activity_key': activity_key,
             '_form_type': lead.get('form_type'),
             '_trial_path': lead.get('trial_path'),
@@ -190,7 +201,65 @@ def generate_activities_for_lead(lead, activity_id_start):
     return activities
 
 
-@dlt.resource(write_disposition="append", table_name="activities")
+def mock_leads(form_type, start, stop, rand=rand, faker=fake, start_date=START_DATE):
+    """Mock leads start..stop of one form type (or purchased leads), as generate_activities_for_lead expects"""
+    for i in range(start, stop):
+        if form_type == PURCHASED:
+            yield {
+                'id': f"purchased_{i}",
+                'form_type': 'purchased_lead',
+                'company': faker.company(),
+                'owner_id': rand.choice(SALES_REPS),
+                'person_id': rand.randint(1000, 999999),
+                'organization_id': rand.randint(1000, 999999),
+                'add_time': (start_date + timedelta(days=rand.randint(0, DAYS_OF_DATA - 30))).isoformat(),
+                'sales_priority': 'low',
+                '_source': 'purchased_list',
+            }
+            continue
+        
+        # Determine trial path if trial signup
+        trial_path = None
+        if form_type == 'trial_signup':
+            trial_path = rand.choices(TRIAL_PATHS, weights=TRIAL_WEIGHTS)[0]
+        
+        yield {
+            'id': f"{form_type}_{i}",
+            'form_type': form_type,
+            'trial_path': trial_path,
+            'company': faker.company(),
+            'owner_id': rand.choice(SALES_REPS),
+            'person_id': rand.randint(1000, 999999),
+            'organization_id': rand.randint(1000, 999999),
+            'add_time': (start_date + timedelta(days=rand.randint(0, DAYS_OF_DATA - 1))).isoformat(),
+            'sales_priority': FORM_TYPES[form_type].get('sales_priority', 'medium'),
+        }
+
+
+def activity_shard(shard, n):
+    """Write the activities of one shard's share of n leads of its form type as a Parquet part"""
+    faker = faker_stream(*shard.stream_name, seed=shard.seed)
+    start, stop = shard.bounds(n)
+    
+    def tables():
+        activity_id = shard.id_base + 1
+        rows = []
+        for lead in mock_leads(shard.form_type, start, stop, shard.rand, faker, shard.start_date):
+            lead_activities = generate_activities_for_lead(lead, activity_id, shard.rand, faker, shard.as_of)
+            activity_id += len(lead_activities)
+            rows.extend(lead_activities)
+            if len(rows) >= CHUNK_SIZE:
+                yield rows_to_table(rows, ACTIVITIES_SCHEMA)
+                rows = []
+        if rows:
+            yield rows_to_table(rows, ACTIVITIES_SCHEMA)
+    
+    path = shard.path('activities')
+    return path, write_part(tables(), ACTIVITIES_SCHEMA, path)
+
+
+@dlt.resource(write_disposition="append", **resource_hints('pipedrive', 'activities'))
+@arrow_rows(ACTIVITIES_SCHEMA)
 def activities():
     """Generate CRM activities based on lead form types and trial paths"""
     
@@ -203,71 +272,21 @@ def activities():
     total_activities = 0
     
     # Calculate total leads for each type
-    total_form_fills = sum(get_daily_metrics(d)['identified_leads'] for d in range(DAYS_OF_DATA))
+    total_form_fills = form_fill_total()
     
-    lead_counts = {
-        'trial_signup': int(total_form_fills * 0.35),
-        'demo_request': int(total_form_fills * 0.25),
-        'pricing_inquiry': int(total_form_fills * 0.15),
-        'contact_us': int(total_form_fills * 0.15),
-        'whitepaper_download': int(total_form_fills * 0.07),
-        'newsletter_signup': int(total_form_fills * 0.03),
-    }
+    lead_counts = form_type_counts(total_form_fills)
     
-    # Also add purchased leads
-    print("Loading purchased lead data...")
-    try:
-        byd_df = pd.read_parquet('gs://mock-source-data/customer_data_population/mock_bookyourdata/bookyourdata/1762095548.474671.701ad8b601.parquet')
-        uplead_df = pd.read_parquet('gs://mock-source-data/customer_data_population/mock_upleads/uplead/1762095612.4264941.2fb362f699.parquet')
-        purchased_leads_count = len(byd_df) + len(uplead_df)
-    except:
-        purchased_leads_count = 10000  # Fallback
+    # Also add purchased leads (only their row count is needed)
+    purchased_leads_count = input_cache.purchased_leads_count()
     
     print(f"\nGenerating activities for:")
     print(f"  - Purchased leads: {purchased_leads_count}")
     for form_type, count in lead_counts.items():
         print(f"  - {form_type}: {count}")
     
-    # Generate activities for purchased leads
-    for i in range(purchased_leads_count):
-        mock_lead = {
-            'id': f"purchased_{i}",
-            'form_type': 'purchased_lead',
-            'company': fake.company(),
-            'owner_id': random.choice(SALES_REPS),
-            'person_id': random.randint(1000, 999999),
-            'organization_id': random.randint(1000, 999999),
-            'add_time': (START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 30))).isoformat(),
-            'sales_priority': 'low',
-            '_source': 'purchased_list',
-        }
-        
-        lead_activities = generate_activities_for_lead(mock_lead, activity_id)
-        for activity in lead_activities:
-            yield activity
-            activity_id += 1
-            total_activities += 1
-    
-    # Generate activities for each form type
-    for form_type, count in lead_counts.items():
-        for i in range(count):
-            # Determine trial path if trial signup
-            trial_path = None
-            if form_type == 'trial_signup':
-                trial_path = get_trial_path()
-            
-            mock_lead = {
-                'id': f"{form_type}_{i}",
-                'form_type': form_type,
-                'trial_path': trial_path,
-                'company': fake.company(),
-                'owner_id': random.choice(SALES_REPS),
-                'person_id': random.randint(1000, 999999),
-                'organization_id': random.randint(1000, 999999),
-                'add_time': (START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 1))).isoformat(),
-                'sales_priority': FORM_TYPES[form_type].get('sales_priority', 'medium'),
-            }
-            
+    # Generate activities for purchased leads, then each form type
+    for form_type, count in {PURCHASED: purchased_leads_count, **lead_counts}.items():
+        for mock_lead in mock_leads(form_type, 0, count):
             lead_activities = generate_activities_for_lead(mock_lead, activity_id)
             for activity in lead_activities:
                 yield activity
@@ -287,12 +306,17 @@ def activities():
 
 
 if __name__ == "__main__":
-    pipeline = dlt.pipeline(
-        pipeline_name="pipedrive_activities",
-        destination="filesystem",
-        dataset_name="pipedrive"
-    )
-    
-    load_info = pipeline.run(activities(), loader_file_format="parquet")
-    
-    print(f"\n✓ Activities: generated based on form types and trial paths")
\ No newline at end of file
+    args = parse_args(__doc__)
+    if args.shards:
+        counts = {PURCHASED: input_cache.purchased_leads_count(), **form_type_counts(form_fill_total())}
+        report(run_shards(activity_shard, counts, args), 'activities')
+    else:
+        pipeline = dlt.pipeline(
+            pipeline_name="pipedrive_activities",
+            destination="filesystem",
+            dataset_name="pipedrive"
+        )
+        
+        load_info = pipeline.run(activities(), loader_file_format="parquet")
+        
+        print(f"\n✓ Activities: generated based on form types and trial paths")
\ No newline at end of file
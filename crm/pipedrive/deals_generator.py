@@ -5,17 +5,17 @@ Creates deals linked to product SKUs with proper timing based on trial paths
 import dlt
 import pandas as pd
 from datetime import datetime, timedelta
-import random
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
 from shared_config import *
+from rng_streams import random_stream, faker_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-from faker import Faker
 
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
+fake = faker_stream('pipedrive', 'deals', seed=SEED)
+rand = random_stream('pipedrive', 'deals', seed=SEED)
 
 SALES_REPS = [1, 2, 3, 4, 5]
 
@@ -39,14 +39,15 @@ def calculate_deal_value(product, billing_interval='monthly'):
         return product['price_monthly'] / 100
 
 
-@dlt.resource(write_disposition="append", table_name="deals")
+@dlt.resource(write_disposition="append", table_name="deals", **resource_hints('pipedrive', 'deals'))
+@arrow_rows(arrow_schema('pipedrive', 'deals'))
 def deals():
     """Generate deals from trial conversions and other form conversions"""
     
     deal_id = 1
     
     # Calculate expected conversions
-    total_form_fills = sum(get_daily_metrics(d)['identified_leads'] for d in range(DAYS_OF_DATA))
+    total_form_fills = metric_total('identified_leads')
     
     # Trial conversions
     trial_signups = int(total_form_fills * 0.35)
@@ -83,10 +84,10 @@ def deals():
     
     for _ in range(trial_ss_conversions):
         # Trial starts randomly across year
-        trial_start = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 20))
+        trial_start = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA - 20))
         
         # Self-service converts on average day 12
-        conversion_day = int(random.gauss(12, 2))
+        conversion_day = int(rand.gauss(12, 2))
         conversion_day = max(10, min(16, conversion_day))  # Between 10-16 days
         
         conversion_time = trial_start + timedelta(days=conversion_day)
@@ -96,13 +97,13 @@ def deals():
         won_time = conversion_time
         
         # Select product tier (self-service leans lower)
-        product = select_product_tier('self_service')
+        product = select_product_tier('self_service', rand=rand)
         
         # Billing interval (85% monthly, 15% annual)
-        billing_interval = 'annual' if random.random() < 0.15 else 'monthly'
+        billing_interval = 'annual' if rand.random() < 0.15 else 'monthly'
         value = calculate_deal_value(product, billing_interval)
         
-        owner = random.choice(SALES_REPS)
+        owner = rand.choice(SALES_REPS)
         
         yield {
             'id': deal_id,
@@ -110,8 +111,8 @@ def deals():
             'creator_user_id': 99,  # System/automated
             'owner_id': owner,
             'value': round(value, 2),
-            'person_id': random.randint(1000, 999999),
-            'org_id': random.randint(1000, 999999),
+            'person_id': rand.randint(1000, 999999),
+            'org_id': rand.randint(1000, 999999),
             'stage_id': STAGES['closed_won']['id'],
             'pipeline_id': 1,
             'currency': 'USD',
@@ -135,7 +136,7 @@ def deals():
             'label_ids': [1, 2],
             'origin': 'API',
             'origin_id': None,
-            'channel': random.choice([52, 53, 54]),
+            'channel': rand.choice([52, 53, 54]),
             'channel_id': 'Trial Self-Service',
             
             # Revenue metrics
@@ -144,13 +145,13 @@ def deals():
             'mrr': round(value, 2) if billing_interval == 'monthly' else round(value / 12, 2),
             
             'next_activity_id': None,
-            'last_activity_id': random.randint(1, 500000),
+            'last_activity_id': rand.randint(1, 500000),
             'first_won_time': won_time.isoformat(),
             'products_count': 1,
-            'files_count': random.randint(0, 3),
-            'notes_count': random.randint(1, 5),
+            'files_count': rand.randint(0, 3),
+            'notes_count': rand.randint(1, 5),
             'followers_count': 1,
-            'email_messages_count': random.randint(3, 8),  # Just automated emails
+            'email_messages_count': rand.randint(3, 8),  # Just automated emails
             'activities_count': 1,  # Just trial_started
             'done_activities_count': 1,
             'undone_activities_count': 0,
@@ -178,25 +179,25 @@ def deals():
     
     for _ in range(trial_sa_conversions):
         # Trial starts randomly across year
-        trial_start = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 20))
+        trial_start = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA - 20))
         
         # Deal is created ON TRIAL START (progresses through stages)
         add_time = trial_start
         
         # Sales-assisted converts on average day 14
-        conversion_day = int(random.gauss(14, 1))
+        conversion_day = int(rand.gauss(14, 1))
         conversion_day = max(12, min(16, conversion_day))
         
         won_time = trial_start + timedelta(days=conversion_day)
         
         # Select product tier (sales-assisted leans higher)
-        product = select_product_tier('sales_assisted')
+        product = select_product_tier('sales_assisted', rand=rand)
         
         # Billing interval (70% monthly, 30% annual for sales-assisted)
-        billing_interval = 'annual' if random.random() < 0.30 else 'monthly'
+        billing_interval = 'annual' if rand.random() < 0.30 else 'monthly'
         value = calculate_deal_value(product, billing_interval)
         
-        owner = random.choice(SALES_REPS)
+        owner = rand.choice(SALES_REPS)
         
         yield {
             'id': deal_id,
@@ -204,8 +205,8 @@ def deals():
             'creator_user_id': owner,
             'owner_id': owner,
             'value': round(value, 2),
-            'person_id': random.randint(1000, 999999),
-            'org_id': random.randint(1000, 999999),
+            'person_id': rand.randint(1000, 999999),
+            'org_id': rand.randint(1000, 999999),
             'stage_id': STAGES['closed_won']['id'],
             'pipeline_id': 1,
             'currency': 'USD',
@@ -229,7 +230,7 @@ def deals():
             'label_ids': [1, 2, 3],
             'origin': 'API',
             'origin_id': None,
-            'channel': random.choice([52, 53, 54]),
+            'channel': rand.choice([52, 53, 54]),
             'channel_id': 'Trial Sales-Assisted',
             
             # Revenue metrics
@@ -238,17 +239,17 @@ def deals():
             'mrr': round(value, 2) if billing_interval == 'monthly' else round(value / 12, 2),
             
             'next_activity_id': None,
-            'last_activity_id': random.randint(1, 500000),
+            'last_activity_id': rand.randint(1, 500000),
             'first_won_time': won_time.isoformat(),
             'products_count': 1,
-            'files_count': random.randint(2, 10),
-            'notes_count': random.randint(8, 20),
-            'followers_count': random.randint(1, 3),
-            'email_messages_count': random.randint(15, 40),
-            'activities_count': random.randint(10, 15),
-            'done_activities_count': random.randint(10, 15),
+            'files_count': rand.randint(2, 10),
+            'notes_count': rand.randint(8, 20),
+            'followers_count': rand.randint(1, 3),
+            'email_messages_count': rand.randint(15, 40),
+            'activities_count': rand.randint(10, 15),
+            'done_activities_count': rand.randint(10, 15),
             'undone_activities_count': 0,
-            'participants_count': random.randint(2, 4),
+            'participants_count': rand.randint(2, 4),
             'last_incoming_mail_time': (won_time - timedelta(days=1)).isoformat(),
             'last_outgoing_mail_time': won_time.isoformat(),
             
@@ -280,22 +281,22 @@ def deals():
     for form_type, count, channel_name in other_conversions:
         for _ in range(count):
             # Form submission date
-            form_date = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 60))
+            form_date = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA - 60))
             
             # Deal created shortly after form submission
-            add_time = form_date + timedelta(days=random.randint(0, 3))
+            add_time = form_date + timedelta(days=rand.randint(0, 3))
             
             # Won after 20-45 days
-            won_time = add_time + timedelta(days=random.randint(20, 45))
+            won_time = add_time + timedelta(days=rand.randint(20, 45))
             
             # Product selection (mix of tiers)
-            product = select_product_tier()
+            product = select_product_tier(rand=rand)
             
             # Billing interval
-            billing_interval = 'annual' if random.random() < 0.20 else 'monthly'
+            billing_interval = 'annual' if rand.random() < 0.20 else 'monthly'
             value = calculate_deal_value(product, billing_interval)
             
-            owner = random.choice(SALES_REPS)
+            owner = rand.choice(SALES_REPS)
             
             yield {
                 'id': deal_id,
@@ -303,8 +304,8 @@ def deals():
                 'creator_user_id': owner,
                 'owner_id': owner,
                 'value': round(value, 2),
-                'person_id': random.randint(1000, 999999),
-                'org_id': random.randint(1000, 999999),
+                'person_id': rand.randint(1000, 999999),
+                'org_id': rand.randint(1000, 999999),
                 'stage_id': STAGES['closed_won']['id'],
                 'pipeline_id': 1,
                 'currency': 'USD',
@@ -328,7 +329,7 @@ def deals():
                 'label_ids': [1, 2],
                 'origin': 'API',
                 'origin_id': None,
-                'channel': random.choice([52, 53, 54]),
+                'channel': rand.choice([52, 53, 54]),
                 'channel_id': channel_name,
                 
                 # Revenue metrics
@@ -337,18 +338,18 @@ def deals():
                 'mrr': round(value, 2) if billing_interval == 'monthly' else round(value / 12, 2),
                 
                 'next_activity_id': None,
-                'last_activity_id': random.randint(1, 500000),
+                'last_activity_id': rand.randint(1, 500000),
                 'first_won_time': won_time.isoformat(),
                 'products_count': 1,
-                'files_count': random.randint(1, 8),
-                'notes_count': random.randint(5, 15),
-                'followers_count': random.randint(1, 2),
-                'email_messages_count': random.randint(10, 30),
-                'activities_count': random.randint(6, 12),
-                'done_activities_count': random.randint(6, 12),
+                'files_count': rand.randint(1, 8),
+                'notes_count': rand.randint(5, 15),
+                'followers_count': rand.randint(1, 2),
+                'email_messages_count': rand.randint(10, 30),
+                'activities_count': rand.randint(6, 12),
+                'done_activities_count': rand.randint(6, 12),
                 'undone_activities_count': 0,
-                'participants_count': random.randint(1, 3),
-                'last_incoming_mail_time': (won_time - timedelta(days=random.randint(1, 3))).isoformat(),
+                'participants_count': rand.randint(1, 3),
+                'last_incoming_mail_time': (won_time - timedelta(days=rand.randint(1, 3))).isoformat(),
                 'last_outgoing_mail_time': won_time.isoformat(),
                 
                 # Custom fields
@@ -371,18 +372,18 @@ def deals():
     
     for _ in range(lost_deals_count):
         # Deal started
-        add_time = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 60))
+        add_time = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA - 60))
         
         # Lost after 15-45 days
-        lost_time = add_time + timedelta(days=random.randint(15, 45))
+        lost_time = add_time + timedelta(days=rand.randint(15, 45))
         
         # Product selection
-        product = select_product_tier()
+        product = select_product_tier(rand=rand)
         billing_interval = 'monthly'
         value = calculate_deal_value(product, billing_interval)
         
-        owner = random.choice(SALES_REPS)
-        lost_reason = random.choice(LOST_REASONS)
+        owner = rand.choice(SALES_REPS)
+        lost_reason = rand.choice(LOST_REASONS)
         
         yield {
             'id': deal_id,
@@ -390,8 +391,8 @@ def deals():
             'creator_user_id': owner,
             'owner_id': owner,
             'value': round(value, 2),
-            'person_id': random.randint(1000, 999999),
-            'org_id': random.randint(1000, 999999),
+            'person_id': rand.randint(1000, 999999),
+            'org_id': rand.randint(1000, 999999),
             'stage_id': STAGES['closed_lost']['id'],
             'pipeline_id': 1,
             'currency': 'USD',
@@ -415,8 +416,8 @@ def deals():
             'label_ids': [1],
             'origin': 'API',
             'origin_id': None,
-            'channel': random.choice([52, 53, 54]),
-            'channel_id': random.choice(['Trial', 'Demo Request', 'Pricing Inquiry']),
+            'channel': rand.choice([52, 53, 54]),
+            'channel_id': rand.choice(['Trial', 'Demo Request', 'Pricing Inquiry']),
             
             # Revenue metrics (lost = 0)
             'acv': 0,
@@ -424,18 +425,18 @@ def deals():
             'mrr': 0,
             
             'next_activity_id': None,
-            'last_activity_id': random.randint(1, 500000),
+            'last_activity_id': rand.randint(1, 500000),
             'first_won_time': None,
             'products_count': 0,
-            'files_count': random.randint(0, 5),
-            'notes_count': random.randint(3, 10),
+            'files_count': rand.randint(0, 5),
+            'notes_count': rand.randint(3, 10),
             'followers_count': 1,
-            'email_messages_count': random.randint(5, 15),
-            'activities_count': random.randint(4, 10),
-            'done_activities_count': random.randint(4, 10),
+            'email_messages_count': rand.randint(5, 15),
+            'activities_count': rand.randint(4, 10),
+            'done_activities_count': rand.randint(4, 10),
             'undone_activities_count': 0,
-            'participants_count': random.randint(1, 2),
-            'last_incoming_mail_time': (lost_time - timedelta(days=random.randint(3, 10))).isoformat(),
+            'participants_count': rand.randint(1, 2),
+            'last_incoming_mail_time': (lost_time - timedelta(days=rand.randint(3, 10))).isoformat(),
             'last_outgoing_mail_time': lost_time.isoformat(),
             
             # Custom fields
@@ -445,7 +446,7 @@ def deals():
             'trial_path': None,
             'trial_start_date': None,
             'conversion_day': None,
-            'source_form_type': random.choice(['trial_signup', 'demo_request', 'pricing_inquiry']),
+            'source_form_type': rand.choice(['trial_signup', 'demo_request', 'pricing_inquiry']),
             
             '_generated_at': datetime.now().isoformat(),
             '_deal_type': 'lost',
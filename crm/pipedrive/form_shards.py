@@ -0,0 +1,143 @@
+"""
+Sharded generation of CRM form-fill leads and activities
+Each form type's leads are split into N shards. Every shard draws from its own
+named RNG streams, keyed by (seed, form type, shard index), runs in a process pool
+and writes its own Parquet part: <output>/<table>/<form_type>.part-<i>.parquet.
+Sharded runs are anchored on an --as-of time (default: today at midnight)
+instead of the wall clock, so parts for a given seed, shard count and as-of
+are byte-reproducible whatever the worker count or scheduling
+"""
+import argparse
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
+from shared_config import SEED, DAYS_OF_DATA, metric_total
+from rng_streams import stream, random_stream
+
+SHARD_DIR = os.path.join('output', 'pipedrive')
+
+# Integer ids reserved per shard (activities), so shard id ranges never overlap
+ID_SPAN = 10**9
+
+PURCHASED = 'purchased_lead'
+
+# Share of form-fill leads by form type
+FORM_SHARES = {
+    'trial_signup': 0.35,
+    'demo_request': 0.25,
+    'pricing_inquiry': 0.15,
+    'contact_us': 0.15,
+    'whitepaper_download': 0.07,
+    'newsletter_signup': 0.03,
+}
+FORM_ORDER = [PURCHASED] + list(FORM_SHARES)
+
+
+def today() -> datetime:
+    return datetime.combine(date.today(), time())
+
+
+def form_type_counts(total_form_fills: int) -> Dict[str, int]:
+    """Form-fill leads per form type"""
+    return {form_type: int(total_form_fills * share) for form_type, share in FORM_SHARES.items()}
+
+
+def form_fill_total() -> int:
+    """Form-fill leads across all days"""
+    return metric_total('identified_leads')
+
+
+@dataclass
+class FormShard:
+    """One slice of one form type's leads, with its own RNG streams"""
+    form_type: str
+    index: int = 0
+    count: int = 1
+    seed: int = SEED
+    as_of: datetime = field(default_factory=today)
+    directory: str = SHARD_DIR
+    rng: np.random.Generator = field(init=False, repr=False)
+    rand: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.rng = stream(*self.stream_name, seed=self.seed)
+        self.rand = random_stream(*self.stream_name, seed=self.seed)  # for row-at-a-time generators
+
+    @property
+    def stream_name(self) -> Tuple:
+        """rng_streams name of this shard (generators may derive further streams from it)"""
+        return ('pipedrive', 'form_shards', self.form_type, self.index)
+
+    @property
+    def start_date(self) -> datetime:
+        """First day of the simulated window ending at as_of"""
+        return self.as_of - timedelta(days=DAYS_OF_DATA)
+
+    @property
+    def id_base(self) -> int:
+        """Ids issued by this shard start above this value"""
+        return (FORM_ORDER.index(self.form_type) * self.count + self.index) * ID_SPAN
+
+    def bounds(self, n: int) -> Tuple[int, int]:
+        """(start, stop) of this shard's share of n leads"""
+        size, extra = divmod(n, self.count)
+        start = self.index * size + min(self.index, extra)
+        return start, start + size + (1 if self.index < extra else 0)
+
+    def path(self, table: str) -> str:
+        return os.path.join(self.directory, table, f"{self.form_type}.part-{self.index}.parquet")
+
+
+def write_part(tables: Iterable[pa.Table], schema: pa.Schema, path: str) -> int:
+    """Write one shard's chunks as a single Parquet part; returns the row count"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = 0
+    with pq.ParquetWriter(f"{path}.tmp", schema) as writer:
+        for table in tables:
+            writer.write_table(table)
+            rows += table.num_rows
+    os.replace(f"{path}.tmp", path)
+    return rows
+
+
+def run_shards(task: Callable[[FormShard, int], Tuple[str, int]], counts: Dict[str, int],
+               args: argparse.Namespace) -> List[Tuple[str, int]]:
+    """task(shard, n) for every shard of every form type, in a process pool when workers > 1"""
+    jobs = [
+        (FormShard(form_type, i, args.shards, args.seed, args.as_of, args.output), n)
+        for form_type, n in counts.items()
+        for i in range(args.shards)
+    ]
+    workers = args.workers or min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1:
+        return [task(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(task, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def parse_args(description: str) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=description.strip().splitlines()[0])
+    parser.add_argument("--shards", type=int, default=None,
+                        help="write Parquet parts in N shards per form type instead of loading through dlt")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process pool size (default: one per shard, capped at CPU count)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--as-of", type=datetime.fromisoformat, default=today(),
+                        help="end of the simulated window and _generated_at of sharded rows (default: today 00:00)")
+    parser.add_argument("--output", default=SHARD_DIR, help="root directory for Parquet parts")
+    return parser.parse_args()
+
+
+def report(results: Sequence[Tuple[str, int]], table: str):
+    print(f"\n✓ {sum(rows for _, rows in results):,} {table} in {len(results)} Parquet part(s)")
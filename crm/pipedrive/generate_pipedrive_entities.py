@@ -5,18 +5,21 @@ Completes the Amplitude → Stripe → Pipedrive data pipeline
 ENHANCED: Journey-specific activity sequences based on user behavior
 """
 import polars as pl
-from datetime import datetime, timedelta
-import random
+import numpy as np
+from datetime import datetime
 import os
 import sys
-from faker import Faker
 
 # Add amplitude directory to path for shared_config
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics', 'amplitude'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics'))
+from rng_streams import stream, random_stream, faker_stream
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
+SEED = 42
+
+fake = faker_stream('pipedrive', 'entities', seed=SEED)
+rand = random_stream('pipedrive', 'entities', seed=SEED)
+rng = stream('pipedrive', 'entities', seed=SEED)
 
 print("="*80)
 print("PIPEDRIVE ENTITIES GENERATOR: PERSONS, ORGANIZATIONS, ACTIVITIES")
@@ -106,38 +109,121 @@ HIGH_TOUCH_PLG_SEQUENCE = [
     {'type_id': 1, 'type': 'Call', 'subject': 'Plan selection and conversion', 'duration': '00:30:00', 'note': 'Discussed options, answered billing questions, converted to paid plan!', 'day_offset': None},  # Won date
 ]
 
-def determine_journey_type(user, deal_duration_days):
-    """
-    Determine which sales motion to use based on user characteristics
-    Returns: (sequence, journey_name)
-    """
-    demo_requested = user.get('demo_requested_date') is not None
-    trial_started = user.get('trial_started_date') is not None
-    engagement = user.get('engagement_tier', 'low_engagement')
-    total_sessions = user.get('total_sessions', 0)
-    
-    # Get deal value to determine enterprise vs SMB
-    deal_value = user.get('arr', 0) if 'arr' in user else 0
-    
-    # Enterprise deals (high value or long sales cycle)
-    if deal_value >= 10000 or deal_duration_days >= 60:
-        return ENTERPRISE_SEQUENCE, 'enterprise'
-    
-    # Sales-led motion (demo requested)
-    elif demo_requested:
-        return SALES_LED_SEQUENCE, 'sales_led'
-    
-    # High-touch PLG (high engagement trial users)
-    elif trial_started and engagement in ['high_engagement', 'very_high_engagement'] and total_sessions >= 5:
-        return HIGH_TOUCH_PLG_SEQUENCE, 'high_touch_plg'
-    
-    # Low-touch PLG (self-service)
-    elif trial_started:
-        return PRODUCT_LED_SEQUENCE, 'product_led'
-    
-    # Default to product-led for others
-    else:
-        return PRODUCT_LED_SEQUENCE, 'product_led_default'
+# Sequence played out for each journey type
+JOURNEY_SEQUENCES = {
+    'enterprise': ENTERPRISE_SEQUENCE,
+    'sales_led': SALES_LED_SEQUENCE,
+    'high_touch_plg': HIGH_TOUCH_PLG_SEQUENCE,
+    'product_led': PRODUCT_LED_SEQUENCE,
+    'product_led_default': PRODUCT_LED_SEQUENCE,
+}
+
+# Columnar template table: one row per (journey_type, step); closing steps
+# have null offsets and land on the won date
+ACTIVITY_TEMPLATES = pl.DataFrame(
+    [
+        {
+            'journey_type': journey_type,
+            'step': step,
+            'type_id': template['type_id'],
+            'type': template['type'],
+            'subject': template['subject'],
+            'duration': template['duration'],
+            'note': template['note'],
+            'min_offset': template['day_offset'][0] if template['day_offset'] else None,
+            'max_offset': template['day_offset'][1] if template['day_offset'] else None,
+        }
+        for journey_type, sequence in JOURNEY_SEQUENCES.items()
+        for step, template in enumerate(sequence)
+    ],
+    schema={
+        'journey_type': pl.String, 'step': pl.Int64, 'type_id': pl.Int64, 'type': pl.String,
+        'subject': pl.String, 'duration': pl.String, 'note': pl.String,
+        'min_offset': pl.Int64, 'max_offset': pl.Int64,
+    },
+)
+
+# Pending follow-up scheduled for active customers, by journey type
+FOLLOW_UPS = pl.DataFrame({
+    'journey_type': list(JOURNEY_SEQUENCES),
+    'subject': [
+        'Quarterly business review with executive team',
+        'Success check-in call',
+        'Success check-in call',
+        'Customer health check',
+        'Customer health check',
+    ],
+    'note': [
+        'Scheduled QBR to review adoption metrics, ROI, and discuss expansion opportunities',
+        'Quarterly check-in to discuss usage, satisfaction, and identify upsell opportunities',
+        'Quarterly check-in to discuss usage, satisfaction, and identify upsell opportunities',
+        'Quick check-in to ensure customer is getting value and address any questions',
+        'Quick check-in to ensure customer is getting value and address any questions',
+    ],
+})
+
+HIGH_TIERS = ['high_engagement', 'very_high_engagement']
+JOURNEY_FIELDS = ['demo_requested_date', 'trial_started_date', 'engagement_tier', 'total_sessions']
+
+
+def journey_type():
+    """Sales motion per deal from user characteristics, deal value and sales cycle length"""
+    demo_requested = pl.col('user__demo_requested_date').is_not_null()
+    trial_started = pl.col('user__trial_started_date').is_not_null()
+    high_touch = pl.col('user__engagement_tier').is_in(HIGH_TIERS) & (pl.col('user__total_sessions') >= 5)
+    return (
+        # Enterprise deals (high value or long sales cycle)
+        pl.when((pl.col('deal_arr') >= 10000) | (pl.col('deal_duration_days') >= 60)).then(pl.lit('enterprise'))
+        # Sales-led motion (demo requested)
+        .when(demo_requested).then(pl.lit('sales_led'))
+        # High-touch PLG (high engagement trial users)
+        .when(trial_started & high_touch).then(pl.lit('high_touch_plg'))
+        # Low-touch PLG (self-service)
+        .when(trial_started).then(pl.lit('product_led'))
+        # Default to product-led for others
+        .otherwise(pl.lit('product_led_default'))
+    )
+
+
+def random_owners(n):
+    return pl.Series('activity_owner_id', np.array([r['id'] for r in SALES_REPS])[rng.integers(0, len(SALES_REPS), n)])
+
+
+def activity_records(frame, done, timestamp):
+    """Project expanded deal × template rows onto the Pipedrive activity layout"""
+    return frame.select([
+        'deal_index',
+        'step',
+        pl.col('owner_id').alias('company_id'),  # Company that owns the activity
+        pl.col('type'),
+        pl.col('type_id'),
+        pl.col('subject'),
+        pl.lit(done).alias('done'),
+        pl.col('due_date').dt.strftime('%Y-%m-%d').alias('due_date'),
+        pl.lit('14:00').alias('due_time'),  # Default to 2pm
+        pl.col('duration'),
+        pl.col('activity_owner_id').alias('user_id'),
+        pl.col('activity_owner_id').alias('owner_id'),
+        pl.col('id').alias('deal_id'),
+        pl.col('person_id'),
+        pl.col('org_id'),
+        pl.col('note'),
+        (timestamp if done else pl.lit(None, dtype=pl.String)).alias('marked_as_done_time'),
+
+        # Timestamps
+        timestamp.alias('add_time'),
+        timestamp.alias('update_time'),
+
+        # Tracking
+        pl.col('device_id'),
+        pl.col('title').alias('deal_title'),
+        pl.col('product_sku'),
+        pl.col('journey_type'),  # Track which journey this came from
+
+        pl.lit(GENERATED_AT).alias('_generated_at'),
+        pl.lit('amplitude').alias('_source'),
+    ])
+
 
 # Company size distribution
 COMPANY_SIZES = [
@@ -156,6 +242,8 @@ INDUSTRIES = [
     'Retail', 'Real Estate', 'Media', 'Telecommunications', 'Transportation'
 ]
 
+GENERATED_AT = datetime.now().isoformat()
+
 # ==========================================
 # 1. GENERATE ORGANIZATIONS (from email domains)
 # ==========================================
@@ -198,14 +286,14 @@ for domain_row in domain_stats.iter_rows(named=True):
     domain_clean = domain_clean.replace('.', ' ').title()
     
     # Assign random industry and size
-    industry = random.choice(INDUSTRIES)
-    company_size = random.choices(
+    industry = rand.choice(INDUSTRIES)
+    company_size = rand.choices(
         [s[0] for s in COMPANY_SIZES],
         weights=[s[1] for s in COMPANY_SIZES]
     )[0]
     
     # Assign owner (sales rep)
-    owner = random.choice(SALES_REPS)
+    owner = rand.choice(SALES_REPS)
     
     # Generate address
     address = fake.address().replace('\n', ', ')
@@ -224,7 +312,7 @@ for domain_row in domain_stats.iter_rows(named=True):
     else:
         value_multiplier = 1
     
-    base_value = random.randint(5000, 20000)
+    base_value = rand.randint(5000, 20000)
     estimated_value = base_value * value_multiplier * domain_row['user_count']
     
     organizations_list.append({
@@ -233,7 +321,7 @@ for domain_row in domain_stats.iter_rows(named=True):
         'owner_id': owner['id'],
         'visible_to': '3',  # 3 = Entire company
         'address': address,
-        'label': random.choice(['Hot', 'Warm', 'Cold', None]),
+        'label': rand.choice(['Hot', 'Warm', 'Cold', None]),
         
         # Custom fields
         'company_domain': domain,
@@ -277,10 +365,12 @@ print("="*80)
 
 persons_list = []
 person_id = 1
-device_to_person_id = {}  # Map device_id → person_id
 
 identified_users_with_domain = identified_users.with_columns([
-    pl.col('email').str.split('@').list.get(1).alias('email_domain')
+    pl.col('email').str.split('@').list.get(1).alias('email_domain'),
+    # Funnel dates are typed; persons carry ISO strings like organizations do
+    pl.col('first_visit_date').dt.strftime('%Y-%m-%d'),
+    pl.col('last_active_date').dt.strftime('%Y-%m-%d'),
 ])
 
 print(f"\nCreating {len(identified_users):,} persons...")
@@ -301,7 +391,7 @@ for user in identified_users_with_domain.iter_rows(named=True):
         last_name = ''
     
     # Assign owner (sales rep)
-    owner = random.choice(SALES_REPS)
+    owner = rand.choice(SALES_REPS)
     
     # Generate phone
     phone = fake.phone_number()
@@ -351,7 +441,6 @@ for user in identified_users_with_domain.iter_rows(named=True):
         '_source': 'amplitude',
     })
     
-    device_to_person_id[user['device_id']] = person_id
     person_id += 1
 
 persons_df = pl.DataFrame(persons_list)
@@ -366,167 +455,87 @@ print("\n" + "="*80)
 print("GENERATING ACTIVITIES")
 print("="*80)
 
-activities_list = []
-activity_id = 1
-
 # Generate activities for each deal (won customers)
 print(f"\nCreating activities for {len(deals):,} deals...")
 
-# Track journey type distribution
-journey_counts = {}
+# Resolve deal → person → org once with keyed joins instead of scanning
+# persons and users for every deal
+person_index = persons_df.select([
+    pl.col('device_id'),
+    pl.col('id').alias('person_id'),
+    pl.col('org_id'),
+]).unique(subset='device_id', keep='first', maintain_order=True)
+
+user_index = (users
+    .unique(subset='device_id', keep='first', maintain_order=True)
+    .select(['device_id'] + [
+        (pl.col(c) if c in users.columns else pl.lit(None)).alias(f'user__{c}') for c in JOURNEY_FIELDS
+    ])
+)
 
-for deal in deals.iter_rows(named=True):
-    device_id = deal['device_id']
-    person_id = device_to_person_id.get(device_id)
-    
-    if not person_id:
-        continue
-    
-    # Get org_id from person
-    matching_person = [p for p in persons_list if p['device_id'] == device_id]
-    if not matching_person:
-        continue
-    org_id = matching_person[0]['org_id']
-    
-    # Get user data for journey determination
-    matching_user = users.filter(pl.col('device_id') == device_id)
-    if matching_user.height == 0:
-        continue
-    user_data = matching_user.to_dicts()[0]
-    
-    # Add deal data to user context
-    user_data['arr'] = deal.get('arr', 0)
-    
-    # Timeline: from add_time to won_time
-    deal_start = datetime.fromisoformat(deal['add_time'])
-    deal_won = datetime.fromisoformat(deal['won_time'])
-    deal_duration_days = (deal_won - deal_start).days
-    
-    # Assign owner
-    owner = random.choice(SALES_REPS)
-    
-    # Determine journey-specific sequence
-    activity_sequence_template, journey_type = determine_journey_type(user_data, deal_duration_days)
-    
-    # Track journey distribution
-    journey_counts[journey_type] = journey_counts.get(journey_type, 0) + 1
-    
-    # Generate activities from template
-    activity_sequence = []
-    
-    for activity_template in activity_sequence_template:
-        # Calculate due date
-        if activity_template['day_offset'] is None:
-            # Closing activity - use won date
-            due_date = deal_won.date().isoformat()
-        else:
-            # Calculate offset from deal start
-            min_offset, max_offset = activity_template['day_offset']
-            # Ensure offset doesn't exceed deal duration
-            max_offset = min(max_offset, deal_duration_days - 1) if deal_duration_days > 1 else 0
-            min_offset = min(min_offset, max_offset)
-            
-            if min_offset <= max_offset:
-                offset_days = random.randint(min_offset, max_offset)
-                due_date = (deal_start + timedelta(days=offset_days)).date().isoformat()
-            else:
-                # Skip this activity if timing doesn't work
-                continue
-        
-        activity_sequence.append({
-            'type_id': activity_template['type_id'],
-            'type_name': activity_template['type'],
-            'subject': activity_template['subject'],
-            'done': True,
-            'due_date': due_date,
-            'duration': activity_template['duration'],
-            'note': activity_template['note'],
-        })
-    
-    # Create activity records
-    for activity_data in activity_sequence:
-        activity_time = datetime.fromisoformat(activity_data['due_date'])
-        
-        activities_list.append({
-            'id': activity_id,
-            'company_id': deal['owner_id'],  # Company that owns the activity
-            'type': activity_data['type_name'],
-            'type_id': activity_data['type_id'],
-            'subject': activity_data['subject'],
-            'done': activity_data['done'],
-            'due_date': activity_data['due_date'],
-            'due_time': '14:00',  # Default to 2pm
-            'duration': activity_data['duration'],
-            'user_id': owner['id'],
-            'owner_id': owner['id'],
-            'deal_id': deal['id'],
-            'person_id': person_id,
-            'org_id': org_id,
-            'note': activity_data['note'],
-            'marked_as_done_time': activity_time.isoformat() if activity_data['done'] else None,
-            
-            # Timestamps
-            'add_time': activity_time.isoformat(),
-            'update_time': activity_time.isoformat(),
-            
-            # Tracking
-            'device_id': device_id,
-            'deal_title': deal['title'],
-            'product_sku': deal['product_sku'],
-            'journey_type': journey_type,  # Track which journey this came from
-            
-            '_generated_at': datetime.now().isoformat(),
-            '_source': 'amplitude',
-        })
-        
-        activity_id += 1
-    
-    # Add a few ongoing activities (not done) for active customers
-    if random.random() < 0.3:  # 30% of customers have future activities
-        future_date = datetime.now() + timedelta(days=random.randint(7, 30))
-        
-        # Future activity type depends on journey
-        if journey_type == 'enterprise':
-            future_subject = 'Quarterly business review with executive team'
-            future_note = 'Scheduled QBR to review adoption metrics, ROI, and discuss expansion opportunities'
-        elif journey_type in ['sales_led', 'high_touch_plg']:
-            future_subject = 'Success check-in call'
-            future_note = 'Quarterly check-in to discuss usage, satisfaction, and identify upsell opportunities'
-        else:
-            future_subject = 'Customer health check'
-            future_note = 'Quick check-in to ensure customer is getting value and address any questions'
-        
-        activities_list.append({
-            'id': activity_id,
-            'company_id': deal['owner_id'],
-            'type': 'Follow-up',
-            'type_id': 6,
-            'subject': future_subject,
-            'done': False,
-            'due_date': future_date.date().isoformat(),
-            'due_time': '14:00',
-            'duration': '01:00:00',
-            'user_id': owner['id'],
-            'owner_id': owner['id'],
-            'deal_id': deal['id'],
-            'person_id': person_id,
-            'org_id': org_id,
-            'note': future_note,
-            'marked_as_done_time': None,
-            'add_time': datetime.now().isoformat(),
-            'update_time': datetime.now().isoformat(),
-            'device_id': device_id,
-            'deal_title': deal['title'],
-            'product_sku': deal['product_sku'],
-            'journey_type': journey_type,
-            '_generated_at': datetime.now().isoformat(),
-            '_source': 'amplitude',
-        })
-        activity_id += 1
+deal_context = (deals
+    .join(person_index, on='device_id', how='inner', maintain_order='left')
+    .join(user_index, on='device_id', how='inner', maintain_order='left')
+)
+
+# Timeline: from add_time to won_time
+n_deals = deal_context.height
+deal_context = (deal_context
+    .with_columns([
+        pl.col('add_time').str.to_datetime(time_unit='us').alias('deal_start'),
+        pl.col('won_time').str.to_datetime(time_unit='us').alias('deal_won'),
+        (pl.col('arr').fill_null(0) if 'arr' in deals.columns else pl.lit(0)).alias('deal_arr'),
+        pl.int_range(0, n_deals, dtype=pl.Int64).alias('deal_index'),
+        random_owners(n_deals),
+    ])
+    .with_columns((pl.col('deal_won') - pl.col('deal_start')).dt.total_days().alias('deal_duration_days'))
+    .with_columns(journey_type().alias('journey_type'))
+)
+
+# Track journey distribution
+journey_counts = dict(deal_context.group_by('journey_type').len().iter_rows())
 
-activities_df = pl.DataFrame(activities_list)
+# Expand every deal against its journey's template rows, then sample offsets
+# clamped to the deal's duration in one pass
+scheduled = (deal_context
+    .join(ACTIVITY_TEMPLATES, on='journey_type', how='inner')
+    .sort(['deal_index', 'step'])
+)
+duration = pl.col('deal_duration_days')
+max_offset = pl.when(duration > 1).then(pl.min_horizontal('max_offset', duration - 1)).otherwise(0)
+min_offset = pl.min_horizontal('min_offset', max_offset)
+offset_days = min_offset + (pl.Series(rng.random(scheduled.height)) * (max_offset - min_offset + 1)).floor().cast(pl.Int64)
+
+scheduled = scheduled.with_columns(
+    pl.when(pl.col('min_offset').is_null())
+    .then(pl.col('deal_won'))  # Closing activity - use won date
+    .otherwise(pl.col('deal_start') + pl.duration(days=offset_days))
+    .dt.date()
+    .alias('due_date')
+)
+completed = activity_records(scheduled, True, pl.col('due_date').cast(pl.Datetime('us')).dt.strftime('%Y-%m-%dT%H:%M:%S'))
+
+# Add a few ongoing activities (not done) for active customers
+pending = (deal_context
+    .filter(pl.Series(rng.random(n_deals) < 0.3))  # 30% of customers have future activities
+    .join(FOLLOW_UPS, on='journey_type', how='left', maintain_order='left')
+)
+pending = pending.with_columns([
+    pl.lit(None, dtype=pl.Int64).alias('step'),
+    pl.lit('Follow-up').alias('type'),
+    pl.lit(6, dtype=pl.Int64).alias('type_id'),
+    pl.lit('01:00:00').alias('duration'),
+    (pl.lit(datetime.now()) + pl.duration(days=pl.Series(rng.integers(7, 31, pending.height)))).dt.date().alias('due_date'),
+])
+pending = activity_records(pending, False, pl.lit(datetime.now().isoformat()))
+
+activities_df = (pl.concat([completed, pending])
+    .sort(['deal_index', 'step'], nulls_last=True)
+    .drop(['deal_index', 'step'])
+)
+activities_df = activities_df.select([pl.int_range(1, activities_df.height + 1, dtype=pl.Int64).alias('id'), pl.all()])
 activities_df.write_parquet(os.path.join(pipedrive_output_dir, 'activities.parquet'))
-print(f"✅ Saved {len(activities_list):,} activities")
+print(f"✅ Saved {len(activities_df):,} activities")
 
 # Journey distribution
 print("\n🎯 Journey Type Distribution:")
@@ -561,60 +570,57 @@ print("\n" + "="*80)
 print("UPDATING ENTITY COUNTS")
 print("="*80)
 
-# Count deals and activities per organization
-org_deal_counts = {}
-org_activity_counts = {}
-
-for deal in deals.iter_rows(named=True):
-    device_id = deal['device_id']
-    matching_persons = [p for p in persons_list if p['device_id'] == device_id]
-    if matching_persons:
-        org_id = matching_persons[0]['org_id']
-        if org_id not in org_deal_counts:
-            org_deal_counts[org_id] = {'open': 0, 'closed': 0, 'won': 0}
-        
-        if deal['status'] == 'won':
-            org_deal_counts[org_id]['closed'] += 1
-            org_deal_counts[org_id]['won'] += 1
-
-for activity in activities_list:
-    org_id = activity.get('org_id')
-    if org_id:
-        org_activity_counts[org_id] = org_activity_counts.get(org_id, 0) + 1
-
-# Update organizations
-for org in organizations_list:
-    org_id = org['id']
-    counts = org_deal_counts.get(org_id, {'open': 0, 'closed': 0, 'won': 0})
-    org['closed_deals_count'] = counts['closed']
-    org['won_deals_count'] = counts['won']
-    org['activities_count'] = org_activity_counts.get(org_id, 0)
-
-# Count per person
-person_activity_counts = {}
-for activity in activities_list:
-    person_id = activity.get('person_id')
-    if person_id:
-        person_activity_counts[person_id] = person_activity_counts.get(person_id, 0) + 1
-
-for person in persons_list:
-    person_id = person['id']
-    device_id = person['device_id']
-    
-    # Count deals for this person
-    person_deals = [d for d in deals.iter_rows(named=True) if d['device_id'] == device_id]
-    if person_deals:
-        person['won_deals_count'] = len([d for d in person_deals if d['status'] == 'won'])
-        person['closed_deals_count'] = len(person_deals)
-    
-    person['activities_count'] = person_activity_counts.get(person_id, 0)
+# Attach each deal to its person and org once, then aggregate with group-bys
+deal_owners = deals.join(person_index, on='device_id', how='inner')
 
-# Re-save with updated counts
-organizations_df = pl.DataFrame(organizations_list)
-organizations_df.write_parquet(os.path.join(output_dir, 'organizations.parquet'))
+org_deal_counts = (deal_owners
+    .filter(pl.col('status') == 'won')
+    .group_by('org_id')
+    .agg([
+        pl.len().alias('closed_deals_count'),
+        pl.len().alias('won_deals_count'),
+    ])
+)
 
-persons_df = pl.DataFrame(persons_list)
-persons_df.write_parquet(os.path.join(output_dir, 'persons.parquet'))
+person_deal_counts = (deal_owners
+    .group_by('person_id')
+    .agg([
+        pl.len().alias('closed_deals_count'),
+        (pl.col('status') == 'won').sum().alias('won_deals_count'),
+    ])
+)
+
+def count_activities(key):
+    return (activities_df
+        .filter(pl.col(key).is_not_null())
+        .group_by(key)
+        .agg(pl.len().alias('activities_count'))
+    )
+
+def apply_counts(entities, key, *counts):
+    """Overwrite the placeholder count columns with joined aggregates"""
+    for frame in counts:
+        columns = [c for c in frame.columns if c != key]
+        entities = (entities
+            .drop(columns)
+            .join(frame.rename({key: 'id'}), on='id', how='left', maintain_order='left')
+        )
+    count_columns = ['closed_deals_count', 'won_deals_count', 'activities_count']
+    return entities.with_columns([
+        pl.col(c).fill_null(0).cast(pl.Int64) for c in count_columns
+    ])
+
+organizations_df = apply_counts(
+    organizations_df, 'org_id', org_deal_counts, count_activities('org_id')
+).select(organizations_df.columns)
+
+persons_df = apply_counts(
+    persons_df, 'person_id', person_deal_counts, count_activities('person_id')
+).select(persons_df.columns)
+
+# Re-save with updated counts
+organizations_df.write_parquet(os.path.join(pipedrive_output_dir, 'organizations.parquet'))
+persons_df.write_parquet(os.path.join(pipedrive_output_dir, 'persons.parquet'))
 
 print("✅ Updated organization and person counts")
 
@@ -629,17 +635,17 @@ print("="*80)
 print(f"\n📊 Pipedrive Entities Generated:")
 print(f"   Organizations: {len(organizations_list):,}")
 print(f"   Persons: {len(persons_list):,}")
-print(f"   Activities: {len(activities_list):,}")
+print(f"   Activities: {len(activities_df):,}")
 print(f"   Leads: {len(leads):,} (existing)")
 print(f"   Deals: {len(deals):,} (existing)")
 
 print(f"\n🔗 Data Relationships:")
 print(f"   Persons per Organization: {len(persons_list) / len(organizations_list):.1f} avg")
-print(f"   Activities per Deal: {len(activities_list) / len(deals):.1f} avg")
-print(f"   Activities per Person: {len(activities_list) / len(persons_list):.1f} avg")
+print(f"   Activities per Deal: {len(activities_df) / len(deals):.1f} avg")
+print(f"   Activities per Person: {len(activities_df) / len(persons_list):.1f} avg")
 
-total_activities_done = len([a for a in activities_list if a['done']])
-total_activities_pending = len(activities_list) - total_activities_done
+total_activities_done = activities_df['done'].sum()
+total_activities_pending = len(activities_df) - total_activities_done
 print(f"\n📋 Activity Status:")
 print(f"   Completed: {total_activities_done:,}")
 print(f"   Pending: {total_activities_pending:,}")
@@ -647,11 +653,11 @@ print(f"   Pending: {total_activities_pending:,}")
 print("\n" + "="*80)
 print("OUTPUT FILES")
 print("="*80)
-print(f"✅ {os.path.join(output_dir, 'organizations.parquet')}")
-print(f"✅ {os.path.join(output_dir, 'persons.parquet')}")
-print(f"✅ {os.path.join(output_dir, 'activities.parquet')}")
-print(f"✅ {os.path.join(output_dir, 'leads.parquet')} (existing)")
-print(f"✅ {os.path.join(output_dir, 'deals.parquet')} (existing)")
+print(f"✅ {os.path.join(pipedrive_output_dir, 'organizations.parquet')}")
+print(f"✅ {os.path.join(pipedrive_output_dir, 'persons.parquet')}")
+print(f"✅ {os.path.join(pipedrive_output_dir, 'activities.parquet')}")
+print(f"✅ {os.path.join(pipedrive_output_dir, 'leads.parquet')} (existing)")
+print(f"✅ {os.path.join(pipedrive_output_dir, 'deals.parquet')} (existing)")
 
 print("\n🎯 Complete Pipedrive Data Model:")
 print("   Organizations → Persons → Deals → Activities (journey-specific)")
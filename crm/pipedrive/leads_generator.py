@@ -1,29 +1,29 @@
 """
 Pipedrive Leads Generator
 Creates leads from purchased lists + all form fills (trial, demo, pricing, contact, whitepaper, newsletter)
+
+Run with --shards N to write Parquet parts instead, N per form type, generated
+in a process pool with per-shard RNG streams (see form_shards)
 """
 import dlt
-import pandas as pd
-from datetime import datetime, timedelta
-import random
-import uuid
+import numpy as np
+import pyarrow as pa
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
+sys.path.append(os.path.dirname(__file__))
 from shared_config import *
+from rng_streams import stream
+from faker_pools import FakerPools
+from arrow_chunks import (arrow_rows, chunk_bounds, offsets, randint, timestamps, dates, generated_at, column_or,
+                          nullable, constant, choice, join, uuids, conform)
+from table_schemas import arrow_schema, resource_hints
+import input_cache
+from form_shards import PURCHASED, form_type_counts, form_fill_total, write_part, run_shards, parse_args, report
 
-from faker import Faker
-
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
-
-print("Loading purchased lead data...")
-byd_df = pd.read_parquet('gs://mock-source-data/customer_data_population/mock_bookyourdata/bookyourdata/1762095548.474671.701ad8b601.parquet')
-uplead_df = pd.read_parquet('gs://mock-source-data/customer_data_population/mock_upleads/uplead/1762095612.4264941.2fb362f699.parquet')
-
-purchased_leads = pd.concat([byd_df, uplead_df], ignore_index=True)
-print(f"Loaded {len(purchased_leads)} purchased leads")
+# Faker values are sampled from cached per-provider pools (see faker_pools)
+fake = FakerPools(SEED, rng=stream('pipedrive', 'leads', 'faker_pools', seed=SEED))
+rng = stream('pipedrive', 'leads', seed=SEED)
 
 # Pipedrive sales team
 SALES_REPS = [
@@ -45,256 +45,259 @@ FORM_SOURCE_MAPPING = {
 }
 
 
-@dlt.resource(write_disposition="append", table_name="leads")
+# Share of leads archived by form type (low-intent forms rarely convert)
+ARCHIVE_RATES = {
+    'trial_signup': 0.20,  # 20% abandon trial
+    'demo_request': 0.30,
+    'pricing_inquiry': 0.35,
+    'contact_us': 0.50,
+    'whitepaper_download': 0.70,  # Most don't convert
+    'newsletter_signup': 0.80,
+}
+
+# Was-seen rate by sales priority (high priority leads get seen quickly)
+WAS_SEEN_RATES = {
+    'high': 0.95,
+    'medium': 0.75,
+    'low': 0.40,
+}
+
+COMPANY_SIZES = ['1-10', '11-50', '51-200', '201-500', '500+']
+OWNER_IDS = [rep['id'] for rep in SALES_REPS]
+GEO_COUNTRIES = [g['country'] for g in GEO_DISTRIBUTION]
+GEO_WEIGHTS = [g['weight'] for g in GEO_DISTRIBUTION]
+TRIAL_PATHS = np.array(list(TRIAL_CONVERSION_PATHS))
+TRIAL_WEIGHTS = [TRIAL_CONVERSION_PATHS[p]['weight'] for p in TRIAL_PATHS]
+TRIAL_CONVERSION = np.array([TRIAL_CONVERSION_PATHS[p]['conversion_rate_to_paid'] for p in TRIAL_PATHS])
+TRIAL_ACTIVITIES = np.array([TRIAL_CONVERSION_PATHS[p]['crm_activities'] for p in TRIAL_PATHS])
+
+
+LEADS_SCHEMA = arrow_schema('pipedrive', 'leads')
+
+
+def lead_table(rng, n, is_customer, add_seconds, update_seconds, close_days, start=START_DATE, at=None, **columns):
+    """One chunk of leads: ids, timestamps and bookkeeping around the source-specific columns"""
+    table = {
+        'id': uuids(rng, n),
+        'title': columns.pop('title'),
+        'owner_id': choice(rng, OWNER_IDS, n).astype(np.int64),
+        'creator_id': constant(columns.pop('creator_id'), n, pa.int64()),
+        'person_id': randint(rng, 1000, 999999, n),
+        'organization_id': randint(rng, 1000, 999999, n),
+        'source_name': columns.pop('source_name'),
+        'origin': columns.pop('origin'),
+        'origin_id': constant(None, n, pa.string()),
+        'channel': columns.pop('channel'),
+        'channel_id': constant(columns.pop('channel_id'), n, pa.string()),
+        'is_archived': columns.pop('is_archived'),
+        'was_seen': columns.pop('was_seen'),
+        'value': columns.pop('value'),
+        'currency': constant('USD', n, pa.string()),
+        'expected_close_date': dates(start, add_seconds + offsets(rng, n, days=close_days), is_customer),
+        'next_activity_id': nullable(randint(rng, 1, 1000, n), is_customer),
+        'add_time': timestamps(start, add_seconds),
+        'update_time': timestamps(start, update_seconds),
+        'visible_to': constant('3', n, pa.string()),
+        'cc_email': join('company+', randint(rng, 1000, 9999, n).astype(str), '@pipedrivemail.com'),
+    }
+    form_type = columns.pop('_form_type')
+    table.update(columns)
+    table['_generated_at'] = generated_at(n, at)
+    table['_source'] = constant('purchased_list' if form_type is None else 'form_fill', n, pa.string())
+    table['_form_type'] = constant(form_type, n, pa.string())
+    table['_converted_to_customer'] = is_customer
+    return pa.table(table)
+
+
+def purchased_chunk(leads, rng=rng, fake=fake, start=START_DATE, at=None):
+    """Leads from one chunk of the purchased lists"""
+    n = len(leads)
+    # Stagger lead import across the year
+    add_seconds = offsets(rng, n, days=(0, DAYS_OF_DATA - 30), hours=(8, 18))
+    # Low conversion rate for purchased leads (2%)
+    is_customer = rng.random(n) < 0.02
+    source = column_or(leads, 'source', lambda k: np.full(k, '')).astype(str)
+    first_name = column_or(leads, 'first_name', lambda k: fake.sample('first_name', k))
+    last_name = column_or(leads, 'last_name', lambda k: fake.sample('last_name', k))
+    company = column_or(leads, 'company', lambda k: fake.sample('company', k))
+
+    return lead_table(
+        rng, n, is_customer, add_seconds, add_seconds + offsets(rng, n, days=(0, 30)), (60, 120), start, at,
+        title=join(first_name, ' ', last_name, ' - ', company),
+        creator_id=1,  # Marketing ops imported
+        source_name=np.where(np.char.find(np.char.lower(source), 'bookyourdata') >= 0,
+                             'Purchased List - BookYourData', 'Purchased List - UpLead'),
+        origin=constant('List Purchase', n, pa.string()),
+        channel=constant('Outbound', n, pa.string()),
+        channel_id='List Import',
+        is_archived=is_customer | (rng.random(n) < 0.4),  # Many get archived (low quality)
+        was_seen=rng.random(n) < 0.6,  # Sales team doesn't always review
+        value=randint(rng, 5000, 50000, n),
+
+        # Contact details
+        email=column_or(leads, 'email', lambda k: fake.sample('email', k)),
+        phone=column_or(leads, 'phone', lambda k: fake.sample('phone_number', k)),
+        job_title=column_or(leads, 'title', lambda k: fake.sample('job', k)),
+        company=company,
+        industry=column_or(leads, 'industry', lambda k: fake.sample('bs', k)),
+        company_size=column_or(leads, 'employees', lambda k: choice(rng, COMPANY_SIZES, k)),
+        country=column_or(leads, 'country', lambda k: fake.sample('country', k)),
+        state=column_or(leads, 'state', lambda k: fake.sample('state', k)),
+        city=column_or(leads, 'city', lambda k: fake.sample('city', k)),
+
+        # Lead tracking fields
+        lifecycle_stage=constant('Lead', n, pa.string()),
+        form_type=constant('purchased_lead', n, pa.string()),
+        trial_path=constant(None, n, pa.string()),
+        trial_start_date=constant(None, n, pa.string()),
+        sales_priority=constant('low', n, pa.string()),
+        expected_activities=constant(2, n, pa.int64()),  # Just cold outreach
+        _form_type=None,
+    )
+
+
+def form_fill_chunk(form_type, n, rng=rng, fake=fake, start=START_DATE, at=None):
+    """n leads of one form type"""
+    form_config = FORM_TYPES[form_type]
+    add_seconds = offsets(rng, n, days=(0, DAYS_OF_DATA - 1), hours=(8, 22), minutes=(0, 59))
+
+    # Traffic source: paid (Google 35 / Facebook 20 of the 55%) or organic website
+    paid = rng.random(n) < 0.55
+    google = rng.random(n) < 0.636
+    source_name = np.where(paid, np.where(google, 'Google Ads Form', 'Facebook Ads Form'), 'Website Form')
+    origin = np.where(paid, np.where(google, 'Google Ads', 'Facebook Ads'), 'Organic')
+
+    # Trial path, conversion rate, deal value and expected activities
+    sales_priority = form_config.get('sales_priority', 'medium')
+    if form_type == 'trial_signup':
+        path = rng.choice(len(TRIAL_PATHS), n, p=TRIAL_WEIGHTS)
+        trial_path = TRIAL_PATHS[path]
+        conversion_rate = TRIAL_CONVERSION[path]
+        expected_activities = TRIAL_ACTIVITIES[path]
+        high_value = trial_path == 'sales_assisted'
+        trial_start_date = dates(start, add_seconds)
+    else:
+        trial_path = constant(None, n, pa.string())
+        conversion_rate = form_config.get('conversion_rate_to_paid', 0.05)
+        expected_activities = constant(form_config.get('crm_activities', 3), n, pa.int64())
+        high_value = np.zeros(n, dtype=bool)
+        trial_start_date = constant(None, n, pa.string())
+    is_customer = rng.random(n) < conversion_rate
+
+    if form_type in ['demo_request', 'pricing_inquiry']:
+        value = randint(rng, 8000, 40000, n)
+    else:
+        value = np.where(high_value, randint(rng, 10000, 50000, n), randint(rng, 3000, 15000, n))
+
+    return lead_table(
+        rng, n, is_customer, add_seconds, add_seconds + offsets(rng, n, hours=(1, 72)), (15, 60), start, at,
+        title=join(fake.sample('name', n), ' - ', fake.sample('company', n)),
+        creator_id=99,  # Web form automation
+        source_name=source_name,
+        origin=origin,
+        channel=np.where(paid, 'Paid', 'Inbound'),
+        channel_id=FORM_SOURCE_MAPPING[form_type],
+        is_archived=is_customer | (rng.random(n) < ARCHIVE_RATES.get(form_type, 0.5)),
+        was_seen=rng.random(n) < WAS_SEEN_RATES.get(sales_priority, 0.7),
+        value=value,
+
+        # Contact details
+        email=fake.sample('email', n),
+        phone=fake.sample('phone_number', n),
+        job_title=fake.sample('job', n),
+        company=fake.sample('company', n),
+        industry=fake.sample('bs', n),
+        company_size=choice(rng, COMPANY_SIZES, n),
+        country=choice(rng, GEO_COUNTRIES, n, GEO_WEIGHTS),
+        state=fake.sample('state', n),
+        city=fake.sample('city', n),
+
+        # Lead tracking fields
+        lifecycle_stage=constant(form_config['lifecycle_stage'], n, pa.string()),
+        form_type=constant(form_type, n, pa.string()),
+        trial_path=trial_path,
+        trial_start_date=trial_start_date,
+        sales_priority=constant(sales_priority, n, pa.string()),
+        expected_activities=expected_activities,
+        _form_type=form_type,
+    )
+
+
+def lead_shard(shard, n):
+    """Write one shard's share of n leads of its form type as a Parquet part"""
+    fake = FakerPools(shard.seed, rng=shard.rng)
+    start, stop = shard.bounds(n)
+    if shard.form_type == PURCHASED:
+        purchased_leads = input_cache.purchased_leads().iloc[start:stop]
+        chunks = (purchased_chunk(purchased_leads.iloc[a:b], shard.rng, fake, shard.start_date, shard.as_of)
+                  for a, b in chunk_bounds(stop - start))
+    else:
+        chunks = (form_fill_chunk(shard.form_type, b - a, shard.rng, fake, shard.start_date, shard.as_of)
+                  for a, b in chunk_bounds(stop - start))
+    path = shard.path('leads')
+    return path, write_part((conform(chunk, LEADS_SCHEMA) for chunk in chunks), LEADS_SCHEMA, path)
+
+
+@dlt.resource(write_disposition="append", table_name="leads", **resource_hints('pipedrive', 'leads'))
+@arrow_rows(LEADS_SCHEMA)
 def leads():
-    """Generate Pipedrive leads from purchased lists + all form types"""
-    
+    """Generate Pipedrive leads from purchased lists + all form types, one Arrow table per chunk"""
+
     # ==========================================
     # 1. PURCHASED LEADS (from list providers)
     # ==========================================
-    
+
+    purchased_leads = input_cache.purchased_leads()
     print(f"\nGenerating {len(purchased_leads)} purchased leads...")
-    
-    for idx, lead in purchased_leads.iterrows():
-        # Stagger lead import across the year
-        days_offset = random.randint(0, DAYS_OF_DATA - 30)
-        add_time = START_DATE + timedelta(days=days_offset, hours=random.randint(8, 18))
-        
-        # Purchased leads are lower priority
-        owner = random.choice(SALES_REPS)
-        
-        # Low conversion rate for purchased leads (2%)
-        is_customer = random.random() < 0.02
-        amount = random.randint(5000, 50000)
-        
-        yield {
-            'id': str(uuid.uuid4()),
-            'title': f"{lead.get('first_name', fake.first_name())} {lead.get('last_name', fake.last_name())} - {lead.get('company', fake.company())}",
-            'owner_id': owner['id'],
-            'creator_id': 1,  # Marketing ops imported
-            'person_id': random.randint(1000, 999999),
-            'organization_id': random.randint(1000, 999999),
-            
-            'source_name': 'Purchased List - BookYourData' if 'bookyourdata' in lead.get('source', '').lower() else 'Purchased List - UpLead',
-            'origin': 'List Purchase',
-            'origin_id': None,
-            'channel': 'Outbound',
-            'channel_id': 'List Import',
-            
-            'is_archived': is_customer or random.random() < 0.4,  # Many get archived (low quality)
-            'was_seen': random.random() < 0.6,  # Sales team doesn't always review
-            'value': amount,
-            'currency': 'USD',
-            'expected_close_date': (add_time + timedelta(days=random.randint(60, 120))).strftime('%Y-%m-%d') if not is_customer else None,
-            'next_activity_id': None if is_customer else random.randint(1, 1000),
-            
-            'add_time': add_time.isoformat(),
-            'update_time': (add_time + timedelta(days=random.randint(0, 30))).isoformat(),
-            'visible_to': '3',
-            'cc_email': f"company+{random.randint(1000, 9999)}@pipedrivemail.com",
-            
-            # Contact details
-            'email': lead.get('email', fake.email()),
-            'phone': lead.get('phone', fake.phone_number()),
-            'job_title': lead.get('title', fake.job()),
-            'company': lead.get('company', fake.company()),
-            'industry': lead.get('industry', fake.bs()),
-            'company_size': lead.get('employees', random.choice(['1-10', '11-50', '51-200', '201-500', '500+'])),
-            'country': lead.get('country', fake.country()),
-            'state': lead.get('state', fake.state()),
-            'city': lead.get('city', fake.city()),
-            
-            # Lead tracking fields
-            'lifecycle_stage': 'Lead',
-            'form_type': 'purchased_lead',
-            'trial_path': None,
-            'trial_start_date': None,
-            'sales_priority': 'low',
-            'expected_activities': 2,  # Just cold outreach
-            
-            '_generated_at': datetime.now().isoformat(),
-            '_source': 'purchased_list',
-            '_converted_to_customer': is_customer,
-        }
-    
+
+    for start, stop in chunk_bounds(len(purchased_leads)):
+        yield purchased_chunk(purchased_leads.iloc[start:stop])
+
     # ==========================================
     # 2. FORM FILL LEADS (all types)
     # ==========================================
-    
+
     # Calculate total form fills across all days
-    total_form_fills = 0
-    for day in range(DAYS_OF_DATA):
-        daily_metrics = get_daily_metrics(day)
-        total_form_fills += daily_metrics['identified_leads']
-    
+    total_form_fills = form_fill_total()
+
     print(f"Generating ~{total_form_fills} form-fill leads across {DAYS_OF_DATA} days...")
-    
+
     # Distribute form fills across form types
-    form_type_counts = {
-        'trial_signup': int(total_form_fills * 0.35),
-        'demo_request': int(total_form_fills * 0.25),
-        'pricing_inquiry': int(total_form_fills * 0.15),
-        'contact_us': int(total_form_fills * 0.15),
-        'whitepaper_download': int(total_form_fills * 0.07),
-        'newsletter_signup': int(total_form_fills * 0.03),
-    }
-    
+    lead_counts = form_type_counts(total_form_fills)
+
     print(f"Form type distribution:")
-    for form_type, count in form_type_counts.items():
+    for form_type, count in lead_counts.items():
         print(f"  - {form_type}: {count}")
-    
+
     # Generate leads for each form type
-    for form_type, count in form_type_counts.items():
-        form_config = FORM_TYPES[form_type]
-        
-        for _ in range(count):
-            # Random day across the year
-            day = random.randint(0, DAYS_OF_DATA - 1)
-            current_date = START_DATE + timedelta(days=day)
-            add_time = current_date + timedelta(hours=random.randint(8, 22), minutes=random.randint(0, 59))
-            
-            # Determine traffic source
-            if random.random() < 0.55:  # Paid traffic (google + facebook)
-                if random.random() < 0.636:  # 35/(35+20) = Google Ads weight
-                    source_name = 'Google Ads Form'
-                    channel = 'Paid'
-                    origin = 'Google Ads'
-                else:
-                    source_name = 'Facebook Ads Form'
-                    channel = 'Paid'
-                    origin = 'Facebook Ads'
-            else:
-                source_name = 'Website Form'
-                channel = 'Inbound'
-                origin = 'Organic'
-            
-            # Assign sales rep
-            owner = random.choice(SALES_REPS)
-            
-            # Determine trial path if trial signup
-            trial_path = None
-            trial_start_date = None
-            if form_type == 'trial_signup':
-                trial_path = get_trial_path()
-                trial_start_date = add_time.strftime('%Y-%m-%d')
-            
-            # Get conversion rate for this form type
-            if form_type == 'trial_signup':
-                # Trial conversion varies by path
-                path_config = TRIAL_CONVERSION_PATHS[trial_path]
-                conversion_rate = path_config['conversion_rate_to_paid']
-            else:
-                conversion_rate = form_config.get('conversion_rate_to_paid', 0.05)
-            
-            is_customer = random.random() < conversion_rate
-            
-            # Calculate deal value (higher for sales-assisted and enterprise forms)
-            if form_type == 'trial_signup' and trial_path == 'sales_assisted':
-                amount = random.randint(10000, 50000)
-            elif form_type in ['demo_request', 'pricing_inquiry']:
-                amount = random.randint(8000, 40000)
-            else:
-                amount = random.randint(3000, 15000)
-            
-            # Sales priority
-            sales_priority = form_config.get('sales_priority', 'medium')
-            
-            # Expected activities
-            if form_type == 'trial_signup':
-                expected_activities = TRIAL_CONVERSION_PATHS[trial_path]['crm_activities']
-            else:
-                expected_activities = form_config.get('crm_activities', 3)
-            
-            # Determine if lead gets archived
-            archive_rate = {
-                'trial_signup': 0.20,  # 20% abandon trial
-                'demo_request': 0.30,
-                'pricing_inquiry': 0.35,
-                'contact_us': 0.50,
-                'whitepaper_download': 0.70,  # Most don't convert
-                'newsletter_signup': 0.80,
-            }
-            is_archived = is_customer or random.random() < archive_rate.get(form_type, 0.5)
-            
-            # Was seen rate (high priority leads get seen quickly)
-            was_seen_rate = {
-                'high': 0.95,
-                'medium': 0.75,
-                'low': 0.40,
-            }
-            was_seen = random.random() < was_seen_rate.get(sales_priority, 0.7)
-            
-            yield {
-                'id': str(uuid.uuid4()),
-                'title': f"{fake.name()} - {fake.company()}",
-                'owner_id': owner['id'],
-                'creator_id': 99,  # Web form automation
-                'person_id': random.randint(1000, 999999),
-                'organization_id': random.randint(1000, 999999),
-                
-                'source_name': source_name,
-                'origin': origin,
-                'origin_id': None,
-                'channel': channel,
-                'channel_id': FORM_SOURCE_MAPPING[form_type],
-                
-                'is_archived': is_archived,
-                'was_seen': was_seen,
-                'value': amount,
-                'currency': 'USD',
-                'expected_close_date': (add_time + timedelta(days=random.randint(15, 60))).strftime('%Y-%m-%d') if not is_customer else None,
-                'next_activity_id': None if is_customer else random.randint(1, 1000),
-                
-                'add_time': add_time.isoformat(),
-                'update_time': (add_time + timedelta(hours=random.randint(1, 72))).isoformat(),
-                'visible_to': '3',
-                'cc_email': f"company+{random.randint(1000, 9999)}@pipedrivemail.com",
-                
-                # Contact details
-                'email': fake.email(),
-                'phone': fake.phone_number(),
-                'job_title': fake.job(),
-                'company': fake.company(),
-                'industry': fake.bs(),
-                'company_size': random.choice(['1-10', '11-50', '51-200', '201-500', '500+']),
-                'country': random.choices([g['country'] for g in GEO_DISTRIBUTION], 
-                                        weights=[g['weight'] for g in GEO_DISTRIBUTION])[0],
-                'state': fake.state(),
-                'city': fake.city(),
-                
-                # Lead tracking fields
-                'lifecycle_stage': form_config['lifecycle_stage'],
-                'form_type': form_type,
-                'trial_path': trial_path,
-                'trial_start_date': trial_start_date,
-                'sales_priority': sales_priority,
-                'expected_activities': expected_activities,
-                
-                '_generated_at': datetime.now().isoformat(),
-                '_source': 'form_fill',
-                '_form_type': form_type,
-                '_converted_to_customer': is_customer,
-            }
-    
+    for form_type, count in lead_counts.items():
+        for start, stop in chunk_bounds(count):
+            yield form_fill_chunk(form_type, stop - start)
+
     total_generated = len(purchased_leads) + total_form_fills
     print(f"\n✓ Total leads generated: {total_generated}")
     print(f"  - Purchased leads: {len(purchased_leads)}")
     print(f"  - Form fill leads: {total_form_fills}")
-    print(f"    - Trial signups: {form_type_counts['trial_signup']}")
-    print(f"    - Demo requests: {form_type_counts['demo_request']}")
-    print(f"    - Pricing inquiries: {form_type_counts['pricing_inquiry']}")
-    print(f"    - Contact forms: {form_type_counts['contact_us']}")
-    print(f"    - Whitepaper downloads: {form_type_counts['whitepaper_download']}")
-    print(f"    - Newsletter signups: {form_type_counts['newsletter_signup']}")
+    print(f"    - Trial signups: {lead_counts['trial_signup']}")
+    print(f"    - Demo requests: {lead_counts['demo_request']}")
+    print(f"    - Pricing inquiries: {lead_counts['pricing_inquiry']}")
+    print(f"    - Contact forms: {lead_counts['contact_us']}")
+    print(f"    - Whitepaper downloads: {lead_counts['whitepaper_download']}")
+    print(f"    - Newsletter signups: {lead_counts['newsletter_signup']}")
 
 
 if __name__ == "__main__":
-    pipeline = dlt.pipeline(
-        pipeline_name="pipedrive_leads",
-        destination="filesystem",
-        dataset_name="pipedrive"
-    )
-    
-    load_info = pipeline.run(leads(), loader_file_format="parquet")
-    
-    print(f"\n✓ Pipedrive leads: purchased lists + {DAYS_OF_DATA} days of form fills")
\ No newline at end of file
+    args = parse_args(__doc__)
+    if args.shards:
+        counts = {PURCHASED: input_cache.purchased_leads_count(), **form_type_counts(form_fill_total())}
+        report(run_shards(lead_shard, counts, args), 'leads')
+    else:
+        pipeline = dlt.pipeline(
+            pipeline_name="pipedrive_leads",
+            destination="filesystem",
+            dataset_name="pipedrive"
+        )
+        
+        load_info = pipeline.run(leads(), loader_file_format="parquet")
+        
+        print(f"\n✓ Pipedrive leads: purchased lists + {DAYS_OF_DATA} days of form fills")
\ No newline at end of file
@@ -3,253 +3,216 @@ Pipedrive Organizations Generator
 Companies from purchased leads + form-fill leads (deduplicated)
 """
 import dlt
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import random
+import pyarrow as pa
+import pyarrow.compute as pc
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
 from shared_config import *
+from rng_streams import stream
+from faker_pools import FakerPools
+from arrow_chunks import (arrow_rows, chunk_bounds, offsets, randint, timestamps, generated_at, column_or,
+                          nullable, constant, choice, pick_lists, join)
+from table_schemas import arrow_schema, resource_hints
+import input_cache
 
-from faker import Faker
+# Faker values are sampled from cached per-provider pools (see faker_pools)
+fake = FakerPools(SEED, rng=stream('pipedrive', 'organizations', 'faker_pools', seed=SEED))
+rng = stream('pipedrive', 'organizations', seed=SEED)
 
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
+SALES_REPS = [1, 2, 3, 4, 5]
+COMPANY_SIZES = ['1-10', '11-50', '51-200', '201-500', '500+']
+GEO_COUNTRIES = [g['country'] for g in GEO_DISTRIBUTION]
+GEO_WEIGHTS = [g['weight'] for g in GEO_DISTRIBUTION]
 
-print("Loading purchased lead data...")
-byd_df = pd.read_parquet('gs://mock-source-data/customer_data_population/mock_bookyourdata/bookyourdata/1762095548.474671.701ad8b601.parquet')
-uplead_df = pd.read_parquet('gs://mock-source-data/customer_data_population/mock_upleads/uplead/1762095612.4264941.2fb362f699.parquet')
 
-purchased_leads = pd.concat([byd_df, uplead_df], ignore_index=True)
-print(f"Loaded {len(purchased_leads)} purchased leads")
+def unseen(names, seen_companies):
+    """Mask of first occurrences of company names not already generated (and mark them seen)"""
+    names = pd.Series(names)
+    fresh = ~names.duplicated().to_numpy() & ~names.isin(seen_companies).to_numpy()
+    seen_companies.update(names[fresh])
+    return fresh
 
-SALES_REPS = [1, 2, 3, 4, 5]
+
+def organization_table(first_id, names, is_customer, add_seconds, update_seconds, source, **columns):
+    """One chunk of organizations: ids, timestamps and labels around the source-specific columns"""
+    n = len(names)
+    ids = np.arange(first_id, first_id + n)
+    names = pa.array(names, pa.string())
+    table = {
+        'id': ids,
+        'name': names,
+        'owner_id': choice(rng, SALES_REPS, n).astype(np.int64),
+        'org_id': ids,
+        'add_time': timestamps(START_DATE, add_seconds),
+        'update_time': timestamps(START_DATE, update_seconds),
+        'address': columns.pop('address'),
+        'country': columns.pop('country'),
+        'admin_area_level_1': columns.pop('admin_area_level_1'),
+        'locality': columns.pop('locality'),
+        'route': fake.sample('street_name', n),
+        'street_number': randint(rng, 1, 9999, n).astype(str),
+        'postal_code': fake.sample('postcode', n),
+        'is_deleted': constant(False, n, pa.bool_()),
+        'visible_to': constant(7, n, pa.int64()),
+        'label_ids': pick_lists(is_customer, [1, 2], [1]),
+    }
+    revenue = columns.pop('annual_revenue')
+    table.update(columns)
+    table['website'] = join('https://', pc.replace_substring(pc.utf8_lower(names), ' ', ''), '.com')
+    table['annual_revenue'] = revenue
+    table['_generated_at'] = generated_at(n)
+    table['_source'] = constant(source, n, pa.string())
+    table['_is_customer'] = is_customer
+    return pa.table(table)
+
+
+def engaged_counts(n, is_customer, activity_rate, activities, done, deal_ranges, people, emails, files, notes):
+    """Activity, deal and engagement counters for companies that sales has worked"""
+    open_deals, related_open, closed = deal_ranges
+    return {
+        'next_activity_id': nullable(randint(rng, 1, 1000, n), is_customer),
+        'last_activity_id': nullable(randint(rng, 1, 1000, n), rng.random(n) >= activity_rate),
+        'activities_count': randint(rng, 0, activities, n),
+        'done_activities_count': randint(rng, 0, done, n),
+        'undone_activities_count': randint(rng, 0, 5, n),
+        'open_deals_count': np.where(is_customer, 0, randint(rng, 0, open_deals, n)),
+        'related_open_deals_count': np.where(is_customer, 0, randint(rng, 0, related_open, n)),
+        'closed_deals_count': np.where(is_customer, 1, randint(rng, 0, closed, n)),
+        'related_closed_deals_count': is_customer.astype(np.int64),
+        'won_deals_count': is_customer.astype(np.int64),
+        'related_won_deals_count': is_customer.astype(np.int64),
+        'lost_deals_count': randint(rng, 0, 1, n),
+        'related_lost_deals_count': np.zeros(n, dtype=np.int64),
+        'people_count': randint(rng, 1, people, n),
+        'email_messages_count': randint(rng, 0, emails, n),
+        'files_count': randint(rng, 0, files, n),
+        'notes_count': randint(rng, 0, notes, n),
+        'followers_count': randint(rng, 1, 3, n),
+    }
+
+
+def purchased_chunk(leads, first_id):
+    """Organizations from one chunk of purchased leads (already deduplicated by company)"""
+    n = len(leads)
+    is_customer = rng.random(n) < LEAD_CONVERSION_RATE
+    add_seconds = offsets(rng, n, days=(0, DAYS_OF_DATA - 30), hours=(8, 18))
+
+    return organization_table(
+        first_id, leads['company'].to_numpy(dtype=object), is_customer,
+        add_seconds, add_seconds + offsets(rng, n, days=(0, 60)), 'purchased_list',
+        address=column_or(leads, 'address', lambda k: fake.sample('street_address', k)),
+        country=column_or(leads, 'country', lambda k: fake.sample('country', k)),
+        admin_area_level_1=column_or(leads, 'state', lambda k: fake.sample('state', k)),
+        locality=column_or(leads, 'city', lambda k: fake.sample('city', k)),
+        **engaged_counts(n, is_customer, 0.8, 20, 15, (3, 2, 2), 5, 50, 10, 15),
+        industry=column_or(leads, 'industry', lambda k: fake.sample('bs', k)),
+        company_size=column_or(leads, 'employees', lambda k: choice(rng, COMPANY_SIZES, k)),
+        annual_revenue=randint(rng, 100000, 50000000, n),
+    )
+
+
+def form_fill_chunk(names, first_id):
+    """Organizations for web form fills (Faker companies)"""
+    n = len(names)
+    is_customer = rng.random(n) < (LEAD_CONVERSION_RATE * 0.8)  # Slightly lower for web leads
+    add_seconds = offsets(rng, n, days=(0, DAYS_OF_DATA), hours=(8, 22))
+
+    return organization_table(
+        first_id, names, is_customer, add_seconds, add_seconds + offsets(rng, n, hours=(1, 720)), 'form_fill',
+        address=fake.sample('street_address', n),
+        country=choice(rng, GEO_COUNTRIES, n, GEO_WEIGHTS),
+        admin_area_level_1=fake.sample('state', n),
+        locality=fake.sample('city', n),
+        **engaged_counts(n, is_customer, 0.7, 15, 10, (2, 1, 1), 4, 30, 8, 12),
+        industry=fake.sample('bs', n),
+        company_size=choice(rng, COMPANY_SIZES, n),
+        annual_revenue=randint(rng, 100000, 50000000, n),
+    )
+
+
+def anonymous_chunk(names, first_id):
+    """Organizations of anonymous purchasers (post-purchase)"""
+    n = len(names)
+    purchase_seconds = offsets(rng, n, days=(0, DAYS_OF_DATA))
+    zeros = np.zeros(n, dtype=np.int64)
+    ones = np.ones(n, dtype=np.int64)
+
+    return organization_table(
+        first_id, names, np.ones(n, dtype=bool), purchase_seconds, purchase_seconds, 'anonymous_purchase',
+        address=fake.sample('street_address', n),
+        country=choice(rng, GEO_COUNTRIES, n, GEO_WEIGHTS),
+        admin_area_level_1=fake.sample('state', n),
+        locality=fake.sample('city', n),
+        next_activity_id=constant(None, n, pa.int64()),
+        last_activity_id=constant(None, n, pa.int64()),
+        activities_count=zeros,
+        done_activities_count=zeros,
+        undone_activities_count=zeros,
+        open_deals_count=zeros,
+        related_open_deals_count=zeros,
+        closed_deals_count=ones,
+        related_closed_deals_count=ones,
+        won_deals_count=ones,
+        related_won_deals_count=ones,
+        lost_deals_count=zeros,
+        related_lost_deals_count=zeros,
+        people_count=ones,
+        email_messages_count=randint(rng, 0, 5, n),
+        files_count=zeros,
+        notes_count=zeros,
+        followers_count=ones,
+        industry=fake.sample('bs', n),
+        company_size=choice(rng, COMPANY_SIZES[:3], n),
+        annual_revenue=randint(rng, 100000, 10000000, n),
+    )
 
 
-@dlt.resource(write_disposition="append", table_name="organizations")
+@dlt.resource(write_disposition="append", table_name="organizations", **resource_hints('pipedrive', 'organizations'))
+@arrow_rows(arrow_schema('pipedrive', 'organizations'))
 def organizations():
-    """Generate unique organizations from leads + anonymous customers"""
-    
+    """Generate unique organizations from leads + anonymous customers, one Arrow table per chunk"""
+
     seen_companies = set()
     org_id = 1
-    
+
     # Calculate anonymous purchasers
-    total_sessions = sum(get_daily_metrics(d)['sessions'] for d in range(DAYS_OF_DATA))
-    anonymous_rate = (ANONYMOUS_CONVERSION_RATES['add_to_cart'] * 
-                     ANONYMOUS_CONVERSION_RATES['checkout_start'] * 
+    total_sessions = metric_total('sessions')
+    anonymous_rate = (ANONYMOUS_CONVERSION_RATES['add_to_cart'] *
+                     ANONYMOUS_CONVERSION_RATES['checkout_start'] *
                      ANONYMOUS_CONVERSION_RATES['purchase'])
     anonymous_customers = int(total_sessions * (1 - LEAD_PERCENTAGE_OF_TRAFFIC) * anonymous_rate)
-    
+
     # 1. Organizations from purchased leads
-    for idx, lead in purchased_leads.iterrows():
-        company_name = lead.get('company', fake.company())
-        
-        if company_name in seen_companies:
-            continue
-        seen_companies.add(company_name)
-        
-        days_offset = random.randint(0, DAYS_OF_DATA - 30)
-        add_time = START_DATE + timedelta(days=days_offset, hours=random.randint(8, 18))
-        update_time = add_time + timedelta(days=random.randint(0, 60))
-        
-        owner = random.choice(SALES_REPS)
-        is_customer = random.random() < LEAD_CONVERSION_RATE
-        
-        yield {
-            'id': org_id,
-            'name': company_name,
-            'owner_id': owner,
-            'org_id': org_id,
-            'add_time': add_time.isoformat(),
-            'update_time': update_time.isoformat(),
-            
-            'address': lead.get('address', fake.street_address()),
-            'country': lead.get('country', fake.country()),
-            'admin_area_level_1': lead.get('state', fake.state()),
-            'locality': lead.get('city', fake.city()),
-            'route': fake.street_name(),
-            'street_number': str(random.randint(1, 9999)),
-            'postal_code': fake.postcode(),
-            
-            'is_deleted': False,
-            'visible_to': 7,
-            'label_ids': [1, 2] if is_customer else [1],
-            
-            # Activity metrics
-            'next_activity_id': None if is_customer else random.randint(1, 1000),
-            'last_activity_id': random.randint(1, 1000) if random.random() < 0.8 else None,
-            'activities_count': random.randint(0, 20),
-            'done_activities_count': random.randint(0, 15),
-            'undone_activities_count': random.randint(0, 5),
-            
-            # Deal metrics
-            'open_deals_count': 0 if is_customer else random.randint(0, 3),
-            'related_open_deals_count': 0 if is_customer else random.randint(0, 2),
-            'closed_deals_count': 1 if is_customer else random.randint(0, 2),
-            'related_closed_deals_count': 1 if is_customer else 0,
-            'won_deals_count': 1 if is_customer else 0,
-            'related_won_deals_count': 1 if is_customer else 0,
-            'lost_deals_count': random.randint(0, 1),
-            'related_lost_deals_count': 0,
-            
-            # Engagement metrics
-            'people_count': random.randint(1, 5),
-            'email_messages_count': random.randint(0, 50),
-            'files_count': random.randint(0, 10),
-            'notes_count': random.randint(0, 15),
-            'followers_count': random.randint(1, 3),
-            
-            # Custom fields
-            'industry': lead.get('industry', fake.bs()),
-            'company_size': lead.get('employees', random.choice(['1-10', '11-50', '51-200', '201-500', '500+'])),
-            'website': f"https://{company_name.lower().replace(' ', '')}.com",
-            'annual_revenue': random.randint(100000, 50000000),
-            
-            '_generated_at': datetime.now().isoformat(),
-            '_source': 'purchased_list',
-            '_is_customer': is_customer,
-        }
-        
-        org_id += 1
-    
+    purchased_leads = input_cache.purchased_leads()
+    for start, stop in chunk_bounds(len(purchased_leads)):
+        leads = purchased_leads.iloc[start:stop]
+        leads = leads.assign(company=column_or(leads, 'company', lambda k: fake.sample('company', k)))
+        leads = leads[unseen(leads['company'], seen_companies)]
+        yield purchased_chunk(leads, org_id)
+        org_id += len(leads)
+
     # 2. Organizations from form fills (Faker companies)
-    form_fill_count = sum(get_daily_metrics(d)['identified_leads'] for d in range(DAYS_OF_DATA))
+    form_fill_count = metric_total('identified_leads')
     faker_orgs = int(form_fill_count * 0.7)  # ~70% unique companies from form fills
-    
-    for _ in range(faker_orgs):
-        company_name = fake.company()
-        
-        if company_name in seen_companies:
-            continue
-        seen_companies.add(company_name)
-        
-        days_offset = random.randint(0, DAYS_OF_DATA)
-        add_time = START_DATE + timedelta(days=days_offset, hours=random.randint(8, 22))
-        update_time = add_time + timedelta(hours=random.randint(1, 720))
-        
-        owner = random.choice(SALES_REPS)
-        is_customer = random.random() < (LEAD_CONVERSION_RATE * 0.8)  # Slightly lower for web leads
-        
-        yield {
-            'id': org_id,
-            'name': company_name,
-            'owner_id': owner,
-            'org_id': org_id,
-            'add_time': add_time.isoformat(),
-            'update_time': update_time.isoformat(),
-            
-            'address': fake.street_address(),
-            'country': random.choices([g['country'] for g in GEO_DISTRIBUTION], 
-                                    weights=[g['weight'] for g in GEO_DISTRIBUTION])[0],
-            'admin_area_level_1': fake.state(),
-            'locality': fake.city(),
-            'route': fake.street_name(),
-            'street_number': str(random.randint(1, 9999)),
-            'postal_code': fake.postcode(),
-            
-            'is_deleted': False,
-            'visible_to': 7,
-            'label_ids': [1, 2] if is_customer else [1],
-            
-            'next_activity_id': None if is_customer else random.randint(1, 1000),
-            'last_activity_id': random.randint(1, 1000) if random.random() < 0.7 else None,
-            'activities_count': random.randint(0, 15),
-            'done_activities_count': random.randint(0, 10),
-            'undone_activities_count': random.randint(0, 5),
-            
-            'open_deals_count': 0 if is_customer else random.randint(0, 2),
-            'related_open_deals_count': 0 if is_customer else random.randint(0, 1),
-            'closed_deals_count': 1 if is_customer else random.randint(0, 1),
-            'related_closed_deals_count': 1 if is_customer else 0,
-            'won_deals_count': 1 if is_customer else 0,
-            'related_won_deals_count': 1 if is_customer else 0,
-            'lost_deals_count': random.randint(0, 1),
-            'related_lost_deals_count': 0,
-            
-            'people_count': random.randint(1, 4),
-            'email_messages_count': random.randint(0, 30),
-            'files_count': random.randint(0, 8),
-            'notes_count': random.randint(0, 12),
-            'followers_count': random.randint(1, 3),
-            
-            'industry': fake.bs(),
-            'company_size': random.choice(['1-10', '11-50', '51-200', '201-500', '500+']),
-            'website': f"https://{company_name.lower().replace(' ', '')}.com",
-            'annual_revenue': random.randint(100000, 50000000),
-            
-            '_generated_at': datetime.now().isoformat(),
-            '_source': 'form_fill',
-            '_is_customer': is_customer,
-        }
-        
-        org_id += 1
-    
+
+    for start, stop in chunk_bounds(faker_orgs):
+        names = np.array(fake.sample('company', stop - start), dtype=object)
+        names = names[unseen(names, seen_companies)]
+        yield form_fill_chunk(names, org_id)
+        org_id += len(names)
+
     # 3. Organizations from anonymous purchasers (post-purchase)
     anonymous_orgs = int(anonymous_customers * 0.7)
-    
-    for _ in range(anonymous_orgs):
-        company_name = fake.company()
-        if company_name in seen_companies:
-            continue
-        seen_companies.add(company_name)
-        
-        purchase_time = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA))
-        
-        yield {
-            'id': org_id,
-            'name': company_name,
-            'owner_id': random.choice(SALES_REPS),
-            'org_id': org_id,
-            'add_time': purchase_time.isoformat(),
-            'update_time': purchase_time.isoformat(),
-            
-            'address': fake.street_address(),
-            'country': random.choices([g['country'] for g in GEO_DISTRIBUTION], 
-                                    weights=[g['weight'] for g in GEO_DISTRIBUTION])[0],
-            'admin_area_level_1': fake.state(),
-            'locality': fake.city(),
-            'route': fake.street_name(),
-            'street_number': str(random.randint(1, 9999)),
-            'postal_code': fake.postcode(),
-            
-            'is_deleted': False,
-            'visible_to': 7,
-            'label_ids': [1, 2],
-            
-            'next_activity_id': None,
-            'last_activity_id': None,
-            'activities_count': 0,
-            'done_activities_count': 0,
-            'undone_activities_count': 0,
-            
-            'open_deals_count': 0,
-            'related_open_deals_count': 0,
-            'closed_deals_count': 1,
-            'related_closed_deals_count': 1,
-            'won_deals_count': 1,
-            'related_won_deals_count': 1,
-            'lost_deals_count': 0,
-            'related_lost_deals_count': 0,
-            
-            'people_count': 1,
-            'email_messages_count': random.randint(0, 5),
-            'files_count': 0,
-            'notes_count': 0,
-            'followers_count': 1,
-            
-            'industry': fake.bs(),
-            'company_size': random.choice(['1-10', '11-50', '51-200']),
-            'website': f"https://{company_name.lower().replace(' ', '')}.com",
-            'annual_revenue': random.randint(100000, 10000000),
-            
-            '_generated_at': datetime.now().isoformat(),
-            '_source': 'anonymous_purchase',
-            '_is_customer': True,
-        }
-        
-        org_id += 1
-    
+
+    for start, stop in chunk_bounds(anonymous_orgs):
+        names = np.array(fake.sample('company', stop - start), dtype=object)
+        names = names[unseen(names, seen_companies)]
+        yield anonymous_chunk(names, org_id)
+        org_id += len(names)
+
     print(f"\nGenerated {org_id - 1} unique organizations")
 
 
@@ -262,4 +225,4 @@ if __name__ == "__main__":
     
     load_info = pipeline.run(organizations(), loader_file_format="parquet")
     
-    print(f"\n✓ Pipedrive organizations: purchased + form-fill companies")
\ No newline at end of file
+    print(f"\n✓ Pipedrive organizations: purchased + form-fill companies")
\ No newline at end of file
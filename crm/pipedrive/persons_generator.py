@@ -3,291 +3,241 @@ Pipedrive Persons Generator
 Individual contacts from purchased leads + form fills
 """
 import dlt
-import pandas as pd
-from datetime import datetime, timedelta
-import random
+import numpy as np
+import pyarrow as pa
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
 from shared_config import *
+from rng_streams import stream
+from faker_pools import FakerPools
+from arrow_chunks import (TIMESTAMP, arrow_rows, chunk_bounds, offsets, randint, timestamps, generated_at,
+                          column_or, nullable, constant, choice, pick_lists, contacts, empty_lists, join, struct)
+from table_schemas import arrow_schema, resource_hints
+import input_cache
 
-from faker import Faker
+# Faker values are sampled from cached per-provider pools (see faker_pools)
+fake = FakerPools(SEED, rng=stream('pipedrive', 'persons', 'faker_pools', seed=SEED))
+rng = stream('pipedrive', 'persons', seed=SEED)
+
+SALES_REPS = [1, 2, 3, 4, 5]
+GEO_COUNTRIES = [g['country'] for g in GEO_DISTRIBUTION]
+GEO_WEIGHTS = [g['weight'] for g in GEO_DISTRIBUTION]
 
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
 
-print("Loading purchased lead data...")
-byd_df = pd.read_parquet('gs://mock-source-data/customer_data_population/mock_bookyourdata/bookyourdata/1762095548.474671.701ad8b601.parquet')
-uplead_df = pd.read_parquet('gs://mock-source-data/customer_data_population/mock_upleads/uplead/1762095612.4264941.2fb362f699.parquet')
+def fake_address(n, countries):
+    return struct(
+        value=fake.sample('street_address', n),
+        country=countries,
+        admin_area_level_1=fake.sample('state', n),
+        locality=fake.sample('city', n),
+        route=fake.sample('street_name', n),
+        street_number=randint(rng, 1, 9999, n).astype(str),
+        postal_code=fake.sample('postcode', n),
+    )
 
-purchased_leads = pd.concat([byd_df, uplead_df], ignore_index=True)
-print(f"Loaded {len(purchased_leads)} purchased leads")
 
-SALES_REPS = [1, 2, 3, 4, 5]
+def person_table(first_id, n, is_customer, add_seconds, update_seconds, **columns):
+    """One chunk of persons: id, timestamps and labels around the section-specific columns"""
+    table = {
+        'id': np.arange(first_id, first_id + n),
+        'name': columns.pop('name'),
+        'first_name': columns.pop('first_name'),
+        'last_name': columns.pop('last_name'),
+        'owner_id': choice(rng, SALES_REPS, n).astype(np.int64),
+        'org_id': columns.pop('org_id'),
+        'add_time': timestamps(START_DATE, add_seconds),
+        'update_time': timestamps(START_DATE, update_seconds),
+        'email': columns.pop('email'),
+        'phone': columns.pop('phone'),
+        'is_deleted': constant(False, n, pa.bool_()),
+        'visible_to': constant(7, n, pa.int64()),
+        'label_ids': pick_lists(is_customer, [1, 2], [1]),
+        'picture_id': constant(None, n, pa.int64()),
+        'notes': constant(columns.pop('notes'), n, pa.string()),
+        'im': empty_lists(n),
+        'birthday': constant(None, n, pa.string()),
+    }
+    source = columns.pop('_source')
+    table.update(columns)
+    table['_generated_at'] = generated_at(n)
+    table['_source'] = constant(source, n, pa.string())
+    table['_is_customer'] = is_customer
+    return pa.table(table)
+
+
+def engaged_counts(n, is_customer, activity_rate, activities, done, emails, files, notes):
+    """Activity, deal and engagement counters for leads that sales has worked"""
+    return {
+        'next_activity_id': nullable(randint(rng, 1, 1000, n), is_customer),
+        'last_activity_id': nullable(randint(rng, 1, 1000, n), rng.random(n) >= activity_rate),
+        'activities_count': randint(rng, 0, activities, n),
+        'done_activities_count': randint(rng, 0, done, n),
+        'undone_activities_count': randint(rng, 0, 5, n),
+        'open_deals_count': np.where(is_customer, 0, randint(rng, 0, 2, n)),
+        'related_open_deals_count': np.where(is_customer, 0, randint(rng, 0, 1, n)),
+        'closed_deals_count': np.where(is_customer, 1, randint(rng, 0, 1, n)),
+        'related_closed_deals_count': is_customer.astype(np.int64),
+        'participant_open_deals_count': np.where(is_customer, 0, randint(rng, 0, 1, n)),
+        'participant_closed_deals_count': is_customer.astype(np.int64),
+        'won_deals_count': is_customer.astype(np.int64),
+        'related_won_deals_count': is_customer.astype(np.int64),
+        'lost_deals_count': randint(rng, 0, 1, n),
+        'related_lost_deals_count': np.zeros(n, dtype=np.int64),
+        'email_messages_count': randint(rng, 0, emails, n),
+        'files_count': randint(rng, 0, files, n),
+        'notes_count': randint(rng, 0, notes, n),
+        'followers_count': randint(rng, 1, 3, n),
+    }
+
+
+def purchased_chunk(leads, first_id):
+    """Persons from one chunk of purchased leads"""
+    n = len(leads)
+    is_customer = rng.random(n) < LEAD_CONVERSION_RATE
+    add_seconds = offsets(rng, n, days=(0, DAYS_OF_DATA - 30), hours=(8, 18))
+    update_seconds = add_seconds + offsets(rng, n, days=(0, 60))
+    first_name = column_or(leads, 'first_name', lambda k: fake.sample('first_name', k))
+    last_name = column_or(leads, 'last_name', lambda k: fake.sample('last_name', k))
+
+    return person_table(
+        first_id, n, is_customer, add_seconds, update_seconds,
+        name=join(first_name, ' ', last_name),
+        first_name=first_name,
+        last_name=last_name,
+        org_id=randint(rng, 1, 100000, n),
+        email=contacts(column_or(leads, 'email', lambda k: fake.sample('email', k))),
+        phone=contacts(column_or(leads, 'phone', lambda k: fake.sample('phone_number', k))),
+        notes=None,
+        job_title=column_or(leads, 'title', lambda k: fake.sample('job', k)),
+        address=struct(
+            value=column_or(leads, 'address', lambda k: fake.sample('street_address', k)),
+            country=column_or(leads, 'country', lambda k: fake.sample('country', k)),
+            admin_area_level_1=column_or(leads, 'state', lambda k: fake.sample('state', k)),
+            locality=column_or(leads, 'city', lambda k: fake.sample('city', k)),
+            route=fake.sample('street_name', n),
+            street_number=randint(rng, 1, 9999, n).astype(str),
+            postal_code=fake.sample('postcode', n),
+        ),
+        **engaged_counts(n, is_customer, 0.8, 25, 20, 60, 10, 15),
+        last_incoming_mail_time=timestamps(START_DATE, update_seconds - offsets(rng, n, days=(1, 30)), rng.random(n) >= 0.7),
+        last_outgoing_mail_time=timestamps(START_DATE, update_seconds, rng.random(n) >= 0.8),
+        linkedin_url=column_or(leads, 'linkedin', lambda k: np.char.add('https://linkedin.com/in/', fake.sample('user_name', k))),
+        lead_source=constant('Purchased List', n, pa.string()),
+        company=column_or(leads, 'company', lambda k: fake.sample('company', k)),
+        industry=column_or(leads, 'industry', lambda k: fake.sample('bs', k)),
+        _source='purchased_list',
+    )
+
+
+def form_fill_chunk(n, first_id):
+    """Persons from web form fills"""
+    is_customer = rng.random(n) < (LEAD_CONVERSION_RATE * 0.8)
+    add_seconds = offsets(rng, n, days=(0, DAYS_OF_DATA), hours=(8, 22))
+    update_seconds = add_seconds + offsets(rng, n, hours=(1, 720))
+    first_name = fake.sample('first_name', n)
+    last_name = fake.sample('last_name', n)
+
+    return person_table(
+        first_id, n, is_customer, add_seconds, update_seconds,
+        name=join(first_name, ' ', last_name),
+        first_name=first_name,
+        last_name=last_name,
+        org_id=randint(rng, 1, 150000, n),
+        email=contacts(fake.sample('email', n)),
+        phone=contacts(fake.sample('phone_number', n)),
+        notes='Contact from web form',
+        job_title=fake.sample('job', n),
+        address=fake_address(n, choice(rng, GEO_COUNTRIES, n, GEO_WEIGHTS)),
+        **engaged_counts(n, is_customer, 0.7, 20, 15, 40, 8, 12),
+        last_incoming_mail_time=timestamps(START_DATE, update_seconds - offsets(rng, n, hours=(1, 72)), rng.random(n) >= 0.6),
+        last_outgoing_mail_time=timestamps(START_DATE, update_seconds, rng.random(n) >= 0.7),
+        linkedin_url=join('https://linkedin.com/in/', fake.sample('user_name', n)),
+        lead_source=choice(rng, ['Google Ads Form', 'Facebook Ads Form', 'Website Form'], n),
+        company=fake.sample('company', n),
+        industry=fake.sample('bs', n),
+        _source='form_fill',
+    )
+
 
+def anonymous_chunk(n, first_id):
+    """Anonymous purchasers, added to the CRM after purchase"""
+    is_customer = np.ones(n, dtype=bool)
+    purchase_seconds = offsets(rng, n, days=(0, DAYS_OF_DATA))
+    zeros = np.zeros(n, dtype=np.int64)
+    ones = np.ones(n, dtype=np.int64)
+
+    return person_table(
+        first_id, n, is_customer, purchase_seconds, purchase_seconds,
+        name=fake.sample('name', n),
+        first_name=fake.sample('first_name', n),
+        last_name=fake.sample('last_name', n),
+        org_id=randint(rng, 1, 240000, n),
+        email=contacts(fake.sample('email', n)),
+        phone=contacts(fake.sample('phone_number', n), present=rng.random(n) < 0.7),
+        notes='Customer from self-serve purchase',
+        job_title=fake.sample('job', n),
+        address=fake_address(n, choice(rng, GEO_COUNTRIES, n, GEO_WEIGHTS)),
+        next_activity_id=constant(None, n, pa.int64()),
+        last_activity_id=constant(None, n, pa.int64()),
+        activities_count=zeros,
+        done_activities_count=zeros,
+        undone_activities_count=zeros,
+        open_deals_count=zeros,
+        related_open_deals_count=zeros,
+        closed_deals_count=ones,
+        related_closed_deals_count=ones,
+        participant_open_deals_count=zeros,
+        participant_closed_deals_count=ones,
+        won_deals_count=ones,
+        related_won_deals_count=ones,
+        lost_deals_count=zeros,
+        related_lost_deals_count=zeros,
+        email_messages_count=randint(rng, 0, 5, n),
+        files_count=zeros,
+        notes_count=zeros,
+        followers_count=ones,
+        last_incoming_mail_time=constant(None, n, TIMESTAMP),
+        last_outgoing_mail_time=constant(None, n, TIMESTAMP),
+        linkedin_url=constant(None, n, pa.string()),
+        lead_source=constant('Self-Serve Purchase', n, pa.string()),
+        company=fake.sample('company', n),
+        industry=fake.sample('bs', n),
+        _source='anonymous_purchase',
+    )
 
-@dlt.resource(write_disposition="append", table_name="persons")
+
+@dlt.resource(write_disposition="append", table_name="persons", **resource_hints('pipedrive', 'persons'))
+@arrow_rows(arrow_schema('pipedrive', 'persons'))
 def persons():
-    """Generate persons: leads + form fills + anonymous purchasers"""
-    
+    """Generate persons: leads + form fills + anonymous purchasers, one Arrow table per chunk"""
+
     person_id = 1
-    
+
     # Calculate anonymous purchasers
-    total_sessions = sum(get_daily_metrics(d)['sessions'] for d in range(DAYS_OF_DATA))
-    anonymous_rate = (ANONYMOUS_CONVERSION_RATES['add_to_cart'] * 
-                     ANONYMOUS_CONVERSION_RATES['checkout_start'] * 
+    total_sessions = metric_total('sessions')
+    anonymous_rate = (ANONYMOUS_CONVERSION_RATES['add_to_cart'] *
+                     ANONYMOUS_CONVERSION_RATES['checkout_start'] *
                      ANONYMOUS_CONVERSION_RATES['purchase'])
     anonymous_customers = int(total_sessions * (1 - LEAD_PERCENTAGE_OF_TRAFFIC) * anonymous_rate)
-    
+
     # 1. Persons from purchased leads
-    for idx, lead in purchased_leads.iterrows():
-        days_offset = random.randint(0, DAYS_OF_DATA - 30)
-        add_time = START_DATE + timedelta(days=days_offset, hours=random.randint(8, 18))
-        update_time = add_time + timedelta(days=random.randint(0, 60))
-        
-        owner = random.choice(SALES_REPS)
-        is_customer = random.random() < LEAD_CONVERSION_RATE
-        
-        yield {
-            'id': person_id,
-            'name': f"{lead.get('first_name', fake.first_name())} {lead.get('last_name', fake.last_name())}",
-            'first_name': lead.get('first_name', fake.first_name()),
-            'last_name': lead.get('last_name', fake.last_name()),
-            'owner_id': owner,
-            'org_id': random.randint(1, 100000),
-            'add_time': add_time.isoformat(),
-            'update_time': update_time.isoformat(),
-            
-            'email': [
-                {'value': lead.get('email', fake.email()), 'primary': True, 'label': 'work'}
-            ],
-            'phone': [
-                {'value': lead.get('phone', fake.phone_number()), 'primary': True, 'label': 'work'}
-            ],
-            
-            'is_deleted': False,
-            'visible_to': 7,
-            'label_ids': [1, 2] if is_customer else [1],
-            'picture_id': None,
-            'notes': None,
-            
-            'im': [],
-            'birthday': None,
-            'job_title': lead.get('title', fake.job()),
-            
-            'address': {
-                'value': lead.get('address', fake.street_address()),
-                'country': lead.get('country', fake.country()),
-                'admin_area_level_1': lead.get('state', fake.state()),
-                'locality': lead.get('city', fake.city()),
-                'route': fake.street_name(),
-                'street_number': str(random.randint(1, 9999)),
-                'postal_code': fake.postcode(),
-            },
-            
-            # Activity metrics
-            'next_activity_id': None if is_customer else random.randint(1, 1000),
-            'last_activity_id': random.randint(1, 1000) if random.random() < 0.8 else None,
-            'activities_count': random.randint(0, 25),
-            'done_activities_count': random.randint(0, 20),
-            'undone_activities_count': random.randint(0, 5),
-            
-            # Deal metrics
-            'open_deals_count': 0 if is_customer else random.randint(0, 2),
-            'related_open_deals_count': 0 if is_customer else random.randint(0, 1),
-            'closed_deals_count': 1 if is_customer else random.randint(0, 1),
-            'related_closed_deals_count': 1 if is_customer else 0,
-            'participant_open_deals_count': 0 if is_customer else random.randint(0, 1),
-            'participant_closed_deals_count': 1 if is_customer else 0,
-            'won_deals_count': 1 if is_customer else 0,
-            'related_won_deals_count': 1 if is_customer else 0,
-            'lost_deals_count': random.randint(0, 1),
-            'related_lost_deals_count': 0,
-            
-            # Engagement
-            'email_messages_count': random.randint(0, 60),
-            'files_count': random.randint(0, 10),
-            'notes_count': random.randint(0, 15),
-            'followers_count': random.randint(1, 3),
-            'last_incoming_mail_time': (update_time - timedelta(days=random.randint(1, 30))).isoformat() if random.random() < 0.7 else None,
-            'last_outgoing_mail_time': update_time.isoformat() if random.random() < 0.8 else None,
-            
-            # Custom fields
-            'linkedin_url': lead.get('linkedin', f"https://linkedin.com/in/{fake.user_name()}"),
-            'lead_source': 'Purchased List',
-            'company': lead.get('company', fake.company()),
-            'industry': lead.get('industry', fake.bs()),
-            
-            '_generated_at': datetime.now().isoformat(),
-            '_source': 'purchased_list',
-            '_is_customer': is_customer,
-        }
-        
-        person_id += 1
-    
+    purchased_leads = input_cache.purchased_leads()
+    for start, stop in chunk_bounds(len(purchased_leads)):
+        yield purchased_chunk(purchased_leads.iloc[start:stop], person_id)
+        person_id += stop - start
+
     # 2. Persons from form fills
-    form_fill_count = sum(get_daily_metrics(d)['identified_leads'] for d in range(DAYS_OF_DATA))
-    
-    for _ in range(form_fill_count):
-        days_offset = random.randint(0, DAYS_OF_DATA)
-        add_time = START_DATE + timedelta(days=days_offset, hours=random.randint(8, 22))
-        update_time = add_time + timedelta(hours=random.randint(1, 720))
-        
-        owner = random.choice(SALES_REPS)
-        is_customer = random.random() < (LEAD_CONVERSION_RATE * 0.8)
-        
-        first = fake.first_name()
-        last = fake.last_name()
-        email = fake.email()
-        
-        yield {
-            'id': person_id,
-            'name': f"{first} {last}",
-            'first_name': first,
-            'last_name': last,
-            'owner_id': owner,
-            'org_id': random.randint(1, 150000),
-            'add_time': add_time.isoformat(),
-            'update_time': update_time.isoformat(),
-            
-            'email': [
-                {'value': email, 'primary': True, 'label': 'work'}
-            ],
-            'phone': [
-                {'value': fake.phone_number(), 'primary': True, 'label': 'work'}
-            ],
-            
-            'is_deleted': False,
-            'visible_to': 7,
-            'label_ids': [1, 2] if is_customer else [1],
-            'picture_id': None,
-            'notes': 'Contact from web form',
-            
-            'im': [],
-            'birthday': None,
-            'job_title': fake.job(),
-            
-            'address': {
-                'value': fake.street_address(),
-                'country': random.choices([g['country'] for g in GEO_DISTRIBUTION], 
-                                        weights=[g['weight'] for g in GEO_DISTRIBUTION])[0],
-                'admin_area_level_1': fake.state(),
-                'locality': fake.city(),
-                'route': fake.street_name(),
-                'street_number': str(random.randint(1, 9999)),
-                'postal_code': fake.postcode(),
-            },
-            
-            'next_activity_id': None if is_customer else random.randint(1, 1000),
-            'last_activity_id': random.randint(1, 1000) if random.random() < 0.7 else None,
-            'activities_count': random.randint(0, 20),
-            'done_activities_count': random.randint(0, 15),
-            'undone_activities_count': random.randint(0, 5),
-            
-            'open_deals_count': 0 if is_customer else random.randint(0, 2),
-            'related_open_deals_count': 0 if is_customer else random.randint(0, 1),
-            'closed_deals_count': 1 if is_customer else random.randint(0, 1),
-            'related_closed_deals_count': 1 if is_customer else 0,
-            'participant_open_deals_count': 0 if is_customer else random.randint(0, 1),
-            'participant_closed_deals_count': 1 if is_customer else 0,
-            'won_deals_count': 1 if is_customer else 0,
-            'related_won_deals_count': 1 if is_customer else 0,
-            'lost_deals_count': random.randint(0, 1),
-            'related_lost_deals_count': 0,
-            
-            'email_messages_count': random.randint(0, 40),
-            'files_count': random.randint(0, 8),
-            'notes_count': random.randint(0, 12),
-            'followers_count': random.randint(1, 3),
-            'last_incoming_mail_time': (update_time - timedelta(hours=random.randint(1, 72))).isoformat() if random.random() < 0.6 else None,
-            'last_outgoing_mail_time': update_time.isoformat() if random.random() < 0.7 else None,
-            
-            'linkedin_url': f"https://linkedin.com/in/{fake.user_name()}",
-            'lead_source': random.choice(['Google Ads Form', 'Facebook Ads Form', 'Website Form']),
-            'company': fake.company(),
-            'industry': fake.bs(),
-            
-            '_generated_at': datetime.now().isoformat(),
-            '_source': 'form_fill',
-            '_is_customer': is_customer,
-        }
-        
-        person_id += 1
-    
+    form_fill_count = metric_total('identified_leads')
+    for start, stop in chunk_bounds(form_fill_count):
+        yield form_fill_chunk(stop - start, person_id)
+        person_id += stop - start
+
     # 3. Anonymous purchasers (added to CRM post-purchase)
-    for _ in range(anonymous_customers):
-        purchase_time = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA))
-        
-        yield {
-            'id': person_id,
-            'name': fake.name(),
-            'first_name': fake.first_name(),
-            'last_name': fake.last_name(),
-            'owner_id': random.choice(SALES_REPS),
-            'org_id': random.randint(1, 240000),
-            'add_time': purchase_time.isoformat(),
-            'update_time': purchase_time.isoformat(),
-            
-            'email': [{'value': fake.email(), 'primary': True, 'label': 'work'}],
-            'phone': [{'value': fake.phone_number(), 'primary': True, 'label': 'work'}] if random.random() < 0.7 else [],
-            
-            'is_deleted': False,
-            'visible_to': 7,
-            'label_ids': [1, 2],
-            'picture_id': None,
-            'notes': 'Customer from self-serve purchase',
-            'im': [],
-            'birthday': None,
-            'job_title': fake.job(),
-            
-            'address': {
-                'value': fake.street_address(),
-                'country': random.choices([g['country'] for g in GEO_DISTRIBUTION], 
-                                        weights=[g['weight'] for g in GEO_DISTRIBUTION])[0],
-                'admin_area_level_1': fake.state(),
-                'locality': fake.city(),
-                'route': fake.street_name(),
-                'street_number': str(random.randint(1, 9999)),
-                'postal_code': fake.postcode(),
-            },
-            
-            'next_activity_id': None,
-            'last_activity_id': None,
-            'activities_count': 0,
-            'done_activities_count': 0,
-            'undone_activities_count': 0,
-            
-            'open_deals_count': 0,
-            'related_open_deals_count': 0,
-            'closed_deals_count': 1,
-            'related_closed_deals_count': 1,
-            'participant_open_deals_count': 0,
-            'participant_closed_deals_count': 1,
-            'won_deals_count': 1,
-            'related_won_deals_count': 1,
-            'lost_deals_count': 0,
-            'related_lost_deals_count': 0,
-            
-            'email_messages_count': random.randint(0, 5),
-            'files_count': 0,
-            'notes_count': 0,
-            'followers_count': 1,
-            'last_incoming_mail_time': None,
-            'last_outgoing_mail_time': None,
-            
-            'linkedin_url': None,
-            'lead_source': 'Self-Serve Purchase',
-            'company': fake.company(),
-            'industry': fake.bs(),
-            
-            '_generated_at': datetime.now().isoformat(),
-            '_source': 'anonymous_purchase',
-            '_is_customer': True,
-        }
-        
-        person_id += 1
-    
+    for start, stop in chunk_bounds(anonymous_customers):
+        yield anonymous_chunk(stop - start, person_id)
+        person_id += stop - start
+
     print(f"\nGenerated {person_id - 1} persons")
 
 
@@ -297,7 +247,7 @@ if __name__ == "__main__":
         destination="filesystem",
         dataset_name="pipedrive"
     )
-    
+
     load_info = pipeline.run(persons(), loader_file_format="parquet")
-    
-    print(f"\n✓ Pipedrive persons: ~{len(purchased_leads) + 73000} contacts")
\ No newline at end of file
+
+    print(f"\n✓ Pipedrive persons: ~{input_cache.purchased_leads_count() + 73000} contacts")
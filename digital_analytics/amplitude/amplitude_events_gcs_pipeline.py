@@ -6,6 +6,13 @@ from rich.console import Console
 from rich.logging import RichHandler
 import logging
 
+from event_engine import canonical_id_strings
+
+BATCH_ROWS = 65536
+
+# Event files written with --compact-ids hold 16-byte binary ids; render canonical strings on export
+ID_COLUMNS = ['event_id', 'device_id', 'user_id']
+
 console = Console()
 logging.basicConfig(level=logging.INFO, handlers=[RichHandler(console=console)])
 
@@ -14,11 +21,18 @@ logging.basicConfig(level=logging.INFO, handlers=[RichHandler(console=console)])
     primary_key=['event_id', 'device_id']
 )
 def amplitude_events(file_path):
-    """Process amplitude event files."""
+    """Stream amplitude event files (monthly, many row groups) as Arrow batches; a whole file is never held in memory."""
     console.log(f"[blue]Reading: {file_path}")
-    df = pl.read_parquet(file_path)
-    console.log(f"[green]Loaded {len(df):,} rows")
-    yield df.to_dicts()
+    rows = 0
+    for chunk in pl.scan_parquet(file_path).collect_batches(chunk_size=BATCH_ROWS):
+        table = chunk.to_arrow()
+        for name in ID_COLUMNS:
+            if name in table.column_names:
+                i = table.schema.get_field_index(name)
+                table = table.set_column(i, name, canonical_id_strings(table.column(name)))
+        rows += table.num_rows
+        yield table
+    console.log(f"[green]Loaded {rows:,} rows")
 
 if __name__ == '__main__':
     console.log("[bold cyan]Amplitude → GCS pipeline")
@@ -1,6 +1,15 @@
 """
 Comprehensive Analysis: Amplitude Events → GA4 Reports + User Funnel State
 Generates GA4 reports matching exact schemas AND user-level funnel progression for CRM
+
+Everything below is one lazy plan over a single scan of the event files; the
+reports are executed together with collect_all on the streaming engine, so the
+shared scan and common subplans (first touch, session aggregation) run once
+
+USER_COUNT_MODE picks how the reports count users per group: 'exact' (n_unique),
+'hll' (HyperLogLog registers per group, see hll_sketch; saved so daily, monthly
+and rolling totals merge without rescanning events) or 'validate' (HLL in the
+reports plus an exact-vs-estimate error report)
 """
 import polars as pl
 from datetime import datetime
@@ -8,24 +17,89 @@ import sys
 import os
 
 sys.path.append(os.path.dirname(__file__))
-from shared_config import KEY_EVENTS
-
-AVERAGE_TRANSACTION_VALUE = 99.0  # For revenue calculations
+from shared_config import KEY_EVENTS, REVENUE_EVENTS, AVERAGE_TRANSACTION_VALUE
+from identity_graph import IdentityGraph, LINK_KINDS
+import hll_sketch
+
+# event_date/event_month stay typed (date32) through the aggregations and are
+# rendered to the GA4 string keys only on the final, report-sized frames
+GA4_DATE_KEYS = [
+    pl.col('event_date').dt.strftime('%Y%m%d'),
+    pl.col('event_month').dt.strftime('%Y-%m'),
+]
+
+# Monthly event files, including per-shard parts and size roll-overs
+EVENTS_GLOB = 'data/events_month_*.parquet'
+
+USER_COUNT_MODE = os.environ.get('USER_COUNT_MODE', 'exact')  # 'exact' | 'hll' | 'validate'
+ROLLING_WINDOWS = [7, 28]  # trailing-day windows merged from the daily registers
+USER_REGISTERS_DIR = 'output/ga4_user_registers'
+
+# Per-report HLL registers and exact-vs-estimate checks, collected with the reports
+user_registers = {}
+user_count_checks = {}
+
+
+def distinct_users() -> pl.Expr:
+    """Users per group: exact n_unique, or a placeholder that with_user_estimates fills"""
+    if USER_COUNT_MODE == 'hll':
+        return pl.lit(None, dtype=pl.Int64)
+    return pl.col('device_id').n_unique()
+
+
+def with_user_estimates(report: pl.LazyFrame, frame: pl.LazyFrame, keys: list, name: str) -> pl.LazyFrame:
+    """Replace total_users with the HLL estimate of the same groups (unchanged in exact mode)"""
+    if USER_COUNT_MODE == 'exact':
+        return report
+    user_registers[name] = hll_sketch.sketch(frame, keys, 'device_id')
+    report = report.join(hll_sketch.estimate(user_registers[name], keys, 'estimated_users'), on=keys, how='left')
+    if USER_COUNT_MODE == 'validate':
+        user_count_checks[name] = report.select(keys + [pl.col('total_users').alias('exact_users'), 'estimated_users'])
+    return report.with_columns(pl.col('estimated_users').alias('total_users')).drop('estimated_users')
+
+
+def user_totals(registers: pl.DataFrame, keys: list) -> pl.DataFrame:
+    """Daily, monthly and rolling user estimates merged from one report's registers, per
+    dimension group and overall (null dimensions). event_date is the day, the first of
+    the month, or the last day of the window"""
+    grains = [('day', registers), ('month', hll_sketch.monthly(registers, keys))]
+    grains += [(f'rolling_{days}d', hll_sketch.rolling(registers, keys, days)) for days in ROLLING_WINDOWS]
+    totals = []
+    for grain, merged in grains:
+        for group in (keys, []):
+            totals.append(hll_sketch.estimate(merged, ['event_date'] + group, 'total_users')
+                .with_columns(pl.lit(grain).alias('grain')))
+    return pl.concat(totals, how='diagonal').select(['grain', 'event_date', *keys, 'total_users']).sort(['grain', 'event_date'])
+
+
+def user_count_errors(checks: dict) -> pl.DataFrame:
+    """Relative error of the HLL estimates against exact counts, per report"""
+    bound = hll_sketch.standard_error()
+    relative_error = (pl.col('estimated_users') - pl.col('exact_users')).abs() / pl.col('exact_users')
+    return pl.concat([
+        check.select([pl.lit(name).alias('report'), 'exact_users', 'estimated_users', relative_error.alias('relative_error')])
+        for name, check in checks.items()
+    ]).group_by('report', maintain_order=True).agg([
+        pl.len().alias('groups'),
+        (pl.col('estimated_users').sum() / pl.col('exact_users').sum() - 1).round(5).alias('summed_bias'),
+        pl.col('relative_error').mean().round(5).alias('mean_relative_error'),
+        pl.col('relative_error').quantile(0.95).round(5).alias('p95_relative_error'),
+        pl.col('relative_error').max().round(5).alias('max_relative_error'),
+        pl.lit(round(bound, 5)).alias('standard_error'),
+        (pl.col('relative_error') <= 2 * bound).mean().round(4).alias('share_within_2se'),
+    ])
 
 print("="*80)
-print("LOADING AMPLITUDE EVENT DATA")
+print("PLANNING AMPLITUDE EVENT ANALYSIS")
 print("="*80)
 
-# Read all months
-dfs = []
-for month in range(12):
-    df = pl.read_parquet(f'data/events_month_{month:02d}.parquet')
-    dfs.append(df)
-    print(f"  Month {month}: {len(df):,} events")
-
-events = pl.concat(dfs)
-print(f"\nTotal events: {len(events):,}")
-print(f"Date range: {events.select('event_date').min()[0,0]} to {events.select('event_date').max()[0,0]}")
+# Lazy scan: projection pushdown reads only the columns the plans reference
+events = pl.scan_parquet(EVENTS_GLOB)
+event_stats = events.select([
+    pl.len().alias('total_events'),
+    pl.col('event_date').min().alias('first_date'),
+    pl.col('event_date').max().alias('last_date'),
+])
 
 # Parse nested properties
 events = events.with_columns([
@@ -35,70 +109,50 @@ events = events.with_columns([
     pl.col('user_properties').struct.field('engagement_tier').alias('engagement_tier'),
 ])
 
-print("\n" + "="*80)
-print("GA4 EVENTS REPORT")
-print("="*80)
-
 # Events report - exact schema match
-ga4_events_report = (events
-    .with_columns([
-        pl.col('event_date').str.replace_all('-', '').alias('event_date'),
-        pl.col('event_date').str.slice(0, 7).alias('event_month'),
-        (pl.col('source') + '/' + pl.col('medium')).alias('source_medium')
-    ])
-    .group_by(['event_date', 'event_month', pl.col('event_type').alias('event_name'), 'source_medium'])
+named_events = events.with_columns([
+    pl.col('event_date').dt.truncate('1mo').alias('event_month'),
+    pl.col('event_type').alias('event_name'),
+    (pl.col('source') + '/' + pl.col('medium')).alias('source_medium')
+])
+ga4_events_report = (named_events
+    .group_by(['event_date', 'event_month', 'event_name', 'source_medium'])
     .agg([
         pl.count().alias('event_count'),
-        pl.col('device_id').n_unique().alias('total_users'),
-        (pl.when(pl.col('event_type').is_in(['payment_completed', 'subscription_created', 'trial_converted']))
+        distinct_users().alias('total_users'),
+        (pl.when(pl.col('event_type').is_in(REVENUE_EVENTS))
          .then(pl.lit(AVERAGE_TRANSACTION_VALUE))
          .otherwise(pl.lit(0.0))).sum().alias('total_revenue')
     ])
+    .pipe(with_user_estimates, named_events, ['event_date', 'event_name', 'source_medium'], 'events_report')
     .with_columns([
         (pl.col('event_count') / pl.col('total_users')).round(2).alias('event_count_per_user')
     ])
     .sort('event_date')
+    .with_columns(GA4_DATE_KEYS)
 )
 
-print(ga4_events_report.head(10))
-print(f"\nTotal records: {len(ga4_events_report):,}")
-
-print("\n" + "="*80)
-print("GA4 CONVERSIONS REPORT")
-print("="*80)
-
 # Conversions report - key events only (exact schema)
-ga4_conversions_report = (events
-    .filter(pl.col('event_type').is_in(KEY_EVENTS))
-    .with_columns([
-        pl.col('event_date').str.replace_all('-', '').alias('event_date'),
-        pl.col('event_date').str.slice(0, 7).alias('event_month'),
-        (pl.col('source') + '/' + pl.col('medium')).alias('source_medium')
-    ])
-    .group_by(['event_date', 'event_month', pl.col('event_type').alias('event_name'), 'source_medium'])
+named_key_events = named_events.filter(pl.col('event_type').is_in(KEY_EVENTS))
+ga4_conversions_report = (named_key_events
+    .group_by(['event_date', 'event_month', 'event_name', 'source_medium'])
     .agg([
         pl.count().alias('key_events'),
-        pl.col('device_id').n_unique().alias('total_users'),
-        (pl.when(pl.col('event_type').is_in(['payment_completed', 'subscription_created', 'trial_converted']))
+        distinct_users().alias('total_users'),
+        (pl.when(pl.col('event_type').is_in(REVENUE_EVENTS))
          .then(pl.lit(AVERAGE_TRANSACTION_VALUE))
          .otherwise(pl.lit(0.0))).sum().alias('total_revenue')
     ])
+    .pipe(with_user_estimates, named_key_events, ['event_date', 'event_name', 'source_medium'], 'conversions_report')
     .sort('event_date')
+    .with_columns(GA4_DATE_KEYS)
 )
 
-print(ga4_conversions_report.head(10))
-print(f"\nTotal records: {len(ga4_conversions_report):,}")
-
-print("\n" + "="*80)
-print("GA4 TRAFFIC ACQUISITION REPORT")
-print("="*80)
-
 # Traffic acquisition - session-based metrics (exact schema)
 # Step 1: Session-level aggregations
 session_aggs = (events
     .with_columns([
-        pl.col('event_date').str.replace_all('-', '').alias('event_date'),
-        pl.col('event_date').str.slice(0, 7).alias('event_month'),
+        pl.col('event_date').dt.truncate('1mo').alias('event_month'),
         pl.col('source').alias('session_source'),
         pl.col('medium').alias('session_medium'),
     ])
@@ -116,40 +170,37 @@ ga4_traffic_acquisition = (session_aggs
         pl.col('session_id').n_unique().alias('total_sessions'),
         pl.col('has_conversion').sum().alias('engaged_sessions'),
         pl.col('events_in_session').sum().alias('event_count'),
-        pl.col('device_id').n_unique().alias('total_users'),
+        distinct_users().alias('total_users'),
+    ])
+    .pipe(with_user_estimates, session_aggs, ['event_date', 'session_source', 'session_medium'], 'traffic_acquisition')
+    .with_columns([
         # Approximate new users as 30% of total for this report
-        (pl.col('device_id').n_unique() * 0.3).cast(pl.Int64).alias('new_users'),
+        (pl.col('total_users') * 0.3).cast(pl.Int64).alias('new_users'),
     ])
     .with_columns([
         (pl.col('engaged_sessions') / pl.col('total_sessions')).round(2).alias('engagement_rate'),
         (pl.col('event_count') / pl.col('total_sessions')).round(2).alias('events_per_session')
     ])
     .sort('event_date')
+    .with_columns(GA4_DATE_KEYS)
 )
 
-print(ga4_traffic_acquisition.head(10))
-print(f"\nTotal records: {len(ga4_traffic_acquisition):,}")
-
-print("\n" + "="*80)
-print("GA4 USER ACQUISITION REPORT")  
-print("="*80)
-
 # User acquisition - first touch attribution (exact schema)
+# (ordered within each group: a global sort is not preserved through a streaming group_by)
 first_touch = (events
-    .sort('event_time')
     .group_by('device_id')
     .agg([
-        pl.col('event_date').first().alias('first_date'),
-        pl.col('source').first().alias('first_user_source'),
-        pl.col('medium').first().alias('first_user_medium'),
+        pl.col('event_date').sort_by('event_time').first().alias('first_date'),
+        pl.col('source').sort_by('event_time').first().alias('first_user_source'),
+        pl.col('medium').sort_by('event_time').first().alias('first_user_medium'),
     ])
 )
 
 # Calculate new users (those whose first_date is on that day)
 new_users_by_day = (first_touch
     .with_columns([
-        pl.col('first_date').str.replace_all('-', '').alias('event_date'),
-        pl.col('first_date').str.slice(0, 7).alias('event_month'),
+        pl.col('first_date').alias('event_date'),
+        pl.col('first_date').dt.truncate('1mo').alias('event_month'),
     ])
     .group_by(['event_date', 'event_month', 'first_user_source', 'first_user_medium'])
     .agg([
@@ -161,8 +212,7 @@ new_users_by_day = (first_touch
 user_acquisition_events = (events
     .join(first_touch, on='device_id')
     .with_columns([
-        pl.col('event_date').str.replace_all('-', '').alias('event_date'),
-        pl.col('event_date').str.slice(0, 7).alias('event_month'),
+        pl.col('event_date').dt.truncate('1mo').alias('event_month'),
     ])
 )
 
@@ -184,11 +234,12 @@ user_acq_metrics = (user_acquisition_events
     .group_by(['event_date', 'event_month', 'first_user_source', 'first_user_medium'])
     .agg([
         pl.count().alias('event_count'),
-        pl.col('device_id').n_unique().alias('total_users'),
-        (pl.when(pl.col('event_type').is_in(['payment_completed', 'subscription_created', 'trial_converted']))
+        distinct_users().alias('total_users'),
+        (pl.when(pl.col('event_type').is_in(REVENUE_EVENTS))
          .then(pl.lit(AVERAGE_TRANSACTION_VALUE))
          .otherwise(pl.lit(0.0))).sum().alias('total_revenue')
     ])
+    .pipe(with_user_estimates, user_acquisition_events, ['event_date', 'first_user_source', 'first_user_medium'], 'user_acquisition')
 )
 
 # Combine everything
@@ -206,15 +257,9 @@ ga4_user_acquisition = (new_users_by_day
         (pl.col('engaged_sessions') / pl.when(pl.col('total_sessions') > 0).then(pl.col('total_sessions')).otherwise(1)).round(2).alias('engagement_rate')
     ])
     .sort('event_date')
+    .with_columns(GA4_DATE_KEYS)
 )
 
-print(ga4_user_acquisition.head(10))
-print(f"\nTotal records: {len(ga4_user_acquisition):,}")
-
-print("\n" + "="*80)
-print("USER FUNNEL STATE ANALYSIS (FOR CRM)")
-print("="*80)
-
 # Step 1: Create identity graph - resolve all identities per device
 # This is critical for stitching anonymous → identified journeys
 identity_graph = (events
@@ -239,7 +284,7 @@ funnel_milestones = (events
     .agg([
         pl.col('event_date').min().alias('first_visit_date'),
         pl.col('event_date').filter(pl.col('event_type') == 'trial_started').min().alias('trial_started_date'),
-        pl.col('event_date').filter(pl.col('event_type').is_in(['trial_converted', 'payment_completed', 'subscription_created'])).min().alias('trial_converted_date'),
+        pl.col('event_date').filter(pl.col('event_type').is_in(REVENUE_EVENTS)).min().alias('trial_converted_date'),
         pl.col('event_date').filter(pl.col('event_type') == 'demo_requested').min().alias('demo_requested_date'),
         pl.col('event_date').filter(pl.col('event_type') == 'subscription_cancelled').min().alias('churned_date'),
         pl.col('event_date').max().alias('last_active_date'),
@@ -252,7 +297,7 @@ user_engagement = (events
     .agg([
         pl.col('session_id').n_unique().alias('total_sessions'),
         pl.count().alias('total_events'),
-        pl.col('engagement_tier').last().alias('engagement_tier'),
+        pl.col('engagement_tier').sort_by('event_time').last().alias('engagement_tier'),
     ])
 )
 
@@ -283,18 +328,18 @@ user_funnel_state = (funnel_milestones
         
         # Calculate days in current stage
         pl.when(pl.col('churned_date').is_not_null())
-            .then((pl.col('last_active_date').str.to_date() - pl.col('churned_date').str.to_date()).dt.total_days())
+            .then((pl.col('last_active_date') - pl.col('churned_date')).dt.total_days())
         .when(pl.col('trial_converted_date').is_not_null())
-            .then((pl.col('last_active_date').str.to_date() - pl.col('trial_converted_date').str.to_date()).dt.total_days())
+            .then((pl.col('last_active_date') - pl.col('trial_converted_date')).dt.total_days())
         .when(pl.col('demo_requested_date').is_not_null())
-            .then((pl.col('last_active_date').str.to_date() - pl.col('demo_requested_date').str.to_date()).dt.total_days())
+            .then((pl.col('last_active_date') - pl.col('demo_requested_date')).dt.total_days())
         .when(pl.col('trial_started_date').is_not_null())
-            .then((pl.col('last_active_date').str.to_date() - pl.col('trial_started_date').str.to_date()).dt.total_days())
-        .otherwise((pl.col('last_active_date').str.to_date() - pl.col('first_visit_date').str.to_date()).dt.total_days())
+            .then((pl.col('last_active_date') - pl.col('trial_started_date')).dt.total_days())
+        .otherwise((pl.col('last_active_date') - pl.col('first_visit_date')).dt.total_days())
         .alias('days_in_current_stage'),
         
         # Days since first visit
-        (pl.col('last_active_date').str.to_date() - pl.col('first_visit_date').str.to_date()).dt.total_days().alias('days_since_first_visit'),
+        (pl.col('last_active_date') - pl.col('first_visit_date')).dt.total_days().alias('days_since_first_visit'),
         
         # Create source/medium combined field
         (pl.col('first_user_source') + '/' + pl.col('first_user_medium')).alias('acquisition_channel'),
@@ -302,6 +347,100 @@ user_funnel_state = (funnel_milestones
     .sort('last_active_date', descending=True)
 )
 
+# Identify high-value leads for CRM prioritization
+high_value_leads = (user_funnel_state
+    .filter(
+        (pl.col('current_stage').is_in(['trial_active', 'demo_requested'])) &
+        (pl.col('engagement_tier').is_in(['high_engagement', 'medium_engagement', 'very_high_engagement'])) &
+        (pl.col('total_sessions') >= 3)
+    )
+    .sort('total_events', descending=True)
+)
+
+# Distinct identifier links for the union-find identity graph (resolved after collect)
+identity_links = (events
+    .select([c for c in ['device_id', *LINK_KINDS] if c in events.collect_schema()])
+    .unique()
+)
+
+stage_counts = user_funnel_state.group_by('current_stage').agg(pl.count().alias('count')).sort('count', descending=True)
+
+print("\n" + "="*80)
+print("EXECUTING (streaming engine)")
+print("="*80)
+
+(
+    event_stats,
+    ga4_events_report,
+    ga4_conversions_report,
+    ga4_traffic_acquisition,
+    ga4_user_acquisition,
+    user_funnel_state,
+    high_value_leads,
+    stage_counts,
+    identity_links,
+    *user_count_frames,
+) = pl.collect_all([
+    event_stats,
+    ga4_events_report,
+    ga4_conversions_report,
+    ga4_traffic_acquisition,
+    ga4_user_acquisition,
+    user_funnel_state,
+    high_value_leads,
+    stage_counts,
+    identity_links,
+    *user_registers.values(),
+    *user_count_checks.values(),
+], engine="streaming")
+user_registers = dict(zip(user_registers, user_count_frames[:len(user_registers)]))
+user_count_checks = dict(zip(user_count_checks, user_count_frames[len(user_registers):]))
+
+# Stitch devices that share a user id, email or cookie into one person. The graph is
+# persisted, so keys stay stable and new days only add links
+graph = IdentityGraph.load()
+graph.add_links(identity_links)
+graph.save()
+person_keys = graph.resolve('device')
+user_funnel_state = user_funnel_state.join(person_keys, on='device_id', how='left')
+high_value_leads = high_value_leads.join(person_keys, on='device_id', how='left')
+
+total_events = event_stats['total_events'][0]
+print(f"\nTotal events: {total_events:,}")
+print(f"Date range: {event_stats['first_date'][0]} to {event_stats['last_date'][0]}")
+
+print("\n" + "="*80)
+print("GA4 EVENTS REPORT")
+print("="*80)
+
+print(ga4_events_report.head(10))
+print(f"\nTotal records: {len(ga4_events_report):,}")
+
+print("\n" + "="*80)
+print("GA4 CONVERSIONS REPORT")
+print("="*80)
+
+print(ga4_conversions_report.head(10))
+print(f"\nTotal records: {len(ga4_conversions_report):,}")
+
+print("\n" + "="*80)
+print("GA4 TRAFFIC ACQUISITION REPORT")
+print("="*80)
+
+print(ga4_traffic_acquisition.head(10))
+print(f"\nTotal records: {len(ga4_traffic_acquisition):,}")
+
+print("\n" + "="*80)
+print("GA4 USER ACQUISITION REPORT")
+print("="*80)
+
+print(ga4_user_acquisition.head(10))
+print(f"\nTotal records: {len(ga4_user_acquisition):,}")
+
+print("\n" + "="*80)
+print("USER FUNNEL STATE ANALYSIS (FOR CRM)")
+print("="*80)
+
 print(f"\nTotal users tracked: {len(user_funnel_state):,}")
 
 # Show identity resolution effectiveness
@@ -310,27 +449,17 @@ print(f"\n🔗 Identity Resolution:")
 print(f"   Total devices tracked: {len(user_funnel_state):,}")
 print(f"   Identified users (with email): {identified_users:,} ({identified_users/len(user_funnel_state)*100:.1f}%)")
 print(f"   Anonymous users: {len(user_funnel_state) - identified_users:,}")
+print(f"   Resolved persons: {user_funnel_state['resolved_person_key'].n_unique():,}")
 
 print("\nFunnel stage distribution:")
-stage_counts = user_funnel_state.group_by('current_stage').agg(pl.count().alias('count')).sort('count', descending=True)
 print(stage_counts)
 
 print("\nTop 10 users (most recent activity):")
 print(user_funnel_state.head(10).select([
-    'device_id', 'user_id', 'email', 'current_stage', 'days_in_current_stage',
+    'device_id', 'resolved_person_key', 'user_id', 'email', 'current_stage', 'days_in_current_stage',
     'total_sessions', 'engagement_tier', 'acquisition_channel', 'last_active_date'
 ]))
 
-# Identify high-value leads for CRM prioritization
-high_value_leads = (user_funnel_state
-    .filter(
-        (pl.col('current_stage').is_in(['trial_active', 'demo_requested'])) &
-        (pl.col('engagement_tier').is_in(['high_engagement', 'medium_engagement', 'very_high_engagement'])) &
-        (pl.col('total_sessions') >= 3)
-    )
-    .sort('total_events', descending=True)
-)
-
 print(f"\n🎯 High-value leads (trial/demo + engaged): {len(high_value_leads):,}")
 if len(high_value_leads) > 0:
     print(high_value_leads.head(10).select([
@@ -364,10 +493,26 @@ print("✓ GA4 Conversions Report")
 print("✓ GA4 Traffic Acquisition Report")
 print("✓ GA4 User Acquisition Report")
 
+if USER_COUNT_MODE != 'exact':
+    # Registers are the mergeable form of total_users: any set of days can be
+    # recombined later without touching the events
+    os.makedirs(USER_REGISTERS_DIR, exist_ok=True)
+    for name, registers in user_registers.items():
+        registers.write_parquet(f'{USER_REGISTERS_DIR}/{name}.parquet')
+        keys = [c for c in registers.columns if c not in ('event_date', 'hll_index', 'hll_rank')]
+        user_totals(registers, keys).write_parquet(f'output/ga4_reports/{name}_user_totals.parquet')
+    print(f"✓ HLL user registers and daily/monthly/rolling user totals ({USER_REGISTERS_DIR})")
+
+if user_count_checks:
+    errors = user_count_errors(user_count_checks)
+    errors.write_parquet('output/ga4_reports/user_count_errors.parquet')
+    print("\nHLL user counts vs exact:")
+    print(errors)
+
 print("\n" + "="*80)
 print("SUMMARY")
 print("="*80)
-print(f"Total events processed: {len(events):,}")
+print(f"Total events processed: {total_events:,}")
 print(f"Total users tracked: {len(user_funnel_state):,}")
 print(f"High-value leads: {len(high_value_leads):,}")
 print(f"GA4 report records: {len(ga4_events_report) + len(ga4_conversions_report) + len(ga4_traffic_acquisition) + len(ga4_user_acquisition):,}")
@@ -0,0 +1,352 @@
+"""
+Batched event engine for the Amplitude event stream
+Generates a whole day's events for all active users as columnar NumPy arrays
+and hands them back as a ready-made Arrow table (same schema as the per-user path)
+"""
+import numpy as np
+import pyarrow as pa
+from dataclasses import dataclass
+from datetime import datetime
+
+from event_taxonomy import (
+    EVENT_ENGAGEMENT_SCORES,
+    EVENT_NAMES,
+    EVENT_CODES,
+    LIFECYCLE_STAGES,
+    STAGE_CODES,
+    NO_EVENT,
+    ALL_EVENTS_POOL,
+    sample_flow_events,
+    sample_next_events,
+    sample_stage_events
+)
+
+# ==========================================
+# PER-EVENT LOOKUP TABLES
+# ==========================================
+
+ENGAGEMENT_SCORE = np.array([EVENT_ENGAGEMENT_SCORES.get(n, 1) for n in EVENT_NAMES], dtype=np.int64)
+
+# Lifecycle side effects per event
+STAGE_TRANSITION = np.full(len(EVENT_NAMES), -1, dtype=np.int8)
+SETS_CUSTOMER = np.zeros(len(EVENT_NAMES), dtype=bool)
+SETS_IDENTIFIED = np.zeros(len(EVENT_NAMES), dtype=bool)
+IDENTIFYING = np.zeros(len(EVENT_NAMES), dtype=bool)
+
+for name in ['pricing_page_view', 'demo_requested']:
+    STAGE_TRANSITION[EVENT_CODES[name]] = STAGE_CODES['engaged']
+for name in ['first_project_created', 'onboarding_completed']:
+    STAGE_TRANSITION[EVENT_CODES[name]] = STAGE_CODES['self_service']
+for name in ['trial_started', 'account_created']:
+    STAGE_TRANSITION[EVENT_CODES[name]] = STAGE_CODES['trial']
+    SETS_IDENTIFIED[EVENT_CODES[name]] = True
+for name in ['subscription_cancelled', 'payment_failed']:
+    STAGE_TRANSITION[EVENT_CODES[name]] = STAGE_CODES['churn_risk']
+for name in ['payment_completed', 'subscription_created', 'trial_converted']:
+    STAGE_TRANSITION[EVENT_CODES[name]] = STAGE_CODES['customer']
+    SETS_CUSTOMER[EVENT_CODES[name]] = True
+for name in ['trial_started', 'account_created', 'demo_requested']:
+    IDENTIFYING[EVENT_CODES[name]] = True
+
+RETURNING_FLOW_PROBABILITY = 0.7
+IDENTIFY_PROBABILITY = 0.7
+MAX_EVENTS_PER_SESSION = 10
+
+_EVENT_NAMES_ARROW = pa.array(EVENT_NAMES, type=pa.string())
+_STAGE_NAMES_ARROW = pa.array(LIFECYCLE_STAGES, type=pa.string())
+
+# daily_user_activity primary key columns are non-nullable in the dlt schema
+SUMMARY_SCHEMA = pa.schema([
+    pa.field('device_id', pa.string(), nullable=False),
+    pa.field('user_id', pa.string()),
+    pa.field('activity_date', pa.string(), nullable=False),
+    pa.field('email', pa.string()),
+    pa.field('is_identified', pa.bool_()),
+    pa.field('is_customer', pa.bool_()),
+    pa.field('events_today', pa.int64()),
+    pa.field('engagement_score_today', pa.int64()),
+    pa.field('lifecycle_stage', pa.string()),
+    pa.field('return_probability', pa.float64()),
+    pa.field('total_sessions', pa.int64()),
+    pa.field('last_event_today', pa.string()),
+])
+
+_HEX = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+_UUID_HEX_POSITIONS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+_NODE_SHIFTS = np.arange(40, -1, -8, dtype=np.uint64)
+_NODE_LIMIT = np.uint64(1 << 48)
+
+ID_BINARY_TYPE = pa.binary(16)
+
+_EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class UserBatch:
+    """Columnar state for a set of users (one row per device)"""
+    device_id: np.ndarray
+    user_id: np.ndarray
+    email: np.ndarray
+    is_identified: np.ndarray
+    is_customer: np.ndarray
+    session_count: np.ndarray
+    lifecycle_stage: np.ndarray
+    last_event: np.ndarray
+
+    def __len__(self):
+        return len(self.device_id)
+
+    @classmethod
+    def new_anonymous(cls, n: int, rng: np.random.Generator, shard: int = 0, num_shards: int = 1,
+                      binary_ids: bool = False) -> 'UserBatch':
+        device_id = new_ids(rng, n, shard, num_shards, binary_ids)
+        return cls(
+            device_id=device_id,
+            user_id=device_id.copy(),
+            email=np.full(n, "", dtype=object),
+            is_identified=np.zeros(n, dtype=bool),
+            is_customer=np.zeros(n, dtype=bool),
+            session_count=np.zeros(n, dtype=np.int64),
+            lifecycle_stage=np.full(n, STAGE_CODES['awareness'], dtype=np.int8),
+            last_event=np.full(n, NO_EVENT, dtype=np.int16),
+        )
+
+    @classmethod
+    def new_leads(cls, n: int, rng: np.random.Generator, shard: int = 0, num_shards: int = 1,
+                  binary_ids: bool = False) -> 'UserBatch':
+        batch = cls.new_anonymous(n, rng, shard, num_shards, binary_ids)
+        batch.user_id = new_ids(rng, n, binary=binary_ids)
+        batch.email = np.array(email_for(batch.device_id), dtype=object)
+        batch.is_identified[:] = True
+        batch.lifecycle_stage[:] = STAGE_CODES['engaged']
+        return batch
+
+    @classmethod
+    def concat(cls, batches) -> 'UserBatch':
+        return cls(**{
+            name: np.concatenate([getattr(b, name) for b in batches])
+            for name in cls.__dataclass_fields__
+        })
+
+    def take(self, rows: np.ndarray) -> 'UserBatch':
+        return UserBatch(**{name: getattr(self, name)[rows] for name in self.__dataclass_fields__})
+
+    @classmethod
+    def from_states(cls, users) -> 'UserBatch':
+        return cls(
+            device_id=np.array([u.device_id for u in users], dtype=object),
+            user_id=np.array([u.user_id for u in users], dtype=object),
+            email=np.array([u.email or "" for u in users], dtype=object),
+            is_identified=np.array([bool(u.is_identified) for u in users], dtype=bool),
+            is_customer=np.array([bool(u.is_customer) for u in users], dtype=bool),
+            session_count=np.array([int(u.session_count) for u in users], dtype=np.int64),
+            lifecycle_stage=np.array([STAGE_CODES.get(u.lifecycle_stage, 0) for u in users], dtype=np.int8),
+            last_event=np.array([EVENT_CODES.get(u.last_event_type, NO_EVENT) for u in users], dtype=np.int16),
+        )
+
+
+@dataclass
+class DayEvents:
+    """Output of one batched day: the events table plus per-user aggregates"""
+    table: pa.Table
+    events_today: np.ndarray
+    engagement_today: np.ndarray
+    last_event_today: np.ndarray
+
+
+def event_name_array(codes: np.ndarray) -> pa.Array:
+    """Event codes → event name strings (NO_EVENT becomes null)"""
+    return _EVENT_NAMES_ARROW.take(pa.array(codes, mask=codes == NO_EVENT))
+
+
+def stage_name_array(codes: np.ndarray) -> pa.Array:
+    """Lifecycle stage codes → stage name strings"""
+    return _STAGE_NAMES_ARROW.take(pa.array(codes))
+
+
+def device_shard(device_ids, num_shards: int) -> np.ndarray:
+    """Shard of each device id: its UUID node field (last 6 bytes) modulo num_shards"""
+    return np.array([
+        int(d[-12:], 16) % num_shards if isinstance(d, str) else int.from_bytes(d[-6:], 'big') % num_shards
+        for d in device_ids
+    ], dtype=np.int64)
+
+
+def uuid4_bytes(rng: np.random.Generator, n: int, shard: int = 0, num_shards: int = 1) -> np.ndarray:
+    """n random version-4 UUIDs as an (n, 16) uint8 array.
+    With num_shards > 1 the node field is nudged so every id hashes to `shard` (see device_shard)."""
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+
+    if num_shards > 1:
+        node = (raw[:, 10:16].astype(np.uint64) << _NODE_SHIFTS).sum(axis=1, dtype=np.uint64)
+        node = node - node % np.uint64(num_shards) + np.uint64(shard)
+        node[node >= _NODE_LIMIT] -= np.uint64(num_shards)
+        raw[:, 10:16] = ((node[:, None] >> _NODE_SHIFTS) & np.uint64(0xFF)).astype(np.uint8)
+    return raw
+
+
+def uuid_strings(raw: np.ndarray) -> pa.Array:
+    """Render an (n, 16) uint8 array as canonical UUID strings without per-row Python"""
+    n = len(raw)
+    hex_chars = np.empty((n, 32), dtype=np.uint8)
+    hex_chars[:, 0::2] = _HEX[raw >> 4]
+    hex_chars[:, 1::2] = _HEX[raw & 0x0F]
+
+    text = np.full((n, 36), ord('-'), dtype=np.uint8)
+    text[:, _UUID_HEX_POSITIONS] = hex_chars
+
+    offsets = np.arange(0, 36 * (n + 1), 36, dtype=np.int32)
+    return pa.Array.from_buffers(pa.string(), n, [None, pa.py_buffer(offsets), pa.py_buffer(text)])
+
+
+def uuid4_strings(rng: np.random.Generator, n: int, shard: int = 0, num_shards: int = 1) -> pa.Array:
+    return uuid_strings(uuid4_bytes(rng, n, shard, num_shards))
+
+
+def uuid4_binary(rng: np.random.Generator, n: int) -> pa.Array:
+    """n random version-4 UUIDs as a fixed_size_binary(16) array (compact-ID mode)"""
+    return pa.Array.from_buffers(ID_BINARY_TYPE, n, [None, pa.py_buffer(uuid4_bytes(rng, n))])
+
+
+def new_ids(rng: np.random.Generator, n: int, shard: int = 0, num_shards: int = 1, binary: bool = False) -> np.ndarray:
+    """Object array of new ids: canonical strings, or 16-byte values in compact-ID mode"""
+    raw = uuid4_bytes(rng, n, shard, num_shards)
+    if binary:
+        data = raw.tobytes()
+        return np.array([data[i:i + 16] for i in range(0, len(data), 16)], dtype=object)
+    return np.array(uuid_strings(raw).to_pylist(), dtype=object)
+
+
+def id_array(ids: np.ndarray) -> pa.Array:
+    """Id column for Arrow output, fixed_size_binary(16) when the ids are compact"""
+    if len(ids) and isinstance(ids[0], bytes):
+        return pa.array(ids, type=ID_BINARY_TYPE)
+    return pa.array(ids, type=pa.string())
+
+
+def canonical_id_strings(ids: pa.Array) -> pa.Array:
+    """Render compact (binary) ids as canonical UUID strings; string ids pass through"""
+    if isinstance(ids, pa.ChunkedArray):
+        ids = ids.combine_chunks()
+    if not (pa.types.is_binary(ids.type) or pa.types.is_large_binary(ids.type) or pa.types.is_fixed_size_binary(ids.type)):
+        return ids
+    ids = ids.cast(ID_BINARY_TYPE)
+    raw = np.frombuffer(ids.buffers()[1], dtype=np.uint8, count=16 * (ids.offset + len(ids)))[16 * ids.offset:]
+    return uuid_strings(raw.reshape(-1, 16))
+
+
+def email_for(device_ids: np.ndarray) -> list:
+    """Synthetic email from the first 8 hex digits of each device id"""
+    return [f"user_{d[:8] if isinstance(d, str) else d[:4].hex()}@example.com" for d in device_ids]
+
+
+def generate_events(batch: UserBatch, current_date: datetime, rng: np.random.Generator, binary_ids: bool = False) -> DayEvents:
+    """Generate one session of flow-driven events for every user in the batch.
+    Mutates the batch in place (identity, lifecycle stage, last event, session count).
+    With binary_ids, event_id/device_id/user_id are fixed_size_binary(16) instead of strings."""
+    n = len(batch)
+    num_events = rng.integers(1, MAX_EVENTS_PER_SESSION + 1, n)
+    session_id = int(current_date.timestamp() * 1000) + rng.integers(0, 86400000 + 1, n)
+
+    # Start event: continue the flow for returning users, otherwise draw from the stage pool
+    current = sample_stage_events(batch.lifecycle_stage, rng)
+    returning = np.nonzero((batch.last_event != NO_EVENT) & (rng.random(n) < RETURNING_FLOW_PROBABILITY))[0]
+    if len(returning):
+        flowed = sample_flow_events(batch.last_event[returning], rng)
+        missing = flowed == NO_EVENT
+        flowed[missing] = ALL_EVENTS_POOL[rng.integers(0, len(ALL_EVENTS_POOL), missing.sum())]
+        current[returning] = flowed
+
+    steps = {key: [] for key in ['user', 'step', 'event', 'user_id', 'email', 'identified', 'customer', 'stage', 'offset']}
+
+    for step in range(int(num_events.max())):
+        rows = np.nonzero(num_events > step)[0]
+        cur = current[rows]
+
+        # Identify user on certain events
+        identify = rows[~batch.is_identified[rows] & IDENTIFYING[cur] & (rng.random(len(rows)) < IDENTIFY_PROBABILITY)]
+        if len(identify):
+            batch.user_id[identify] = new_ids(rng, len(identify), binary=binary_ids)
+            batch.email[identify] = email_for(batch.device_id[identify])
+            batch.is_identified[identify] = True
+
+        transition = STAGE_TRANSITION[cur]
+        batch.lifecycle_stage[rows] = np.where(transition >= 0, transition, batch.lifecycle_stage[rows])
+        batch.is_customer[rows] |= SETS_CUSTOMER[cur]
+        batch.is_identified[rows] |= SETS_IDENTIFIED[cur]
+
+        hours = rng.integers(0, 24, len(rows))
+        minutes = rng.integers(0, 60, len(rows))
+
+        steps['user'].append(rows)
+        steps['step'].append(np.full(len(rows), step, dtype=np.int16))
+        steps['event'].append(cur)
+        steps['user_id'].append(batch.user_id[rows])
+        steps['email'].append(batch.email[rows])
+        steps['identified'].append(batch.is_identified[rows].copy())
+        steps['customer'].append(batch.is_customer[rows].copy())
+        steps['stage'].append(batch.lifecycle_stage[rows].copy())
+        steps['offset'].append(hours * 3600 + minutes * 60 + step * 10)
+
+        batch.last_event[rows] = cur
+
+        # Next event from flow, falling back to the (updated) stage pool
+        current[rows] = sample_next_events(cur, batch.lifecycle_stage[rows], rng)
+
+    batch.session_count += 1
+
+    # Emit rows grouped by user, in session order
+    cols = {key: np.concatenate(parts) for key, parts in steps.items()}
+    order = np.lexsort((cols['step'], cols['user']))
+    cols = {key: values[order] for key, values in cols.items()}
+
+    # Typed columns straight from the day's epoch offset: timestamp[us] and date32
+    event_seconds = (current_date.replace(tzinfo=None) - _EPOCH).days * SECONDS_PER_DAY + cols['offset'].astype(np.int64)
+
+    table = pa.table({
+        'event_id': uuid4_binary(rng, len(order)) if binary_ids else uuid4_strings(rng, len(order)),
+        'event_time': pa.array(event_seconds * 1_000_000, type=pa.timestamp('us')),
+        'event_date': pa.array((event_seconds // SECONDS_PER_DAY).astype(np.int32), type=pa.date32()),
+        'event_type': event_name_array(cols['event']),
+        'device_id': id_array(batch.device_id[cols['user']]),
+        'user_id': id_array(cols['user_id']),
+        'email': pa.array(cols['email'], type=pa.string()),
+        'is_identified': pa.array(cols['identified']),
+        'is_customer': pa.array(cols['customer']),
+        'lifecycle_stage': stage_name_array(cols['stage']),
+        'session_id': pa.array(session_id[cols['user']], type=pa.int64()),
+    })
+
+    return DayEvents(
+        table=table,
+        events_today=num_events,
+        engagement_today=np.bincount(cols['user'], weights=ENGAGEMENT_SCORE[cols['event']], minlength=n).astype(np.int64),
+        last_event_today=batch.last_event.copy(),
+    )
+
+
+def daily_summaries(batch: UserBatch, day: DayEvents, current_date: datetime, rng: np.random.Generator) -> pa.Table:
+    """One daily_user_activity row per user in the batch"""
+    engagement = day.engagement_today
+    low = np.select([engagement > 50, engagement > 20], [0.7, 0.4], 0.1)
+    high = np.select([engagement > 50, engagement > 20], [0.95, 0.7], 0.4)
+    return_prob = rng.uniform(low, high)
+
+    # Summaries always carry canonical string ids (DuckDB consumers)
+    return pa.table({
+        'device_id': canonical_id_strings(id_array(batch.device_id)),
+        'user_id': canonical_id_strings(id_array(batch.user_id)),
+        'activity_date': pa.array([current_date.date().isoformat()] * len(batch), type=pa.string()),
+        'email': pa.array(batch.email, type=pa.string()),
+        'is_identified': pa.array(batch.is_identified),
+        'is_customer': pa.array(batch.is_customer),
+        'events_today': pa.array(day.events_today, type=pa.int64()),
+        'engagement_score_today': pa.array(engagement, type=pa.int64()),
+        'lifecycle_stage': stage_name_array(batch.lifecycle_stage),
+        'return_probability': pa.array(return_prob, type=pa.float64()),
+        'total_sessions': pa.array(batch.session_count, type=pa.int64()),
+        'last_event_today': event_name_array(day.last_event_today),
+    }, schema=SUMMARY_SCHEMA)
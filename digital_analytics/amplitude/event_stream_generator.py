@@ -1,291 +1,242 @@
 """
-Daily event generator with flow patterns and DuckDB summaries
+Daily event generator with flow patterns, an in-memory user registry and DuckDB summaries
+
+Run with --shards N to split the user population by device-id hash into N
+independent shards, each simulated in its own process with its own RNG stream,
+registry and DuckDB file. Output for a given --seed and --shards is reproducible.
+
+Events stream into monthly Parquet files (see event_writer) and summaries are
+buffered and loaded through a single dlt pipeline per shard (see summary_sink).
+Every --checkpoint-every days of a month (default 7) and at month end the open
+event file is finalized (the month continues in a new .K file), the summaries are
+flushed and a checkpoint is taken (see run_checkpoint); --resume continues from
+the last one.
 """
+import argparse
 import dlt
 import duckdb
-import polars as pl
+import numpy as np
+import pyarrow as pa
 from datetime import datetime, timedelta
-import random
-import uuid
 import os
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
 
-from event_taxonomy import (
-    SAAS_EVENT_TAXONOMY, 
-    EVENT_FLOW_PATTERNS,
-    EVENT_ENGAGEMENT_SCORES
-)
-
-ALL_EVENTS = []
-for events in SAAS_EVENT_TAXONOMY.values():
-    ALL_EVENTS.extend(events)
+from event_engine import UserBatch, generate_events, daily_summaries
+from user_registry import UserRegistry
+from run_checkpoint import RunCheckpoint
+from summary_sink import SummarySink, FLUSH_EVERY_DAYS, FLUSH_MAX_BYTES
+from event_writer import EventFileWriter, EVENTS_DIR, ROW_GROUP_SIZE, MAX_FILE_ROWS, COMPRESSION, DICTIONARY_COLUMNS
 
 DB_PATH = "user_registry.duckdb"
 START_DATE = datetime(2024, 1, 1)
 DAYS_TO_GENERATE = 365
+SEED = 42
 
-@dataclass
-class UserState:
-    device_id: str
-    user_id: str
-    email: str = ""
-    is_identified: bool = False
-    is_customer: bool = False
-    session_count: int = 0
-    lifecycle_stage: str = "awareness"
-    last_event_type: str = ""
-    
-    @classmethod
-    def new_anonymous(cls, current_date):
-        device_id = str(uuid.uuid4())
-        return cls(device_id=device_id, user_id=device_id)
-    
-    @classmethod
-    def new_lead(cls, current_date):
-        device_id = str(uuid.uuid4())
-        user_uuid = str(uuid.uuid4())
-        return cls(
-            device_id=device_id,
-            user_id=user_uuid,
-            email=f"user_{device_id[:8]}@example.com",
-            is_identified=True,
-            lifecycle_stage="engaged"
-        )
+# Compact-ID mode: event_id/device_id/user_id stored as fixed_size_binary(16) in the
+# event files (canonical strings are rendered on export, see amplitude_events_gcs_pipeline)
+COMPACT_IDS = False
+
+# In-memory user registry snapshots (.parquet or .duckdb); None/0 disables
+REGISTRY_SNAPSHOT_PATH = "data/user_registry_state.parquet"
+REGISTRY_SNAPSHOT_EVERY = 30
+
+# Summary loads to DuckDB: flush every N days or once the buffer passes N bytes
+SUMMARY_FLUSH_DAYS = FLUSH_EVERY_DAYS
+SUMMARY_FLUSH_BYTES = FLUSH_MAX_BYTES
+
+# Event output: data/events_month_MM[.part-N][.K].parquet, rolled at every checkpoint and past EVENT_FILE_MAX_ROWS
+EVENT_ROW_GROUP_SIZE = ROW_GROUP_SIZE
+EVENT_FILE_MAX_ROWS = MAX_FILE_ROWS
+EVENT_COMPRESSION = COMPRESSION
+EVENT_DICTIONARY_COLUMNS = DICTIONARY_COLUMNS
+
+# Days between checkpoints within a month: a crash repeats at most this many days,
+# but each checkpoint closes an event file and loads the buffered summaries, so it
+# may not be shorter than SUMMARY_FLUSH_DAYS (~5 files per month at the default)
+CHECKPOINT_EVERY_DAYS = SUMMARY_FLUSH_DAYS
+
+# Day-level volumes for the whole population (split evenly across shards)
+DAY_ZERO_LEADS = 2000
+NEW_ANONYMOUS_RANGE = (2000, 4000)
+RETURNING_LIMIT_RANGE = (500, 1500)
+TARGET_EVENTS_RANGE = (1000, 3000)
 
 @dataclass
-class DailySummary:
-    device_id: str
-    user_id: str
-    activity_date: str
-    email: str = ""
-    is_identified: bool = False
-    is_customer: bool = False
-    events_today: int = 0
-    engagement_score_today: int = 0
-    lifecycle_stage: str = "awareness"
-    return_probability: float = 0.5
-    total_sessions: int = 0
-    last_event_today: str = ""
+class Shard:
+    """One device-id hash partition of the population, with its own RNG stream"""
+    index: int = 0
+    count: int = 1
+    seed: Optional[int] = SEED
+    binary_ids: bool = COMPACT_IDS
+    rng: np.random.Generator = field(init=False, repr=False)
 
-@dlt.resource(name="daily_user_activity", write_disposition="append", primary_key=["device_id", "activity_date"])
-def daily_summary_resource(summaries: List[DailySummary]):
-    if not summaries:
-        return
-    yield [asdict(s) for s in summaries]
+    def __post_init__(self):
+        self.rng = np.random.default_rng(np.random.SeedSequence(self.seed).spawn(self.count)[self.index])
 
-def get_next_event_from_flow(last_event: str) -> Optional[str]:
-    if last_event in EVENT_FLOW_PATTERNS:
-        possible = EVENT_FLOW_PATTERNS[last_event]
-        if random.random() < 0.6:
-            events = list(possible.keys())
-            weights = list(possible.values())
-            return random.choices(events, weights=weights)[0]
-    return None
+    @property
+    def suffix(self) -> str:
+        return f".part-{self.index}" if self.count > 1 else ""
 
-def update_lifecycle_stage(user: UserState, event_type: str):
-    if event_type in ['payment_completed', 'subscription_created', 'trial_converted']:
-        user.lifecycle_stage = "customer"
-        user.is_customer = True
-    elif event_type in ['subscription_cancelled', 'payment_failed']:
-        user.lifecycle_stage = "churn_risk"
-    elif event_type in ['trial_started', 'account_created']:
-        user.lifecycle_stage = "trial"
-        user.is_identified = True
-    elif event_type in ['first_project_created', 'onboarding_completed']:
-        user.lifecycle_stage = "self_service"
-    elif event_type in ['pricing_page_view', 'demo_requested']:
-        user.lifecycle_stage = "engaged"
+    def path(self, path: str) -> str:
+        """Per-shard variant of a file path: data/x.parquet -> data/x.part-N.parquet"""
+        root, ext = os.path.splitext(path)
+        return f"{root}{self.suffix}{ext}"
 
-def generate_event_sequence(user: UserState, current_date) -> List[dict]:
-    """Generate events following flow patterns"""
-    events = []
-    num_events = random.randint(1, 10)
-    session_id = int(current_date.timestamp() * 1000) + random.randint(0, 86400000)
-    
-    # Start event based on lifecycle stage
-    if user.last_event_type and random.random() < 0.7:
-        current_event = get_next_event_from_flow(user.last_event_type)
-        if not current_event:
-            current_event = random.choice(ALL_EVENTS)
-    else:
-        stage_events = {
-            "awareness": SAAS_EVENT_TAXONOMY['awareness'],
-            "engaged": SAAS_EVENT_TAXONOMY['interest'] + SAAS_EVENT_TAXONOMY['consideration'],
-            "trial": SAAS_EVENT_TAXONOMY['trial_signup'] + SAAS_EVENT_TAXONOMY['activation'],
-            "self_service": SAAS_EVENT_TAXONOMY['product_usage'],
-            "customer": SAAS_EVENT_TAXONOMY['product_usage'] + SAAS_EVENT_TAXONOMY['retention'],
-            "churn_risk": SAAS_EVENT_TAXONOMY['churn_risk']
-        }
-        current_event = random.choice(stage_events.get(user.lifecycle_stage, ALL_EVENTS))
-    
-    for i in range(num_events):
-        event_time = current_date + timedelta(
-            hours=random.randint(0, 23),
-            minutes=random.randint(0, 59),
-            seconds=i * 10
-        )
-        
-        # Identify user on certain events
-        if not user.is_identified and current_event in ['trial_started', 'account_created', 'demo_requested']:
-            if random.random() < 0.7:
-                user.user_id = str(uuid.uuid4())
-                user.email = f"user_{user.device_id[:8]}@example.com"
-                user.is_identified = True
-        
-        update_lifecycle_stage(user, current_event)
-        
-        events.append({
-            'event_id': str(uuid.uuid1()),
-            'event_time': event_time.isoformat(),
-            'event_date': event_time.date().isoformat(),
-            'event_type': current_event,
-            'device_id': user.device_id,
-            'user_id': user.user_id,
-            'email': user.email,
-            'is_identified': user.is_identified,
-            'is_customer': user.is_customer,
-            'lifecycle_stage': user.lifecycle_stage,
-            'session_id': session_id,
-        })
-        
-        user.last_event_type = current_event
-        
-        # Get next event from flow
-        next_event = get_next_event_from_flow(current_event)
-        if next_event:
-            current_event = next_event
-        else:
-            current_event = random.choice(stage_events.get(user.lifecycle_stage, ALL_EVENTS))
-    
-    user.session_count += 1
-    return events
+    def scaled(self, n: int) -> int:
+        """This shard's share of a population-wide count"""
+        return n // self.count + (1 if self.index < n % self.count else 0)
 
-def create_daily_summary(user: UserState, events: List[dict], current_date) -> DailySummary:
-    """Create summary from events"""
-    event_types = [e['event_type'] for e in events]
-    engagement = sum(EVENT_ENGAGEMENT_SCORES.get(et, 1) for et in event_types)
-    
-    if engagement > 50:
-        return_prob = random.uniform(0.7, 0.95)
-    elif engagement > 20:
-        return_prob = random.uniform(0.4, 0.7)
-    else:
-        return_prob = random.uniform(0.1, 0.4)
-    
-    return DailySummary(
-        device_id=user.device_id,
-        user_id=user.user_id,
-        activity_date=current_date.date().isoformat(),
-        email=user.email,
-        is_identified=user.is_identified,
-        is_customer=user.is_customer,
-        events_today=len(events),
-        engagement_score_today=engagement,
-        lifecycle_stage=user.lifecycle_stage,
-        return_probability=return_prob,
-        total_sessions=user.session_count,
-        last_event_today=event_types[-1] if event_types else ""
-    )
+    def draw(self, bounds) -> int:
+        low, high = bounds
+        return self.scaled(int(self.rng.integers(low, high, endpoint=True)))
 
-def get_returning_users(target_date) -> List[UserState]:
-    """Query returning users from DuckDB"""
-    try:
-        db = duckdb.connect(DB_PATH, read_only=True)
-        threshold = random.uniform(0.3, 0.7)
-        limit = random.randint(500, 1500)
-        
-        result = db.sql(f"""
-            SELECT DISTINCT ON (device_id)
-                device_id, user_id, email, is_identified, is_customer,
-                lifecycle_stage, last_event_today, return_probability, total_sessions
-            FROM daily_user_activity 
-            WHERE return_probability > {threshold}
-            AND activity_date >= '{(target_date - timedelta(days=7)).date()}'
-            ORDER BY device_id, activity_date DESC
-            LIMIT {limit}
-        """).fetchdf()
-        
-        users = []
-        for _, row in result.iterrows():
-            users.append(UserState(
-                device_id=row['device_id'],
-                user_id=row['user_id'],
-                email=row.get('email', ''),
-                is_identified=row.get('is_identified', False),
-                is_customer=row.get('is_customer', False),
-                session_count=int(row.get('total_sessions', 1)),
-                lifecycle_stage=row.get('lifecycle_stage', 'awareness'),
-                last_event_type=row.get('last_event_today', '')
-            ))
-        
-        db.close()
-        return users
-    except:
-        return []
+@dlt.resource(name="daily_user_activity", write_disposition="append", primary_key=["device_id", "activity_date"])
+def daily_summary_resource(summaries: pa.Table):
+    if summaries.num_rows:
+        yield summaries
+
+def get_returning_users(registry: UserRegistry, day_num: int, shard: Shard) -> UserBatch:
+    """Select returning users from the in-memory registry"""
+    threshold = shard.rng.uniform(0.3, 0.7)
+    limit = shard.draw(RETURNING_LIMIT_RANGE)
+    return registry.take(registry.select_returning(day_num, threshold, limit, shard.rng))
+
+def discard_summaries_after(day_num: int, shard: Shard):
+    """Drop summary rows loaded for days past the last checkpoint (crash between load and checkpoint)"""
+    db_path = shard.path(DB_PATH)
+    if not os.path.exists(db_path):
+        return
+    cutoff = (START_DATE + timedelta(days=day_num)).date().isoformat()
+    db = duckdb.connect(db_path)
+    exists = db.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_schema = 'events' AND table_name = 'daily_user_activity'"
+    ).fetchone()[0]
+    if exists:
+        db.execute("DELETE FROM events.daily_user_activity WHERE activity_date > ?", [cutoff])
+    db.close()
+
+def summary_pipeline(shard: Shard):
+    """One dlt pipeline per shard (separate DuckDB files so processes never share a writer)"""
+    return dlt.pipeline(
+        pipeline_name=f"event_stream{shard.suffix.replace('.', '_').replace('-', '_')}",
+        destination=dlt.destinations.duckdb(shard.path(DB_PATH)),
+        dataset_name="events",
+        dev_mode=False
+    )
 
-def generate_day(day_num: int):
-    """Generate events for one day"""
+def generate_day(day_num: int, registry: UserRegistry, shard: Shard, sink: SummarySink, writer: EventFileWriter):
+    """Generate events for one day of one shard"""
     current_date = START_DATE + timedelta(days=day_num)
-    month_num = day_num // 30
+    rng = shard.rng
     
-    print(f"Day {day_num}: {current_date.date()}")
+    print(f"Day {day_num}: {current_date.date()}" + (f" [shard {shard.index}/{shard.count}]" if shard.count > 1 else ""))
     
     # Get users
-    users = get_returning_users(current_date)
+    users = [get_returning_users(registry, day_num, shard)]
     
     if day_num == 0:
-        users.extend([UserState.new_lead(current_date) for _ in range(2000)])
+        users.append(UserBatch.new_leads(shard.scaled(DAY_ZERO_LEADS), rng, shard.index, shard.count, shard.binary_ids))
     
-    users.extend([UserState.new_anonymous(current_date) for _ in range(random.randint(2000,4000))])
+    users.append(UserBatch.new_anonymous(shard.draw(NEW_ANONYMOUS_RANGE), rng, shard.index, shard.count, shard.binary_ids))
+    users = UserBatch.concat(users)
     
-    # Select active users (target 1-3k events)
-    target = random.randint(1000, 3000)
-    active = random.sample(users, min(target // 3, len(users)))
+    # Select active users (target 1-3k events across all shards)
+    target = shard.draw(TARGET_EVENTS_RANGE)
+    batch = users.take(rng.choice(len(users), size=min(target // 3, len(users)), replace=False))
     
-    # Generate events
-    events = []
-    summaries = []
+    # Generate events (batched across all active users)
+    day = generate_events(batch, current_date, rng, shard.binary_ids)
+    events = day.table
+    summaries = daily_summaries(batch, day, current_date, rng)
+    registry.upsert(batch, day_num, summaries.column('return_probability').to_numpy())
     
-    for user in active:
-        user_events = generate_event_sequence(user, current_date)
-        events.extend(user_events)
-        
-        if user_events:
-            summaries.append(create_daily_summary(user, user_events, current_date))
+    print(f"  Events: {events.num_rows}, Summaries: {summaries.num_rows}, Registry: {len(registry)}")
     
-    print(f"  Events: {len(events)}, Summaries: {len(summaries)}")
+    # Buffer summaries for DuckDB (returning users come from the registry, which is already up to date)
+    sink.add(summaries)
     
-    # Save summaries to DuckDB
-    pipeline = dlt.pipeline(
-        pipeline_name="event_stream",
-        destination=dlt.destinations.duckdb(DB_PATH),
-        dataset_name="events",
-        dev_mode=False
-    )
-    pipeline.run(daily_summary_resource(summaries))
+    # Append events to the open monthly file
+    event_count = events.num_rows
+    writer.write(day_num, events)
     
-    # Save events to parquet
-    event_count = len(events)
-    if events:
-        events_df = pl.DataFrame(events)
-        month_folder = f"data/month_{month_num}"
-        os.makedirs(month_folder, exist_ok=True)
-        events_df.write_parquet(f"{month_folder}/day_{day_num:03d}.parquet")
-        del events_df
+    # Periodic registry snapshot
+    if REGISTRY_SNAPSHOT_EVERY and day_num % REGISTRY_SNAPSHOT_EVERY == REGISTRY_SNAPSHOT_EVERY - 1:
+        registry.snapshot(shard.path(REGISTRY_SNAPSHOT_PATH))
     
     # CLEAR
-    del users, active, events, summaries
+    del users, batch, day, events, summaries
     
     return event_count
     
 
-if __name__ == '__main__':
-    print("Generating events...")
+def run_shard(index: int, count: int, seed: Optional[int], days: int = DAYS_TO_GENERATE, resume: bool = False,
+              compact_ids: bool = COMPACT_IDS, checkpoint_every: int = CHECKPOINT_EVERY_DAYS) -> int:
+    """Simulate every day for one shard; returns its event count for this invocation"""
+    if checkpoint_every < SUMMARY_FLUSH_DAYS:
+        raise ValueError(
+            f"checkpoint_every={checkpoint_every} is shorter than the summary flush interval "
+            f"({SUMMARY_FLUSH_DAYS} days); every checkpoint would load summaries and roll an event file"
+        )
+    shard = Shard(index, count, seed, compact_ids)
+    checkpoint = RunCheckpoint(seed, count, shard.suffix)
+    registry = UserRegistry()
+    sink = SummarySink(summary_pipeline(shard), daily_summary_resource, SUMMARY_FLUSH_DAYS, SUMMARY_FLUSH_BYTES)
+    
+    if resume and checkpoint.load():
+        registry = checkpoint.restore(shard.rng)
+        discard_summaries_after(checkpoint.next_day - 1, shard)
+        print(f"Resuming from day {checkpoint.next_day}" + (f" [shard {index}]" if count > 1 else ""))
+    files = checkpoint.files if resume else []
+    writer = EventFileWriter(
+        EVENTS_DIR, shard.suffix, EVENT_ROW_GROUP_SIZE, EVENT_COMPRESSION,
+        EVENT_DICTIONARY_COLUMNS, EVENT_FILE_MAX_ROWS, taken=files
+    )
     
     total = 0
-    for day in range(DAYS_TO_GENERATE):
-        total += generate_day(day)
+    for day in range(checkpoint.next_day if resume else 0, days):
+        total += generate_day(day, registry, shard, sink, writer)
+        
+        # Checkpoints only land on finalized event files (an open Parquet file has no footer yet),
+        # so every checkpoint rolls the month's file; month ends always roll
+        if (day % 30 + 1) % checkpoint_every == 0 or day % 30 == 29 or writer.is_full or day == days - 1:
+            path = writer.finish()
+            if path:
+                files.append(path)
+            sink.flush()
+            checkpoint.save(day, shard.rng, registry, files)
+        elif sink.should_flush:
+            sink.flush()
         
         if day % 30 == 29:
-            print(f"✓ Month {day // 30}")
+            print(f"✓ Month {day // 30}" + (f" [shard {index}]" if count > 1 else ""))
+    
+    if REGISTRY_SNAPSHOT_PATH:
+        registry.snapshot(shard.path(REGISTRY_SNAPSHOT_PATH))
+    return total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shards", type=int, default=1, help="device-id hash partitions, one process each")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--days", type=int, default=DAYS_TO_GENERATE)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: one per shard, capped at CPU count)")
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpointed day")
+    parser.add_argument("--compact-ids", action="store_true", default=COMPACT_IDS, help="write ids as 16-byte binary")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY_DAYS,
+                        help=f"days between checkpoints within a month (at least {SUMMARY_FLUSH_DAYS}); each one finalizes the open event file")
+    args = parser.parse_args()
+    
+    print("Generating events...")
+    
+    if args.shards == 1:
+        total = run_shard(0, 1, args.seed, args.days, args.resume, args.compact_ids, args.checkpoint_every)
+    else:
+        workers = args.workers or min(args.shards, os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_shard, i, args.shards, args.seed, args.days, args.resume, args.compact_ids, args.checkpoint_every) for i in range(args.shards)]
+            total = sum(f.result() for f in futures)
+    
+    print(f"✓ {total} events across {args.shards} shard(s)")
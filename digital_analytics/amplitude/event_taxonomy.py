@@ -1,5 +1,6 @@
 # Comprehensive SaaS Event Taxonomy
 # Based on typical B2B SaaS customer journey
+import numpy as np
 
 SAAS_EVENT_TAXONOMY = {
     # ==================== AWARENESS ====================
@@ -282,3 +283,89 @@ JOURNEY_ARCHETYPES = {
         'login_decreased', 'trial_expiring_soon', 'subscription_cancelled'
     ],
 }
+
+# Lifecycle stage → fallback event pool when no flow pattern fires
+STAGE_EVENT_POOLS = {
+    'awareness': SAAS_EVENT_TAXONOMY['awareness'],
+    'engaged': SAAS_EVENT_TAXONOMY['interest'] + SAAS_EVENT_TAXONOMY['consideration'],
+    'trial': SAAS_EVENT_TAXONOMY['trial_signup'] + SAAS_EVENT_TAXONOMY['activation'],
+    'self_service': SAAS_EVENT_TAXONOMY['product_usage'],
+    'customer': SAAS_EVENT_TAXONOMY['product_usage'] + SAAS_EVENT_TAXONOMY['retention'],
+    'churn_risk': SAAS_EVENT_TAXONOMY['churn_risk'],
+}
+
+# Probability that a flow pattern is followed at all (otherwise fall back to the stage pool)
+FLOW_FOLLOW_PROBABILITY = 0.6
+
+# ==================== COMPILED TABLES ====================
+# Everything above compiled once at import into integer codes so that
+# next-event sampling for many users is a single vectorized lookup.
+
+ALL_EVENTS = [e for events in SAAS_EVENT_TAXONOMY.values() for e in events]
+
+EVENT_NAMES = list(dict.fromkeys(
+    ALL_EVENTS
+    + list(EVENT_FLOW_PATTERNS.keys())
+    + [e for targets in EVENT_FLOW_PATTERNS.values() for e in targets]
+))
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_NAMES)}
+
+LIFECYCLE_STAGES = list(STAGE_EVENT_POOLS.keys())
+STAGE_CODES = {name: code for code, name in enumerate(LIFECYCLE_STAGES)}
+
+NO_EVENT = -1
+
+# Scalar form: event → (targets, cumulative weights) for random.choices(cum_weights=...)
+FLOW_CHOICES = {
+    source: (list(targets.keys()), list(np.cumsum(list(targets.values()))))
+    for source, targets in EVENT_FLOW_PATTERNS.items()
+}
+
+# Transition matrix: row = current event code, columns = padded targets.
+# FLOW_CUMULATIVE is normalized per row (random.choices semantics) and padded
+# with 2.0 so a uniform draw in [0, 1) never lands on a padding column.
+_MAX_TARGETS = max(len(targets) for targets in EVENT_FLOW_PATTERNS.values())
+FLOW_TARGETS = np.full((len(EVENT_NAMES), _MAX_TARGETS), NO_EVENT, dtype=np.int16)
+FLOW_CUMULATIVE = np.full((len(EVENT_NAMES), _MAX_TARGETS), 2.0)
+HAS_FLOW = np.zeros(len(EVENT_NAMES), dtype=bool)
+
+for _source, _targets in EVENT_FLOW_PATTERNS.items():
+    _row = EVENT_CODES[_source]
+    _weights = np.array(list(_targets.values()))
+    _cumulative = np.cumsum(_weights) / _weights.sum()
+    _cumulative[-1] = 1.0
+    FLOW_TARGETS[_row, :len(_targets)] = [EVENT_CODES[t] for t in _targets]
+    FLOW_CUMULATIVE[_row, :len(_targets)] = _cumulative
+    HAS_FLOW[_row] = True
+
+# Stage pools as a padded code table (duplicates kept so weighting matches random.choice)
+_MAX_POOL = max(len(pool) for pool in STAGE_EVENT_POOLS.values())
+STAGE_POOL_TABLE = np.full((len(LIFECYCLE_STAGES), _MAX_POOL), NO_EVENT, dtype=np.int16)
+STAGE_POOL_SIZES = np.zeros(len(LIFECYCLE_STAGES), dtype=np.int64)
+
+for _stage, _pool in STAGE_EVENT_POOLS.items():
+    STAGE_POOL_TABLE[STAGE_CODES[_stage], :len(_pool)] = [EVENT_CODES[e] for e in _pool]
+    STAGE_POOL_SIZES[STAGE_CODES[_stage]] = len(_pool)
+
+ALL_EVENTS_POOL = np.array([EVENT_CODES[e] for e in ALL_EVENTS], dtype=np.int16)
+
+
+def sample_flow_events(current, rng):
+    """Next event code per row from EVENT_FLOW_PATTERNS, NO_EVENT where the flow does not fire"""
+    current = np.asarray(current, dtype=np.int16)
+    fires = HAS_FLOW[current] & (rng.random(len(current)) < FLOW_FOLLOW_PROBABILITY)
+    column = (rng.random(len(current))[:, None] >= FLOW_CUMULATIVE[current]).sum(axis=1)
+    return np.where(fires, FLOW_TARGETS[current, np.minimum(column, _MAX_TARGETS - 1)], NO_EVENT).astype(np.int16)
+
+
+def sample_stage_events(stages, rng):
+    """Uniform event code per row from the lifecycle stage's fallback pool"""
+    stages = np.asarray(stages, dtype=np.int64)
+    column = (rng.random(len(stages)) * STAGE_POOL_SIZES[stages]).astype(np.int64)
+    return STAGE_POOL_TABLE[stages, column]
+
+
+def sample_next_events(current, stages, rng):
+    """Flow-pattern next event per row, falling back to the stage pool"""
+    following = sample_flow_events(current, rng)
+    return np.where(following == NO_EVENT, sample_stage_events(stages, rng), following).astype(np.int16)
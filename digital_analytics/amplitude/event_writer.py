@@ -0,0 +1,93 @@
+"""
+Long-lived Parquet writer for generated events
+Appends each day's events to one open file per month (rolling to the next .K
+file when the caller finishes it at a checkpoint, or once it reaches
+max_file_rows), buffering rows into row groups of row_group_size
+"""
+import os
+from typing import List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EVENTS_DIR = "data"
+ROW_GROUP_SIZE = 65536
+MAX_FILE_ROWS = 5_000_000
+COMPRESSION = "zstd"
+DICTIONARY_COLUMNS = ['event_type', 'lifecycle_stage']
+
+
+class EventFileWriter:
+    """Writes data/events_month_MM[.part-N][.K].parquet, one open file at a time"""
+
+    def __init__(self, directory: str = EVENTS_DIR, suffix: str = "", row_group_size: int = ROW_GROUP_SIZE,
+                 compression: str = COMPRESSION, dictionary_columns: List[str] = DICTIONARY_COLUMNS,
+                 max_file_rows: Optional[int] = MAX_FILE_ROWS, taken: List[str] = ()):
+        self.directory = directory
+        self.suffix = suffix
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.dictionary_columns = list(dictionary_columns)
+        self.max_file_rows = max_file_rows
+        self.taken = set(taken)  # finalized files from an earlier run (resume)
+
+        self.writer = None
+        self.path = None
+        self.file_rows = 0
+        self.pending: List[pa.Table] = []
+        self.pending_rows = 0
+
+    def _file_path(self, month: int, seq: int) -> str:
+        name = f"events_month_{month:02d}{self.suffix}" + (f".{seq}" if seq else "")
+        return os.path.join(self.directory, f"{name}.parquet")
+
+    def _open(self, month: int, schema: pa.Schema):
+        seq = 0
+        while self._file_path(month, seq) in self.taken:
+            seq += 1
+        self.path = self._file_path(month, seq)
+        os.makedirs(self.directory, exist_ok=True)
+        self.writer = pq.ParquetWriter(
+            self.path,
+            schema,
+            compression=self.compression,
+            use_dictionary=self.dictionary_columns,
+        )
+
+    def _write_pending(self, final: bool = False):
+        if not self.pending_rows:
+            return
+        table = pa.concat_tables(self.pending)
+        full = self.pending_rows - self.pending_rows % self.row_group_size if not final else self.pending_rows
+        if full:
+            self.writer.write_table(table.slice(0, full), row_group_size=self.row_group_size)
+        rest = table.slice(full)
+        self.pending = [rest] if rest.num_rows else []
+        self.pending_rows = rest.num_rows
+
+    def write(self, day_num: int, events: pa.Table):
+        """Append one day's events to the current month file"""
+        if not events.num_rows:
+            return
+        if self.writer is None:
+            self._open(day_num // 30, events.schema)
+        self.pending.append(events)
+        self.pending_rows += events.num_rows
+        self.file_rows += events.num_rows
+        if self.pending_rows >= self.row_group_size:
+            self._write_pending()
+
+    @property
+    def is_full(self) -> bool:
+        return bool(self.max_file_rows) and self.file_rows >= self.max_file_rows
+
+    def finish(self) -> Optional[str]:
+        """Flush buffered rows and close the current file; returns its path (None if nothing was written)"""
+        if self.writer is None:
+            return None
+        self._write_pending(final=True)
+        self.writer.close()
+        path = self.path
+        self.taken.add(path)
+        self.writer, self.path, self.file_rows = None, None, 0
+        return path
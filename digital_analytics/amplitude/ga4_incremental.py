@@ -0,0 +1,309 @@
+"""
+Incremental materialization of the GA4-from-Amplitude reports
+Keeps per-file, per-day partial aggregates (with HLL user sketches, see
+hll_sketch) and a first-touch table in a local state store. Each run processes
+only event files that appeared since the last one and rewrites only the
+affected partitions: output/ga4_reports/<report>/event_date=YYYYMMDD/
+
+Report definitions mirror customer_acquisition_analysis; total_users comes from
+the merged sketches instead of an exact n_unique
+"""
+import glob
+import json
+import os
+import shutil
+from typing import Dict, List
+
+import polars as pl
+
+import hll_sketch
+from shared_config import KEY_EVENTS, REVENUE_EVENTS, AVERAGE_TRANSACTION_VALUE
+
+EVENTS_GLOB = 'data/events_month_*.parquet'
+STATE_DIR = 'output/ga4_state'
+REPORTS_DIR = 'output/ga4_reports'
+
+REPORT_KEYS = {
+    'events_report': ['event_date', 'event_name', 'source_medium'],
+    'conversions_report': ['event_date', 'event_name', 'source_medium'],
+    'traffic_acquisition': ['event_date', 'session_source', 'session_medium'],
+    'user_acquisition': ['event_date', 'first_user_source', 'first_user_medium'],
+}
+
+# Additive partial columns per report (summed across files when merging)
+REPORT_SUMS = {
+    'events_report': ['event_count', 'total_revenue'],
+    'conversions_report': ['key_events', 'total_revenue'],
+    'traffic_acquisition': ['total_sessions', 'engaged_sessions', 'event_count'],
+    'user_acquisition': ['engaged_sessions', 'total_sessions', 'event_count', 'total_revenue'],
+}
+
+REVENUE = (pl.when(pl.col('event_type').is_in(REVENUE_EVENTS))
+           .then(pl.lit(AVERAGE_TRANSACTION_VALUE))
+           .otherwise(pl.lit(0.0)))
+
+
+# ==========================================
+# STATE STORE
+# ==========================================
+
+def _state_path(*parts) -> str:
+    return os.path.join(STATE_DIR, *parts)
+
+
+def _fingerprint(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _file_key(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def load_manifest() -> dict:
+    """Processed files; state written by another Polars version or sketch precision is discarded"""
+    empty = {'polars_version': pl.__version__, 'hll_precision': hll_sketch.HLL_PRECISION, 'files': {}}
+    path = _state_path('manifest.json')
+    if not os.path.exists(path):
+        return empty
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('polars_version') != pl.__version__ or manifest.get('hll_precision') != hll_sketch.HLL_PRECISION:
+        print("  State store was built with a different Polars version or HLL precision, rebuilding")
+        return empty
+    return manifest
+
+
+def save_manifest(manifest: dict):
+    path = _state_path('manifest.json')
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def reset_state():
+    shutil.rmtree(STATE_DIR, ignore_errors=True)
+    os.makedirs(STATE_DIR, exist_ok=True)
+
+
+# ==========================================
+# PARTIAL AGGREGATES
+# ==========================================
+
+def scan_events(paths: List[str]) -> pl.LazyFrame:
+    return pl.scan_parquet(paths).with_columns([
+        pl.col('event_properties').struct.field('source').alias('source'),
+        pl.col('event_properties').struct.field('medium').alias('medium'),
+    ])
+
+
+def first_touch_of(events: pl.LazyFrame) -> pl.LazyFrame:
+    return (events
+        .group_by('device_id')
+        .agg([
+            pl.col('event_time').min().alias('first_time'),
+            pl.col('event_date').sort_by('event_time').first().alias('first_date'),
+            pl.col('source').sort_by('event_time').first().alias('first_user_source'),
+            pl.col('medium').sort_by('event_time').first().alias('first_user_medium'),
+        ])
+    )
+
+
+def update_first_touch(new_files: List[str]) -> bool:
+    """Fold first touches from new files into the state; False if any known device's
+    first touch moved earlier (attribution of already-materialized days would change)"""
+    path = _state_path('first_touch.parquet')
+    candidates = first_touch_of(scan_events(new_files)).collect()
+    if os.path.exists(path):
+        known = pl.read_parquet(path)
+        moved = (candidates
+            .join(known.select(['device_id', pl.col('first_time').alias('known_time')]), on='device_id')
+            .filter(pl.col('first_time') < pl.col('known_time'))
+            .height)
+        if moved:
+            return False
+        candidates = pl.concat([known, candidates.join(known, on='device_id', how='anti')])
+    candidates.write_parquet(path)
+    return True
+
+
+def file_partials(path: str, first_touch: pl.LazyFrame) -> Dict[str, tuple]:
+    """(sums, sketch registers) per report for one event file"""
+    events = scan_events([path]).with_columns([
+        pl.col('event_type').alias('event_name'),
+        (pl.col('source') + '/' + pl.col('medium')).alias('source_medium'),
+        pl.col('source').alias('session_source'),
+        pl.col('medium').alias('session_medium'),
+    ])
+    partials = {}
+
+    keys = REPORT_KEYS['events_report']
+    partials['events_report'] = (
+        events.group_by(keys).agg([pl.len().alias('event_count'), REVENUE.sum().alias('total_revenue')]),
+        hll_sketch.sketch(events, keys, 'device_id'),
+    )
+
+    keys = REPORT_KEYS['conversions_report']
+    conversions = events.filter(pl.col('event_type').is_in(KEY_EVENTS))
+    partials['conversions_report'] = (
+        conversions.group_by(keys).agg([pl.len().alias('key_events'), REVENUE.sum().alias('total_revenue')]),
+        hll_sketch.sketch(conversions, keys, 'device_id'),
+    )
+
+    keys = REPORT_KEYS['traffic_acquisition']
+    partials['traffic_acquisition'] = (
+        events
+            .group_by(keys + ['session_id', 'device_id'])
+            .agg([pl.len().alias('events_in_session'), pl.col('event_type').is_in(KEY_EVENTS).any().alias('has_conversion')])
+            .group_by(keys)
+            .agg([
+                pl.col('session_id').n_unique().alias('total_sessions'),
+                pl.col('has_conversion').sum().alias('engaged_sessions'),
+                pl.col('events_in_session').sum().alias('event_count'),
+            ]),
+        hll_sketch.sketch(events, keys, 'device_id'),
+    )
+
+    keys = REPORT_KEYS['user_acquisition']
+    attributed = events.join(
+        first_touch.select(['device_id', 'first_user_source', 'first_user_medium']), on='device_id'
+    )
+    sessions = (attributed
+        .group_by(keys + ['session_id'])
+        .agg(pl.col('event_type').is_in(KEY_EVENTS).any().alias('has_conversion'))
+        .group_by(keys)
+        .agg([pl.col('has_conversion').sum().alias('engaged_sessions'), pl.len().alias('total_sessions')])
+    )
+    partials['user_acquisition'] = (
+        attributed
+            .group_by(keys)
+            .agg([pl.len().alias('event_count'), REVENUE.sum().alias('total_revenue')])
+            .join(sessions, on=keys, how='left')
+            .select(keys + REPORT_SUMS['user_acquisition']),
+        hll_sketch.sketch(attributed, keys, 'device_id'),
+    )
+    return partials
+
+
+def write_partials(path: str, first_touch: pl.LazyFrame):
+    partials = file_partials(path, first_touch)
+    names = list(partials)
+    frames = pl.collect_all([frame for name in names for frame in partials[name]])
+    for i, name in enumerate(names):
+        for kind, frame in zip(['partials', 'registers'], frames[2 * i:2 * i + 2]):
+            os.makedirs(_state_path(kind, name), exist_ok=True)
+            frame.write_parquet(_state_path(kind, name, f"{_file_key(path)}.parquet"))
+
+
+# ==========================================
+# MATERIALIZATION
+# ==========================================
+
+def merged_report(name: str, dates: pl.Series) -> pl.LazyFrame:
+    """Merge every file's partials for the given dates into final report rows"""
+    keys = REPORT_KEYS[name]
+    in_dates = pl.col('event_date').is_in(dates.implode())
+    sums = (pl.scan_parquet(_state_path('partials', name, '*.parquet'))
+        .filter(in_dates)
+        .group_by(keys)
+        .agg([pl.col(c).sum() for c in REPORT_SUMS[name]]))
+    users = hll_sketch.estimate(
+        pl.scan_parquet(_state_path('registers', name, '*.parquet')).filter(in_dates), keys, 'total_users'
+    )
+    report = sums.join(users, on=keys, how='left')
+
+    if name == 'events_report':
+        report = report.select(keys + ['event_count', 'total_users', 'total_revenue']).with_columns(
+            (pl.col('event_count') / pl.col('total_users')).round(2).alias('event_count_per_user')
+        )
+    elif name == 'conversions_report':
+        report = report.select(keys + ['key_events', 'total_users', 'total_revenue'])
+    elif name == 'traffic_acquisition':
+        report = report.with_columns(
+            (pl.col('total_users') * 0.3).cast(pl.Int64).alias('new_users'),
+        ).with_columns([
+            (pl.col('engaged_sessions') / pl.col('total_sessions')).round(2).alias('engagement_rate'),
+            (pl.col('event_count') / pl.col('total_sessions')).round(2).alias('events_per_session'),
+        ])
+    elif name == 'user_acquisition':
+        new_users = (pl.scan_parquet(_state_path('first_touch.parquet'))
+            .filter(pl.col('first_date').is_in(dates.implode()))
+            .group_by([pl.col('first_date').alias('event_date'), 'first_user_source', 'first_user_medium'])
+            .agg(pl.len().alias('new_users')))
+        report = (new_users
+            .join(report, on=keys, how='left')
+            .with_columns([
+                pl.col('engaged_sessions').fill_null(0),
+                pl.col('total_sessions').fill_null(0),
+                pl.col('event_count').fill_null(0),
+                pl.col('total_users').fill_null(pl.col('new_users')),
+                pl.col('total_revenue').fill_null(0.0),
+            ])
+            .select(keys + ['new_users', 'engaged_sessions', 'total_sessions', 'event_count', 'total_users', 'total_revenue'])
+            .with_columns(
+                (pl.col('engaged_sessions') / pl.when(pl.col('total_sessions') > 0).then(pl.col('total_sessions')).otherwise(1)).round(2).alias('engagement_rate')
+            ))
+
+    # Same column layout as the full reports: event_date, event_month, dimensions, metrics
+    return (report
+        .with_columns(pl.col('event_date').dt.truncate('1mo').alias('event_month'))
+        .select(['event_date', 'event_month', pl.exclude(['event_date', 'event_month'])])
+        .sort(keys)
+        .with_columns([
+            pl.col('event_date').dt.strftime('%Y%m%d'),
+            pl.col('event_month').dt.strftime('%Y-%m'),
+        ]))
+
+
+def write_partitions(name: str, report: pl.DataFrame, dates: pl.Series):
+    """Replace the event_date partitions of one report (hive layout, key not repeated in the files)"""
+    partitions = report.partition_by('event_date', as_dict=True, include_key=False)
+    for date in dates.dt.strftime('%Y%m%d'):
+        directory = os.path.join(REPORTS_DIR, name, f"event_date={date}")
+        shutil.rmtree(directory, ignore_errors=True)
+        if (date,) in partitions:
+            os.makedirs(directory)
+            partitions[(date,)].write_parquet(os.path.join(directory, 'part-0.parquet'))
+
+
+def run(rebuild: bool = False):
+    files = {path: _fingerprint(path) for path in sorted(glob.glob(EVENTS_GLOB))}
+    manifest = load_manifest()
+    known = manifest['files']
+
+    # Rewritten or removed inputs invalidate their partials and first touches: start over
+    changed = [path for path, fp in known.items() if files.get(path) != fp]
+    if rebuild or changed or not known:
+        if changed:
+            print(f"  {len(changed)} processed file(s) changed or disappeared, rebuilding state")
+        reset_state()
+        manifest['files'] = known = {}
+
+    new_files = [path for path in files if path not in known]
+    if not new_files:
+        print("✓ GA4 reports are up to date")
+        return
+
+    print(f"Processing {len(new_files)} new file(s)")
+    if not update_first_touch(new_files):
+        print("  New files move known first touches earlier, rebuilding state")
+        return run(rebuild=True)
+
+    first_touch = pl.scan_parquet(_state_path('first_touch.parquet'))
+    for path in new_files:
+        print(f"  {path}")
+        write_partials(path, first_touch)
+
+    dates = pl.scan_parquet(new_files).select(pl.col('event_date').unique().sort()).collect()['event_date']
+    names = list(REPORT_KEYS)
+    reports = pl.collect_all([merged_report(name, dates) for name in names])
+    for name, report in zip(names, reports):
+        write_partitions(name, report, dates)
+        print(f"✓ {name}: {report.height:,} rows across {len(dates)} event_date partition(s)")
+
+    manifest['files'].update({path: files[path] for path in new_files})
+    save_manifest(manifest)
+
+
+if __name__ == '__main__':
+    run()
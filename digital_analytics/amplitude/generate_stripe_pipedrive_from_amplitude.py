@@ -1,17 +1,26 @@
 """
 Generate Stripe + Pipedrive CRM data FROM Amplitude user funnel state
 Complete customer data pipeline: Amplitude → Stripe → Pipedrive
+
+Customers, subscriptions, leads and deals are derived column-wise from the
+persons frame; subscription details reach leads and deals through joins on
+device_id rather than per-user scans of the subscription list
 """
 import polars as pl
-from datetime import datetime, timedelta
-import random
-import uuid
+import numpy as np
+from datetime import datetime
+import sys
 import os
-from faker import Faker
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from event_engine import uuid4_strings
+from stripe_ids import id_factory
+from rng_streams import stream
+
+SEED = 42
+rng = stream('amplitude', 'stripe_pipedrive', seed=SEED)
+ids = id_factory('amplitude', 'stripe_pipedrive')
 
 print("="*80)
 print("AMPLITUDE → STRIPE + PIPEDRIVE DATA GENERATOR")
@@ -22,6 +31,14 @@ print("\nLoading Amplitude user funnel state...")
 users = pl.read_parquet('output/user_funnel_state.parquet')
 print(f"Loaded {len(users):,} users from Amplitude")
 
+# One billing/CRM record per resolved person (identity graph), using the person's
+# most recently active device
+persons = (users
+    .sort('last_active_date', descending=True)
+    .unique(subset='resolved_person_key', keep='first', maintain_order=True)
+)
+print(f"Resolved to {len(persons):,} persons")
+
 # Sales team
 SALES_REPS = [
     {'id': 1, 'name': 'Sarah Johnson'},
@@ -38,15 +55,40 @@ PRODUCTS = [
     {'id': 'prod_business', 'sku': 'BUSINESS_MONTHLY', 'name': 'Business', 'price_monthly': 29900, 'price_annual': 299900},
     {'id': 'prod_enterprise', 'sku': 'ENTERPRISE', 'name': 'Enterprise', 'price_monthly': 49900, 'price_annual': 499900},
 ]
+PRODUCT_INDEX = {p['name']: i for i, p in enumerate(PRODUCTS)}
+
+HIGH_TIERS = ['very_high_engagement', 'high_engagement']
+GENERATED_AT = datetime.now().isoformat()
+
+
+def select_product_by_engagement(engagement_tiers):
+    """Product index per user based on engagement (random pick between two tiers for engaged users)"""
+    tiers = engagement_tiers.to_numpy()
+    upper = rng.integers(0, 2, len(tiers)).astype(bool)
+    return np.select(
+        [tiers == 'very_high_engagement', np.isin(tiers, ['high_engagement', 'medium_engagement'])],
+        [np.where(upper, PRODUCT_INDEX['Enterprise'], PRODUCT_INDEX['Business']),
+         np.where(upper, PRODUCT_INDEX['Business'], PRODUCT_INDEX['Professional'])],
+        default=PRODUCT_INDEX['Starter'],  # Starter
+    )
+
+
+def random_owners(n):
+    return pl.Series('owner_id', np.array([r['id'] for r in SALES_REPS])[rng.integers(0, len(SALES_REPS), n)])
+
+
+def epoch_seconds(column):
+    return pl.col(column).cast(pl.Datetime('us')).dt.epoch('s')
+
+
+def iso_date(column):
+    """Funnel dates as the ISO strings the CRM/billing records have always carried"""
+    return pl.col(column).dt.strftime('%Y-%m-%d')
+
+
+def display_name():
+    return pl.when(pl.col('email').is_null() | (pl.col('email') == '')).then(pl.col('user_id')).otherwise(pl.col('email'))
 
-def select_product_by_engagement(engagement_tier):
-    """Select product based on user engagement"""
-    if engagement_tier == 'very_high_engagement':
-        return random.choice([p for p in PRODUCTS if p['name'] in ['Enterprise', 'Business']])
-    elif engagement_tier in ['high_engagement', 'medium_engagement']:
-        return random.choice([p for p in PRODUCTS if p['name'] in ['Professional', 'Business']])
-    else:
-        return PRODUCTS[0]  # Starter
 
 os.makedirs('output/stripe', exist_ok=True)
 os.makedirs('output/pipedrive', exist_ok=True)
@@ -60,45 +102,40 @@ print("GENERATING STRIPE CUSTOMERS")
 print("="*80)
 
 # Customers are users who identified (have email) AND converted
-stripe_customers = users.filter(
+stripe_customers = persons.filter(
     (pl.col('email') != '') & 
     (pl.col('current_stage') == 'customer')
 )
 
 print(f"\nCreating {len(stripe_customers):,} Stripe customers...")
 
-customers_list = []
-customer_id_map = {}  # device_id -> stripe_customer_id
-
-for user in stripe_customers.iter_rows(named=True):
-    customer_id = f"cus_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}"
-    customer_id_map[user['device_id']] = customer_id
-    
-    created_time = datetime.fromisoformat(user['trial_converted_date']) if user['trial_converted_date'] else datetime.fromisoformat(user['first_visit_date'])
-    
-    customers_list.append({
-        'id': customer_id,
-        'object': 'customer',
-        'email': user['email'],
-        'name': user['email'].split('@')[0],
-        'created': int(created_time.timestamp()),
-        'currency': 'usd',
-        'balance': 0,
-        'delinquent': False,
-        'metadata': {
-            'user_id': user['user_id'],
-            'device_id': user['device_id'],
-            'acquisition_channel': user['acquisition_channel'],
-            'engagement_tier': user['engagement_tier'],
-            'total_sessions': user['total_sessions'],
-        },
-        '_generated_at': datetime.now().isoformat(),
-        '_source': 'amplitude',
-    })
-
-customers_df = pl.DataFrame(customers_list)
+stripe_customers = stripe_customers.with_columns(
+    pl.Series('customer_id', ids.batch('cus_', stripe_customers.height, 14), dtype=pl.Utf8),
+    pl.coalesce('trial_converted_date', 'first_visit_date').alias('conversion_date'),
+)
+
+customers_df = stripe_customers.select([
+    pl.col('customer_id').alias('id'),
+    pl.lit('customer').alias('object'),
+    'email',
+    pl.col('email').str.split('@').list.first().alias('name'),
+    epoch_seconds('conversion_date').alias('created'),
+    pl.lit('usd').alias('currency'),
+    pl.lit(0, dtype=pl.Int64).alias('balance'),
+    pl.lit(False).alias('delinquent'),
+    pl.struct([
+        'user_id',
+        'device_id',
+        'resolved_person_key',
+        'acquisition_channel',
+        'engagement_tier',
+        pl.col('total_sessions').cast(pl.Int64),
+    ]).alias('metadata'),
+    pl.lit(GENERATED_AT).alias('_generated_at'),
+    pl.lit('amplitude').alias('_source'),
+])
 customers_df.write_parquet('output/stripe/customers.parquet')
-print(f"✓ Saved {len(customers_list):,} customers")
+print(f"✓ Saved {len(customers_df):,} customers")
 
 # ==========================================
 # 2. STRIPE SUBSCRIPTIONS (for customers)
@@ -108,84 +145,81 @@ print("\n" + "="*80)
 print("GENERATING STRIPE SUBSCRIPTIONS")
 print("="*80)
 
-subscriptions_list = []
-
-for user in stripe_customers.iter_rows(named=True):
-    customer_id = customer_id_map[user['device_id']]
-    
-    # Select product based on engagement
-    product = select_product_by_engagement(user['engagement_tier'])
-    
-    # Determine billing interval (higher engagement → more annual)
-    if user['engagement_tier'] in ['very_high_engagement', 'high_engagement']:
-        billing_interval = 'year' if random.random() < 0.4 else 'month'
-    else:
-        billing_interval = 'year' if random.random() < 0.15 else 'month'
-    
-    amount = product['price_annual'] if billing_interval == 'year' else product['price_monthly']
-    
-    # Dates
-    trial_start = datetime.fromisoformat(user['trial_started_date']) if user['trial_started_date'] else None
-    conversion_date = datetime.fromisoformat(user['trial_converted_date']) if user['trial_converted_date'] else datetime.fromisoformat(user['first_visit_date'])
-    
-    # Current period
-    if billing_interval == 'month':
-        current_period_end = conversion_date + timedelta(days=30)
-    else:
-        current_period_end = conversion_date + timedelta(days=365)
-    
-    # Calculate conversion day if trial
-    conversion_day = None
-    if trial_start:
-        conversion_day = (conversion_date - trial_start).days
-    
-    subscriptions_list.append({
-        'id': f"sub_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
-        'object': 'subscription',
-        'customer': customer_id,
-        'status': 'active',
-        'created': int(conversion_date.timestamp()),
-        'current_period_start': int(conversion_date.timestamp()),
-        'current_period_end': int(current_period_end.timestamp()),
-        'currency': 'usd',
-        'billing_cycle_anchor': int(conversion_date.timestamp()),
-        'trial_start': int(trial_start.timestamp()) if trial_start else None,
-        'trial_end': int(conversion_date.timestamp()) if trial_start else None,
-        'items': {
-            'data': [{
-                'plan': {
-                    'id': f"plan_{product['sku'].lower()}_{billing_interval}ly",
-                    'product': product['id'],
-                    'amount': amount,
-                    'currency': 'usd',
-                    'interval': billing_interval,
-                    'nickname': f"{product['name']} {billing_interval.title()}ly",
-                }
-            }]
-        },
-        'metadata': {
-            'product_sku': product['sku'],
-            'product_name': product['name'],
-            'billing_interval': billing_interval,
-            'user_id': user['user_id'],
-            'device_id': user['device_id'],
-            'conversion_day': conversion_day,
-            'engagement_tier': user['engagement_tier'],
-        },
-        '_generated_at': datetime.now().isoformat(),
-        '_source': 'amplitude',
-    })
-
-subscriptions_df = pl.DataFrame(subscriptions_list)
+n_subs = stripe_customers.height
+products_df = pl.DataFrame(PRODUCTS).with_row_index('product_index').rename({
+    'id': 'product_id', 'sku': 'product_sku', 'name': 'product_name',
+})
+
+# Select product based on engagement, billing interval (higher engagement → more annual)
+annual_share = np.where(np.isin(stripe_customers['engagement_tier'].to_numpy(), HIGH_TIERS), 0.4, 0.15)
+subscriptions = (stripe_customers
+    .with_columns(
+        pl.Series('product_index', select_product_by_engagement(stripe_customers['engagement_tier']), dtype=pl.UInt32),
+        pl.Series('billing_interval', np.where(rng.random(n_subs) < annual_share, 'year', 'month')),
+        pl.Series('subscription_id', ids.batch('sub_', n_subs, 18), dtype=pl.Utf8),
+    )
+    .join(products_df, on='product_index', how='left', maintain_order='left')
+    .with_columns(
+        pl.when(pl.col('billing_interval') == 'year').then(pl.col('price_annual')).otherwise(pl.col('price_monthly')).alias('amount'),
+        # Current period
+        (pl.col('conversion_date') + pl.when(pl.col('billing_interval') == 'month')
+            .then(pl.duration(days=30)).otherwise(pl.duration(days=365))).alias('current_period_end'),
+        # Conversion day if trial
+        (pl.col('conversion_date') - pl.col('trial_started_date')).dt.total_days().alias('conversion_day'),
+    )
+)
+
+subscriptions_df = subscriptions.select([
+    pl.col('subscription_id').alias('id'),
+    pl.lit('subscription').alias('object'),
+    pl.col('customer_id').alias('customer'),
+    pl.lit('active').alias('status'),
+    epoch_seconds('conversion_date').alias('created'),
+    epoch_seconds('conversion_date').alias('current_period_start'),
+    epoch_seconds('current_period_end').alias('current_period_end'),
+    pl.lit('usd').alias('currency'),
+    epoch_seconds('conversion_date').alias('billing_cycle_anchor'),
+    epoch_seconds('trial_started_date').alias('trial_start'),
+    pl.when(pl.col('trial_started_date').is_not_null()).then(epoch_seconds('conversion_date')).alias('trial_end'),
+    pl.struct(
+        pl.concat_list(pl.struct(pl.struct([
+            pl.format('plan_{}_{}ly', pl.col('product_sku').str.to_lowercase(), 'billing_interval').alias('id'),
+            pl.col('product_id').alias('product'),
+            'amount',
+            pl.lit('usd').alias('currency'),
+            pl.col('billing_interval').alias('interval'),
+            pl.format('{} {}ly', 'product_name', pl.col('billing_interval').str.to_titlecase()).alias('nickname'),
+        ]).alias('plan'))).alias('data')
+    ).alias('items'),
+    pl.struct([
+        'product_sku',
+        'product_name',
+        'billing_interval',
+        'user_id',
+        'device_id',
+        'resolved_person_key',
+        'conversion_day',
+        'engagement_tier',
+    ]).alias('metadata'),
+    pl.lit(GENERATED_AT).alias('_generated_at'),
+    pl.lit('amplitude').alias('_source'),
+])
 subscriptions_df.write_parquet('output/stripe/subscriptions.parquet')
-print(f"✓ Saved {len(subscriptions_list):,} subscriptions")
+print(f"✓ Saved {len(subscriptions_df):,} subscriptions")
+
+# Subscription details for the CRM side, keyed on device_id
+subscription_values = subscriptions.select([
+    'device_id',
+    'product_sku',
+    'product_name',
+    'billing_interval',
+    (pl.col('amount') / 100).alias('plan_value'),
+])
 
 # Calculate revenue metrics
-total_mrr = sum([
-    (s['items']['data'][0]['plan']['amount'] / 100) if s['items']['data'][0]['plan']['interval'] == 'month'
-    else (s['items']['data'][0]['plan']['amount'] / 100 / 12)
-    for s in subscriptions_list
-])
+total_mrr = subscription_values.select(
+    pl.when(pl.col('billing_interval') == 'month').then(pl.col('plan_value')).otherwise(pl.col('plan_value') / 12).sum()
+).item() or 0.0
 total_arr = total_mrr * 12
 
 print(f"\n💰 Revenue Metrics:")
@@ -201,84 +235,70 @@ print("GENERATING PIPEDRIVE LEADS")
 print("="*80)
 
 # Leads = users who started trial or requested demo (not just visitors)
-pipedrive_leads = users.filter(
+pipedrive_leads = persons.filter(
     pl.col('current_stage').is_in(['trial_active', 'demo_requested', 'customer', 'churned'])
 )
 
 print(f"\nCreating {len(pipedrive_leads):,} Pipedrive leads...")
 
-leads_list = []
-lead_id_map = {}  # device_id -> lead_id
-
-for user in pipedrive_leads.iter_rows(named=True):
-    lead_id = str(uuid.uuid4())
-    lead_id_map[user['device_id']] = lead_id
-    
-    owner = random.choice(SALES_REPS)
-    
-    # Determine form type
-    if user['trial_started_date']:
-        form_type = 'trial_signup'
-        lifecycle_stage = 'Trial'
-    elif user['demo_requested_date']:
-        form_type = 'demo_request'
-        lifecycle_stage = 'Marketing Qualified Lead'
-    else:
-        form_type = 'contact_us'
-        lifecycle_stage = 'Lead'
-    
-    # Sales priority
-    if user['engagement_tier'] in ['very_high_engagement', 'high_engagement']:
-        sales_priority = 'high'
-    elif user['engagement_tier'] == 'medium_engagement':
-        sales_priority = 'medium'
-    else:
-        sales_priority = 'low'
-    
-    # Value estimate
-    if user['current_stage'] == 'customer':
-        # Use actual subscription value
-        matching_subs = [s for s in subscriptions_list if s['metadata']['device_id'] == user['device_id']]
-        if matching_subs:
-            value = matching_subs[0]['items']['data'][0]['plan']['amount'] / 100
-        else:
-            value = 9900 / 100  # Default
-    else:
-        value = random.randint(3000, 15000)
-    
-    leads_list.append({
-        'id': lead_id,
-        'title': f"{user['email'] or user['user_id']} - {form_type.replace('_', ' ').title()}",
-        'owner_id': owner['id'],
-        'value': value,
-        'currency': 'USD',
-        'is_archived': user['current_stage'] in ['customer', 'churned'],
-        'was_seen': True,
-        'add_time': user['first_visit_date'],
-        'update_time': user['last_active_date'],
-        
+n_leads = pipedrive_leads.height
+form_type = (pl.when(pl.col('trial_started_date').is_not_null()).then(pl.lit('trial_signup'))
+    .when(pl.col('demo_requested_date').is_not_null()).then(pl.lit('demo_request'))
+    .otherwise(pl.lit('contact_us')))
+
+leads_df = (pipedrive_leads
+    .with_columns(
+        pl.Series('lead_id', uuid4_strings(rng, n_leads), dtype=pl.Utf8),
+        random_owners(n_leads),
+        pl.Series('estimated_value', rng.integers(3000, 15001, n_leads)),
+        form_type.alias('form_type'),
+    )
+    .join(subscription_values, on='device_id', how='left', maintain_order='left')
+    .select([
+        pl.col('lead_id').alias('id'),
+        pl.format('{} - {}', display_name(), pl.col('form_type').str.replace_all('_', ' ').str.to_titlecase()).alias('title'),
+        'owner_id',
+        # Value estimate: actual subscription value for customers
+        pl.when(pl.col('current_stage') == 'customer')
+            .then(pl.col('plan_value').fill_null(9900 / 100))  # Default
+            .otherwise(pl.col('estimated_value'))
+            .cast(pl.Float64)
+            .alias('value'),
+        pl.lit('USD').alias('currency'),
+        pl.col('current_stage').is_in(['customer', 'churned']).alias('is_archived'),
+        pl.lit(True).alias('was_seen'),
+        iso_date('first_visit_date').alias('add_time'),
+        iso_date('last_active_date').alias('update_time'),
+
         # Contact info
-        'email': user['email'],
-        'user_id': user['user_id'],
-        'device_id': user['device_id'],
-        
+        'email',
+        'user_id',
+        'device_id',
+        'resolved_person_key',
+
         # Tracking
-        'lifecycle_stage': lifecycle_stage,
-        'form_type': form_type,
-        'current_stage': user['current_stage'],
-        'trial_started_date': user['trial_started_date'],
-        'sales_priority': sales_priority,
-        'engagement_tier': user['engagement_tier'],
-        'total_sessions': user['total_sessions'],
-        'acquisition_channel': user['acquisition_channel'],
-        
-        '_generated_at': datetime.now().isoformat(),
-        '_source': 'amplitude',
-    })
-
-leads_df = pl.DataFrame(leads_list)
+        pl.col('form_type').replace_strict({
+            'trial_signup': 'Trial',
+            'demo_request': 'Marketing Qualified Lead',
+            'contact_us': 'Lead',
+        }).alias('lifecycle_stage'),
+        'form_type',
+        'current_stage',
+        iso_date('trial_started_date').alias('trial_started_date'),
+        pl.when(pl.col('engagement_tier').is_in(HIGH_TIERS)).then(pl.lit('high'))
+            .when(pl.col('engagement_tier') == 'medium_engagement').then(pl.lit('medium'))
+            .otherwise(pl.lit('low'))
+            .alias('sales_priority'),
+        'engagement_tier',
+        pl.col('total_sessions').cast(pl.Int64),
+        'acquisition_channel',
+
+        pl.lit(GENERATED_AT).alias('_generated_at'),
+        pl.lit('amplitude').alias('_source'),
+    ])
+)
 leads_df.write_parquet('output/pipedrive/leads.parquet')
-print(f"✓ Saved {len(leads_list):,} leads")
+print(f"✓ Saved {len(leads_df):,} leads")
 
 # ==========================================
 # 4. PIPEDRIVE DEALS (customers only)
@@ -288,97 +308,82 @@ print("\n" + "="*80)
 print("GENERATING PIPEDRIVE DEALS")
 print("="*80)
 
-deals_list = []
-deal_id = 1
-
 # Deals = converted customers only
-pipedrive_customers = users.filter(pl.col('current_stage') == 'customer')
+pipedrive_customers = persons.filter(pl.col('current_stage') == 'customer')
 
 print(f"\nCreating {len(pipedrive_customers):,} Pipedrive deals...")
 
-for user in pipedrive_customers.iter_rows(named=True):
-    owner = random.choice(SALES_REPS)
-    
-    # Get subscription details
-    matching_subs = [s for s in subscriptions_list if s['metadata']['device_id'] == user['device_id']]
-    
-    if matching_subs:
-        sub = matching_subs[0]
-        product_sku = sub['metadata']['product_sku']
-        product_name = sub['metadata']['product_name']
-        billing_interval = sub['metadata']['billing_interval']
-        value = sub['items']['data'][0]['plan']['amount'] / 100
-        
+n_deals = pipedrive_customers.height
+add_time = pl.coalesce('trial_started_date', 'first_visit_date').cast(pl.Datetime('us')).dt.strftime('%Y-%m-%dT%H:%M:%S')
+won_time = pl.coalesce('trial_converted_date', 'last_active_date').cast(pl.Datetime('us')).dt.strftime('%Y-%m-%dT%H:%M:%S')
+
+deals_df = (pipedrive_customers
+    .with_columns(
+        random_owners(n_deals),
+        pl.Series('email_messages_count', rng.integers(10, 41, n_deals)),
+    )
+    .join(subscription_values, on='device_id', how='left', maintain_order='left')
+    .with_columns(
+        # Fallback for customers without a Stripe subscription
+        pl.col('product_sku').fill_null('STARTER_MONTHLY'),
+        pl.col('product_name').fill_null('Starter'),
+        pl.col('billing_interval').fill_null('monthly'),
+        pl.col('plan_value').fill_null(29.00),
+    )
+    .with_columns(
         # Calculate revenue metrics
-        if billing_interval == 'month':
-            mrr = value
-            arr = value * 12
-        else:
-            mrr = value / 12
-            arr = value
-    else:
-        # Fallback
-        product_sku = 'STARTER_MONTHLY'
-        product_name = 'Starter'
-        billing_interval = 'monthly'
-        value = 29.00
-        mrr = 29.00
-        arr = 348.00
-    
-    # Dates
-    add_time = datetime.fromisoformat(user['trial_started_date']) if user['trial_started_date'] else datetime.fromisoformat(user['first_visit_date'])
-    won_time = datetime.fromisoformat(user['trial_converted_date']) if user['trial_converted_date'] else datetime.fromisoformat(user['last_active_date'])
-    
-    deals_list.append({
-        'id': deal_id,
-        'title': f"{user['email'] or user['user_id']} - {product_name} ({billing_interval.title()})",
-        'owner_id': owner['id'],
-        'value': round(value, 2),
-        'currency': 'USD',
-        'stage_id': 5,  # closed_won
-        'status': 'won',
-        'probability': 100,
-        
-        'add_time': add_time.isoformat(),
-        'update_time': won_time.isoformat(),
-        'won_time': won_time.isoformat(),
-        'close_time': won_time.isoformat(),
-        
+        pl.when(pl.col('billing_interval') == 'year').then(pl.col('plan_value') / 12).otherwise(pl.col('plan_value')).alias('mrr'),
+        pl.when(pl.col('billing_interval') == 'year').then(pl.col('plan_value')).otherwise(pl.col('plan_value') * 12).alias('arr'),
+    )
+    .select([
+        pl.int_range(1, n_deals + 1, dtype=pl.Int64).alias('id'),
+        pl.format('{} - {} ({})', display_name(), 'product_name', pl.col('billing_interval').str.to_titlecase()).alias('title'),
+        'owner_id',
+        pl.col('plan_value').round(2).alias('value'),
+        pl.lit('USD').alias('currency'),
+        pl.lit(5, dtype=pl.Int64).alias('stage_id'),  # closed_won
+        pl.lit('won').alias('status'),
+        pl.lit(100, dtype=pl.Int64).alias('probability'),
+
+        add_time.alias('add_time'),
+        won_time.alias('update_time'),
+        won_time.alias('won_time'),
+        won_time.alias('close_time'),
+
         # Revenue metrics
-        'acv': round(value, 2),
-        'arr': round(arr, 2),
-        'mrr': round(mrr, 2),
-        
-        # Activity metrics  
-        'activities_count': user['total_sessions'],
-        'email_messages_count': random.randint(10, 40),
-        
+        pl.col('plan_value').round(2).alias('acv'),
+        pl.col('arr').round(2),
+        pl.col('mrr').round(2),
+
+        # Activity metrics
+        pl.col('total_sessions').cast(pl.Int64).alias('activities_count'),
+        'email_messages_count',
+
         # Product details (from Stripe)
-        'product_sku': product_sku,
-        'product_name': product_name,
-        'billing_interval': billing_interval,
-        
+        'product_sku',
+        'product_name',
+        'billing_interval',
+
         # User tracking (from Amplitude)
-        'user_id': user['user_id'],
-        'device_id': user['device_id'],
-        'email': user['email'],
-        'trial_started_date': user['trial_started_date'],
-        'conversion_day': user['days_in_current_stage'],
-        'engagement_tier': user['engagement_tier'],
-        'acquisition_channel': user['acquisition_channel'],
-        
-        '_generated_at': datetime.now().isoformat(),
-        '_source': 'amplitude',
-    })
-    deal_id += 1
-
-deals_df = pl.DataFrame(deals_list)
+        'user_id',
+        'device_id',
+        'resolved_person_key',
+        'email',
+        iso_date('trial_started_date').alias('trial_started_date'),
+        pl.col('days_in_current_stage').alias('conversion_day'),
+        'engagement_tier',
+        'acquisition_channel',
+
+        pl.lit(GENERATED_AT).alias('_generated_at'),
+        pl.lit('amplitude').alias('_source'),
+    ])
+)
 deals_df.write_parquet('output/pipedrive/deals.parquet')
-print(f"✓ Saved {len(deals_list):,} deals")
+print(f"✓ Saved {len(deals_df):,} deals")
 
 # Calculate deal metrics
-total_deal_value = sum([d['value'] for d in deals_list])
-total_deal_arr = sum([d['arr'] for d in deals_list])
+total_deal_value = deals_df['value'].sum()
+total_deal_arr = deals_df['arr'].sum()
 
 print(f"\n💼 Deal Metrics:")
 print(f"   Total Value: ${total_deal_value:,.2f}")
@@ -394,24 +399,25 @@ print("="*80)
 
 print(f"\n📊 Amplitude:")
 print(f"   Total users tracked: {len(users):,}")
+print(f"   Resolved persons: {len(persons):,}")
 print(f"   Identified users: {len(users.filter(pl.col('email') != '')):,}")
-print(f"   Converted customers: {len(users.filter(pl.col('current_stage') == 'customer')):,}")
+print(f"   Converted customers: {len(persons.filter(pl.col('current_stage') == 'customer')):,}")
 
 print(f"\n💳 Stripe:")
-print(f"   Customers: {len(customers_list):,}")
-print(f"   Active subscriptions: {len(subscriptions_list):,}")
+print(f"   Customers: {len(customers_df):,}")
+print(f"   Active subscriptions: {len(subscriptions_df):,}")
 print(f"   MRR: ${total_mrr:,.2f}")
 print(f"   ARR: ${total_arr:,.2f}")
 
 print(f"\n🤝 Pipedrive:")
-print(f"   Leads: {len(leads_list):,}")
-print(f"   Won deals: {len(deals_list):,}")
+print(f"   Leads: {len(leads_df):,}")
+print(f"   Won deals: {len(deals_df):,}")
 print(f"   Total deal value: ${total_deal_value:,.2f}")
 print(f"   Pipeline ARR: ${total_deal_arr:,.2f}")
 
 print(f"\n✅ Data Consistency:")
-print(f"   Stripe customers == Pipedrive deals: {len(customers_list) == len(deals_list)}")
-print(f"   Stripe subscriptions == Pipedrive deals: {len(subscriptions_list) == len(deals_list)}")
+print(f"   Stripe customers == Pipedrive deals: {len(customers_df) == len(deals_df)}")
+print(f"   Stripe subscriptions == Pipedrive deals: {len(subscriptions_df) == len(deals_df)}")
 
 print("\n" + "="*80)
 print("OUTPUT FILES")
@@ -425,4 +431,4 @@ print("\n🎯 Next Steps:")
 print("1. These files are ready to load into Stripe/Pipedrive")
 print("2. All data traces back to Amplitude user_id/device_id")
 print("3. Revenue metrics match between Stripe and Pipedrive")
-print("4. You can join across systems using user_id/device_id")
+print("4. You can join across systems using user_id/device_id/resolved_person_key")
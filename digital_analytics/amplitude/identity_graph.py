@@ -0,0 +1,143 @@
+"""
+Identity resolution over device / user / email / cookie identifiers
+Identifiers are interned to integer node ids (in order of first appearance, persisted
+across runs) and linked by an array-backed union-find: every pass hooks each edge's
+larger root under its smaller one, then compresses with pointer jumping. A
+component's root is therefore its oldest identifier, which gives a
+resolved_person_key that stays put as new days arrive.
+"""
+import os
+from typing import Dict, Optional, Union
+
+import numpy as np
+import polars as pl
+
+IDENTITY_GRAPH_PATH = "output/identity_graph.parquet"
+
+# Event column -> identifier namespace (uuid is the Amplitude user id)
+LINK_KINDS = {
+    'user_id': 'user',
+    'uuid': 'user',
+    'email': 'email',
+    'all_cookie_ids': 'device',
+}
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+
+def _as_text(expr: pl.Expr, dtype) -> pl.Expr:
+    """Identifiers as strings (compact binary ids become hex)"""
+    return expr.bin.encode('hex') if dtype == pl.Binary else expr.cast(pl.Utf8)
+
+
+def _compress(parent: np.ndarray) -> np.ndarray:
+    """Pointer jumping until every node points straight at its root"""
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent = grand
+
+
+def _union(parent: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Connected components of the existing forest plus the (left, right) edges"""
+    parent = _compress(parent)
+    while len(left):
+        lo = np.minimum(parent[left], parent[right])
+        hi = np.maximum(parent[left], parent[right])
+        pending = lo != hi
+        if not pending.any():
+            break
+        lo, hi = lo[pending], hi[pending]
+        left, right = left[pending], right[pending]
+
+        # Hook every root under the smallest root it is linked to
+        np.minimum.at(parent, hi, lo)
+        parent = _compress(parent)
+    return parent
+
+
+class IdentityGraph:
+    """Persistent union-find over (kind, value) identifiers"""
+
+    def __init__(self, nodes: Optional[pl.DataFrame] = None, parent: Optional[np.ndarray] = None):
+        self.nodes = nodes if nodes is not None else pl.DataFrame(
+            schema={'node_id': pl.Int64, 'kind': pl.Utf8, 'value': pl.Utf8}
+        )
+        self.parent = parent if parent is not None else np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return self.nodes.height
+
+    def _intern(self, ids: pl.DataFrame) -> pl.Series:
+        """Node ids for (kind, value) rows, assigning new ids to unseen identifiers"""
+        unseen = (ids.unique(maintain_order=True)
+            .join(self.nodes, on=['kind', 'value'], how='anti')
+            .with_row_index('node_id', offset=len(self))
+            .with_columns(pl.col('node_id').cast(pl.Int64))
+            .select(['node_id', 'kind', 'value']))
+        if unseen.height:
+            self.nodes = pl.concat([self.nodes, unseen])
+            self.parent = np.concatenate([self.parent, unseen['node_id'].to_numpy()])
+        return ids.join(self.nodes, on=['kind', 'value'], how='left', maintain_order='left')['node_id']
+
+    def add_links(self, events: Frame, anchor: str = 'device_id', kinds: Dict[str, str] = LINK_KINDS):
+        """Link every anchor (device) to the other identifiers seen on its rows"""
+        events = events.lazy()
+        available = events.collect_schema()
+        anchor_text = _as_text(pl.col(anchor), available[anchor])
+        edges = []
+        for column, kind in kinds.items():
+            if column not in available:
+                continue
+            dtype = available[column]
+            frame = events.select([anchor_text.alias('a'), pl.col(column).alias('b')])
+            if isinstance(dtype, pl.List):
+                frame = frame.explode('b')
+                dtype = dtype.inner
+            frame = frame.with_columns(_as_text(pl.col('b'), dtype))
+            if kind == 'email':
+                frame = frame.with_columns(pl.col('b').str.strip_chars().str.to_lowercase())
+            edges.append(frame
+                .filter(pl.col('b').is_not_null() & (pl.col('b') != '') & (pl.col('b') != pl.col('a')))
+                .select([pl.lit('device').alias('a_kind'), 'a', pl.lit(kind).alias('b_kind'), 'b']))
+
+        anchors = events.select(anchor_text.alias('value')).unique(maintain_order=True)
+        frames = pl.collect_all([anchors] + [e.unique(maintain_order=True) for e in edges])
+        anchors, edges = frames[0], (pl.concat(frames[1:]) if len(frames) > 1 else None)
+
+        # Interning anchors first keeps devices ahead of the identifiers they reveal
+        self._intern(anchors.select([pl.lit('device').alias('kind'), 'value']))
+        if edges is None or not edges.height:
+            return
+        left = self._intern(edges.select([pl.col('a_kind').alias('kind'), pl.col('a').alias('value')])).to_numpy()
+        right = self._intern(edges.select([pl.col('b_kind').alias('kind'), pl.col('b').alias('value')])).to_numpy()
+        self.parent = _union(self.parent, left, right)
+
+    def resolve(self, kind: str = 'device') -> pl.DataFrame:
+        """(value, resolved_person_key) for every identifier of one kind"""
+        self.parent = _compress(self.parent)
+        return (self.nodes
+            .with_columns(pl.Series('root', self.parent[self.nodes['node_id'].to_numpy()]))
+            .filter(pl.col('kind') == kind)
+            .select([
+                pl.col('value').alias(f'{kind}_id' if kind in ('device', 'user') else kind),
+                pl.format('psn_{}', pl.col('root').cast(pl.Utf8).str.zfill(10)).alias('resolved_person_key'),
+            ]))
+
+    # ==========================================
+    # PERSISTENCE
+    # ==========================================
+
+    def save(self, path: str = IDENTITY_GRAPH_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.parent = _compress(self.parent)
+        self.nodes.with_columns(pl.Series('parent', self.parent)).write_parquet(f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, path: str = IDENTITY_GRAPH_PATH) -> 'IdentityGraph':
+        if not os.path.exists(path):
+            return cls()
+        table = pl.read_parquet(path).sort('node_id')
+        return cls(table.select(['node_id', 'kind', 'value']), table['parent'].to_numpy().astype(np.int64))
@@ -0,0 +1,92 @@
+"""
+Atomic per-day checkpoints for long event-stream runs
+A checkpoint is a versioned registry snapshot plus a JSON manifest (last completed
+day, RNG state, completed day files). The manifest is swapped in last with
+os.replace, so a crash at any point leaves the previous checkpoint intact.
+"""
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+from user_registry import UserRegistry
+
+CHECKPOINT_DIR = "checkpoints"
+
+
+def _atomic_write(path: str, write):
+    tmp = f"{path}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+class RunCheckpoint:
+    """Checkpoint files for one shard of one run"""
+
+    def __init__(self, seed: Optional[int], num_shards: int, suffix: str = "", directory: str = CHECKPOINT_DIR):
+        self.seed = seed
+        self.num_shards = num_shards
+        self.suffix = suffix
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, f"manifest{suffix}.json")
+        self.manifest = None
+
+    def _registry_path(self, day_num: int) -> str:
+        return os.path.join(self.directory, f"registry{self.suffix}.day_{day_num:03d}.parquet")
+
+    def load(self) -> Optional[dict]:
+        """Read the manifest, checking it belongs to this seed/shard layout"""
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        if manifest['seed'] != self.seed or manifest['num_shards'] != self.num_shards:
+            raise ValueError(
+                f"Checkpoint {self.manifest_path} was written for seed={manifest['seed']}, "
+                f"shards={manifest['num_shards']}; got seed={self.seed}, shards={self.num_shards}"
+            )
+        missing = [path for path in manifest['files'] if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"Checkpointed day files are missing: {missing[:5]}")
+        self.manifest = manifest
+        return manifest
+
+    def restore(self, rng: np.random.Generator) -> UserRegistry:
+        """Rewind the RNG to the checkpointed state and reload the registry"""
+        rng.bit_generator.state = self.manifest['rng_state']
+        return UserRegistry.load(self.manifest['registry_path'])
+
+    def save(self, day_num: int, rng: np.random.Generator, registry: UserRegistry, files: List[str]):
+        """Record day_num as completed"""
+        os.makedirs(self.directory, exist_ok=True)
+        registry_path = self._registry_path(day_num)
+        _atomic_write(registry_path, registry.snapshot)
+
+        previous = self.manifest['registry_path'] if self.manifest else None
+        manifest = {
+            'seed': self.seed,
+            'num_shards': self.num_shards,
+            'last_completed_day': day_num,
+            'rng_state': rng.bit_generator.state,
+            'registry_path': registry_path,
+            'files': list(files),
+        }
+
+        def write(path):
+            with open(path, 'w') as f:
+                json.dump(manifest, f)
+
+        _atomic_write(self.manifest_path, write)
+        self.manifest = manifest
+
+        if previous and previous != registry_path and os.path.exists(previous):
+            os.remove(previous)
+
+    @property
+    def next_day(self) -> int:
+        return self.manifest['last_completed_day'] + 1 if self.manifest else 0
+
+    @property
+    def files(self) -> List[str]:
+        return list(self.manifest['files']) if self.manifest else []
@@ -15,6 +15,10 @@ KEY_EVENTS = [
     'first_project_created',
 ]
 
+# Revenue attribution for GA4 reports
+REVENUE_EVENTS = ['payment_completed', 'subscription_created', 'trial_converted']
+AVERAGE_TRANSACTION_VALUE = 99.0
+
 # High-intent events for lead scoring
 HIGH_INTENT_EVENTS = [
     'demo_requested',
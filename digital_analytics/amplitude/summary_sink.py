@@ -0,0 +1,42 @@
+"""
+Buffered loader for daily summary tables
+Holds Arrow summary tables in memory and hands them to one long-lived dlt
+pipeline in batches, instead of a full extract/normalize/load cycle per day
+"""
+from typing import Callable, List
+
+import pyarrow as pa
+
+FLUSH_EVERY_DAYS = 7
+FLUSH_MAX_BYTES = 64 * 1024 * 1024
+
+
+class SummarySink:
+    """Accumulates per-day summary tables and loads them through `resource` on flush"""
+
+    def __init__(self, pipeline, resource: Callable, flush_days: int = FLUSH_EVERY_DAYS, flush_bytes: int = FLUSH_MAX_BYTES):
+        self.pipeline = pipeline
+        self.resource = resource
+        self.flush_days = flush_days
+        self.flush_bytes = flush_bytes
+        self.tables: List[pa.Table] = []
+        self.days = 0
+        self.nbytes = 0
+
+    def add(self, summaries: pa.Table):
+        self.days += 1
+        if summaries.num_rows:
+            self.tables.append(summaries)
+            self.nbytes += summaries.nbytes
+
+    @property
+    def should_flush(self) -> bool:
+        return self.days >= self.flush_days or self.nbytes >= self.flush_bytes
+
+    def flush(self) -> int:
+        """Load everything buffered so far; returns the number of rows loaded"""
+        rows = sum(t.num_rows for t in self.tables)
+        if rows:
+            self.pipeline.run(self.resource(pa.concat_tables(self.tables).combine_chunks()))
+        self.tables, self.days, self.nbytes = [], 0, 0
+        return rows
@@ -0,0 +1,142 @@
+"""
+In-process, array-backed user state store for the event stream
+Keeps the latest state per device (last-seen day, return probability, lifecycle
+stage, session count, identity) so returning-user selection is a vectorized
+filter instead of a DuckDB query over the full daily_user_activity history
+"""
+import duckdb
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import os
+
+from event_engine import UserBatch, EVENT_CODES, STAGE_CODES, NO_EVENT, event_name_array, stage_name_array, id_array
+
+RETURN_WINDOW_DAYS = 7
+INITIAL_CAPACITY = 16384
+
+# Columns held per device, alongside the UserBatch fields
+_STATE_DTYPES = {
+    'device_id': object,
+    'user_id': object,
+    'email': object,
+    'is_identified': bool,
+    'is_customer': bool,
+    'session_count': np.int64,
+    'lifecycle_stage': np.int8,
+    'last_event': np.int16,
+    'last_seen_day': np.int32,
+    'return_probability': np.float64,
+}
+
+
+class UserRegistry:
+    """Growable columnar user-state store indexed by device_id"""
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.size = 0
+        self.index = {}  # device_id -> row
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in _STATE_DTYPES.items()}
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, extra: int):
+        capacity = len(self.columns['device_id'])
+        if self.size + extra <= capacity:
+            return
+        new_capacity = max(capacity * 2, self.size + extra)
+        for name, values in self.columns.items():
+            grown = np.empty(new_capacity, dtype=values.dtype)
+            grown[:self.size] = values[:self.size]
+            self.columns[name] = grown
+
+    def upsert(self, batch: UserBatch, day_num: int, return_probability: np.ndarray):
+        """Record end-of-day state for every user in the batch"""
+        rows = np.fromiter((self.index.get(d, -1) for d in batch.device_id), dtype=np.int64, count=len(batch))
+        new = np.nonzero(rows < 0)[0]
+        if len(new):
+            self._reserve(len(new))
+            rows[new] = np.arange(self.size, self.size + len(new))
+            self.index.update(zip(batch.device_id[new], rows[new].tolist()))
+            self.size += len(new)
+
+        for name in UserBatch.__dataclass_fields__:
+            self.columns[name][rows] = getattr(batch, name)
+        self.columns['last_seen_day'][rows] = day_num
+        self.columns['return_probability'][rows] = return_probability
+
+    def select_returning(self, day_num: int, threshold: float, limit: int, rng: np.random.Generator) -> np.ndarray:
+        """Rows seen in the last RETURN_WINDOW_DAYS with return probability above threshold"""
+        eligible = np.nonzero(
+            (self.columns['return_probability'][:self.size] > threshold)
+            & (self.columns['last_seen_day'][:self.size] >= day_num - RETURN_WINDOW_DAYS)
+        )[0]
+        if len(eligible) > limit:
+            eligible = np.sort(rng.choice(eligible, size=limit, replace=False))
+        return eligible
+
+    def take(self, rows: np.ndarray) -> UserBatch:
+        return UserBatch(**{name: self.columns[name][rows].copy() for name in UserBatch.__dataclass_fields__})
+
+    # ==========================================
+    # SNAPSHOTS
+    # ==========================================
+
+    def to_arrow(self) -> pa.Table:
+        cols = {name: values[:self.size] for name, values in self.columns.items()}
+        return pa.table({
+            'device_id': id_array(cols['device_id']),
+            'user_id': id_array(cols['user_id']),
+            'email': pa.array(cols['email'], type=pa.string()),
+            'is_identified': pa.array(cols['is_identified']),
+            'is_customer': pa.array(cols['is_customer']),
+            'total_sessions': pa.array(cols['session_count'], type=pa.int64()),
+            'lifecycle_stage': stage_name_array(cols['lifecycle_stage']),
+            'last_event_type': event_name_array(cols['last_event']),
+            'last_seen_day': pa.array(cols['last_seen_day'], type=pa.int32()),
+            'return_probability': pa.array(cols['return_probability'], type=pa.float64()),
+        })
+
+    def snapshot(self, path: str):
+        """Write the current state to Parquet, or to a DuckDB table when path ends in .duckdb"""
+        table = self.to_arrow()
+        if path.endswith('.duckdb'):
+            db = duckdb.connect(path)
+            db.register('user_state_snapshot', table)
+            db.execute("CREATE SCHEMA IF NOT EXISTS events")
+            db.execute("CREATE OR REPLACE TABLE events.user_state AS SELECT * FROM user_state_snapshot")
+            db.close()
+        else:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            pq.write_table(table, path, compression="zstd")
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table) -> 'UserRegistry':
+        registry = cls(capacity=max(INITIAL_CAPACITY, table.num_rows))
+        registry.size = table.num_rows
+        data = table.to_pydict()
+        cols = registry.columns
+        cols['device_id'][:registry.size] = data['device_id']
+        cols['user_id'][:registry.size] = data['user_id']
+        cols['email'][:registry.size] = [e or "" for e in data['email']]
+        cols['is_identified'][:registry.size] = data['is_identified']
+        cols['is_customer'][:registry.size] = data['is_customer']
+        cols['session_count'][:registry.size] = data['total_sessions']
+        cols['lifecycle_stage'][:registry.size] = [STAGE_CODES[s] for s in data['lifecycle_stage']]
+        cols['last_event'][:registry.size] = [EVENT_CODES.get(e, NO_EVENT) for e in data['last_event_type']]
+        cols['last_seen_day'][:registry.size] = data['last_seen_day']
+        cols['return_probability'][:registry.size] = data['return_probability']
+        registry.index = {d: row for row, d in enumerate(data['device_id'])}
+        return registry
+
+    @classmethod
+    def load(cls, path: str) -> 'UserRegistry':
+        if path.endswith('.duckdb'):
+            db = duckdb.connect(path, read_only=True)
+            table = db.sql("SELECT * FROM events.user_state").fetch_arrow_table()
+            db.close()
+        else:
+            table = pq.read_table(path)
+        return cls.from_arrow(table)
+
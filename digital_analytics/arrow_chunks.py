@@ -0,0 +1,279 @@
+"""
+Column builders for generators that yield Arrow tables in chunks
+dlt loads a yielded pyarrow.Table as-is (no per-row normalization), so the
+generators build each chunk as NumPy/Arrow columns. Nested fields stay nested:
+contact lists as list<struct> columns and addresses as struct columns
+"""
+import functools
+import json
+import uuid
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple
+
+import dlt
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+CHUNK_SIZE = 50_000
+
+# Field metadata set by the table_schemas registry: how a nested column is stored
+# (native struct/list when absent, a JSON string, or a <table>__<column> child
+# table), whether it is the table's key and whether it is a partition column
+NESTING = b'nesting'
+JSON = b'json'
+CHILD = b'child'
+PRIMARY_KEY = b'primary_key'
+PARTITION = b'partition'
+TABLE_NAME = b'table'
+
+# ISO timestamp strings yielded in dicts are detected by dlt as UTC timestamps
+TIMESTAMP = pa.timestamp('us', tz='UTC')
+CONTACT = pa.struct([('value', pa.string()), ('primary', pa.bool_()), ('label', pa.string())])
+CONTACT_LIST = pa.list_(CONTACT)
+INT_LIST = pa.list_(pa.int64())
+
+SECONDS = {'days': 86400, 'hours': 3600, 'minutes': 60}
+
+
+def chunk_bounds(n: int, size: int = CHUNK_SIZE) -> Iterator[Tuple[int, int]]:
+    """(start, stop) row ranges covering n rows"""
+    for start in range(0, n, size):
+        yield start, min(start + size, n)
+
+
+# ==========================================
+# TIME COLUMNS
+# ==========================================
+
+def offsets(rng: np.random.Generator, n: int, **ranges: Tuple[int, int]) -> np.ndarray:
+    """Random second offsets, e.g. offsets(rng, n, days=(0, 335), hours=(8, 18)); bounds inclusive like randint"""
+    seconds = np.zeros(n, dtype=np.int64)
+    for unit, (low, high) in ranges.items():
+        seconds += rng.integers(low, high + 1, n) * SECONDS[unit]
+    return seconds
+
+
+def randint(rng: np.random.Generator, low: int, high: int, n: int) -> np.ndarray:
+    """random.randint(low, high) for n rows"""
+    return rng.integers(low, high + 1, n)
+
+
+def _instants(start: datetime, seconds: np.ndarray) -> np.ndarray:
+    return np.datetime64(start, 'us') + np.asarray(seconds, dtype=np.int64).astype('timedelta64[s]')
+
+
+def timestamps(start: datetime, seconds: np.ndarray, null_mask: np.ndarray = None) -> pa.Array:
+    return pa.array(_instants(start, seconds), TIMESTAMP, mask=null_mask)
+
+
+def dates(start: datetime, seconds: np.ndarray, null_mask: np.ndarray = None) -> pa.Array:
+    """'%Y-%m-%d' strings"""
+    return pa.array(np.datetime_as_string(_instants(start, seconds), unit='D'), pa.string(), mask=null_mask)
+
+
+def generated_at(n: int, at: datetime = None) -> pa.Array:
+    """Generation timestamp column; pass `at` to pin it (reproducible output)"""
+    return pa.array(np.full(n, np.datetime64(at or datetime.now(), 'us')), TIMESTAMP)
+
+
+# ==========================================
+# VALUE COLUMNS
+# ==========================================
+
+def column_or(frame, column: str, fallback: Callable[[int], Sequence]) -> np.ndarray:
+    """frame[column] when the input has it, otherwise fallback(n) (the columnar lead.get)"""
+    if column in frame.columns:
+        return frame[column].to_numpy(dtype=object)
+    return np.asarray(fallback(len(frame)), dtype=object)
+
+
+def nullable(values: np.ndarray, null_mask: np.ndarray, type: pa.DataType = pa.int64()) -> pa.Array:
+    return pa.array(values, type, mask=null_mask)
+
+
+def constant(value, n: int, type: pa.DataType) -> pa.Array:
+    return pa.repeat(pa.scalar(value, type), n)
+
+
+def choice(rng: np.random.Generator, options: Sequence, n: int, weights: Sequence[float] = None) -> np.ndarray:
+    """random.choice / random.choices(weights=...) for n rows"""
+    p = None if weights is None else np.asarray(weights, dtype=float) / np.sum(weights)
+    return np.asarray(options, dtype=object)[rng.choice(len(options), n, p=p)]
+
+
+def uuids(rng: np.random.Generator, n: int) -> pa.Array:
+    """Version-4 UUID strings drawn from rng (reproducible, unlike uuid.uuid4)"""
+    raw = rng.integers(0, 256, (n, 16), dtype=np.uint8)
+    raw[:, 6] = raw[:, 6] & 0x0F | 0x40
+    raw[:, 8] = raw[:, 8] & 0x3F | 0x80
+    return pa.array([str(uuid.UUID(bytes=row.tobytes())) for row in raw], pa.string())
+
+
+def pick_lists(mask: np.ndarray, when_true: list, when_false: list, type: pa.DataType = INT_LIST) -> pa.Array:
+    """Per-row choice between two list values (e.g. label_ids) without building Python lists"""
+    return pa.array([when_false, when_true], type).take(pa.array(np.asarray(mask, dtype=np.int8)))
+
+
+def contacts(values: Sequence, label: str = 'work', present: np.ndarray = None) -> pa.Array:
+    """Pipedrive contact lists: [{'value': v, 'primary': True, 'label': label}] per row, or [] where not present"""
+    values = np.asarray(values, dtype=object)
+    present = np.ones(len(values), dtype=bool) if present is None else np.asarray(present, dtype=bool)
+    kept = values[present]
+    items = pa.StructArray.from_arrays(
+        [pa.array(kept, pa.string()), constant(True, len(kept), pa.bool_()), constant(label, len(kept), pa.string())],
+        fields=list(CONTACT),
+    )
+    list_offsets = pa.array(np.concatenate([[0], np.cumsum(present)]), pa.int32())
+    return pa.ListArray.from_arrays(list_offsets, items)
+
+
+def empty_lists(n: int, type: pa.DataType = CONTACT_LIST) -> pa.Array:
+    return pa.ListArray.from_arrays(pa.array(np.zeros(n + 1, dtype=np.int32)), pa.array([], type.value_type))
+
+
+def join(*parts, separator: str = '') -> pa.Array:
+    """Element-wise string concatenation of arrays and scalars"""
+    arrays = [p if isinstance(p, (str, pa.Array)) else pa.array(p, pa.string()) for p in parts]
+    return pc.binary_join_element_wise(*arrays, separator)
+
+
+def struct(**fields) -> pa.Array:
+    return pa.StructArray.from_arrays([pa.array(v, pa.string()) for v in fields.values()], names=list(fields))
+
+
+# ==========================================
+# DICT ROWS -> ARROW
+# ==========================================
+
+def json_field(name: str) -> pa.Field:
+    """String column holding JSON-encoded values (free-form objects with no fixed shape)"""
+    return pa.field(name, pa.string(), metadata={NESTING: JSON})
+
+
+def child_field(name: str, type: pa.DataType) -> pa.Field:
+    """list<struct> column split out into a <table>__<name> child table"""
+    return pa.field(name, type, metadata={NESTING: CHILD})
+
+
+def has_flag(field: pa.Field, key: bytes, value: bytes = b'true') -> bool:
+    return (field.metadata or {}).get(key) == value
+
+
+def primary_key(schema: pa.Schema) -> pa.Field:
+    return next(f for f in schema if has_flag(f, PRIMARY_KEY))
+
+
+def table_name(item: pa.Table) -> str:
+    """Declared table an Arrow item belongs to (dlt table_name hint for resources with child tables)"""
+    return item.schema.metadata[TABLE_NAME].decode()
+
+
+def child_schema(schema: pa.Schema, field: pa.Field) -> pa.Schema:
+    """Child table rows: parent key, position in the list, then the list item fields"""
+    parent = primary_key(schema)
+    name = f"{schema.metadata[TABLE_NAME].decode()}__{field.name}"
+    return pa.schema([
+        pa.field('_parent_id', parent.type, nullable=False),
+        pa.field('_list_idx', pa.int64(), nullable=False),
+        *field.type.value_type,
+    ], metadata={TABLE_NAME: name.encode()})
+
+
+def _parse_timestamps(column: pa.Array, type: pa.DataType) -> pa.Array:
+    try:
+        return column.cast(type)
+    except pa.ArrowInvalid:
+        # no zone offset in the string ('2024-01-15 10:30:00'): parse as naive UTC
+        return column.cast(pa.timestamp(type.unit)).cast(type)
+
+
+def check_required(table: pa.Table, schema: pa.Schema):
+    """Non-nullable columns must not contain nulls (from_pylist does not enforce it)"""
+    missing = [f.name for f in schema if not f.nullable and table.column(f.name).null_count]
+    if missing:
+        raise ValueError(f"null values in non-nullable columns: {missing}")
+
+
+def rows_to_table(rows: List[dict], schema: pa.Schema) -> pa.Table:
+    """Typed table from dict rows; keys missing from a row are null, undeclared keys are an error"""
+    undeclared = set().union(*rows) - set(schema.names)
+    if undeclared:
+        raise ValueError(f"columns not declared in the table schema: {sorted(undeclared)}")
+
+    json_columns = [f.name for f in schema if has_flag(f, NESTING, JSON)]
+    if json_columns:
+        rows = [{**row, **{c: json.dumps(row[c]) for c in json_columns if row.get(c) is not None}} for row in rows]
+
+    # ISO timestamp and date strings travel as strings and are parsed column-wise
+    parsed = {f.name: f.type for f in schema if pa.types.is_timestamp(f.type) or pa.types.is_date(f.type)}
+    wire = pa.schema([pa.field(f.name, pa.string()) if f.name in parsed else f.with_nullable(True) for f in schema])
+    table = pa.Table.from_pylist(rows, schema=wire)
+    for name, type in parsed.items():
+        column = table.column(name)
+        column = _parse_timestamps(column, type) if pa.types.is_timestamp(type) else column.cast(type)
+        table = table.set_column(table.schema.get_field_index(name), name, column)
+    check_required(table, schema)
+    return table.cast(schema)
+
+
+def conform(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """A built table restricted, checked and cast to the declared schema"""
+    table = table.select(schema.names)
+    check_required(table, schema)
+    return table.cast(schema)
+
+
+def split_children(table: pa.Table, schema: pa.Schema) -> Iterator:
+    """The table without its child columns, then one table per child column"""
+    children = [f for f in schema if has_flag(f, NESTING, CHILD)]
+    if not children:
+        yield table
+        return
+    # dlt's Arrow extractor needs the table name both as item meta and from the
+    # resource's (per-item) table_name hint, see table_schemas.resource_hints
+    parent_key = table.column(primary_key(schema).name)
+    parent = table.drop_columns([f.name for f in children])
+    yield dlt.mark.with_table_name(parent, table_name(parent))
+    for field in children:
+        lists = table.column(field.name).combine_chunks()
+        list_offsets = lists.offsets.to_numpy()
+        parents = pc.list_parent_indices(lists).to_numpy()
+        items = pc.list_flatten(lists)
+        child = pa.Table.from_arrays(
+            [parent_key.take(parents), pa.array(np.arange(len(parents)) + list_offsets[0] - list_offsets[parents]),
+             *[items.field(i) for i in range(items.type.num_fields)]],
+            schema=child_schema(schema, field),
+        )
+        yield dlt.mark.with_table_name(child, table_name(child))
+
+
+def arrow_rows(schema: pa.Schema, batch_size: int = CHUNK_SIZE):
+    """Decorator for dlt resource functions: buffers yielded dicts (or lists of dicts)
+    and yields them as pyarrow.Tables of the declared schema; yielded tables are
+    conformed to the schema as they pass through. Goes under @dlt.resource"""
+    def to_tables(rows):
+        yield from split_children(rows_to_table(rows, schema), schema)
+
+    def decorator(func: Callable[..., Iterable]):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows = []
+            for item in func(*args, **kwargs):
+                if isinstance(item, pa.Table):
+                    if rows:
+                        yield from to_tables(rows)
+                        rows = []
+                    yield from split_children(conform(item, schema), schema)
+                    continue
+                if isinstance(item, dict):
+                    rows.append(item)
+                else:
+                    rows.extend(item)
+                if len(rows) >= batch_size:
+                    yield from to_tables(rows)
+                    rows = []
+            if rows:
+                yield from to_tables(rows)
+        return wrapper
+    return decorator
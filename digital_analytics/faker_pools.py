@@ -0,0 +1,127 @@
+"""
+Pre-sampled Faker value pools for high-volume generators
+Each provider (company, street_address, job, ...) is called POOL_SIZE times once
+per (seed, locale), deduplicated and cached as an Arrow IPC file; generators then
+sample pool indices with NumPy instead of calling Faker per row. In combinatorial
+mode names, user names, emails and companies are assembled from first/last name
+and domain pools (Faker's own en_US formats), so millions of distinct values come
+without Faker in the loop
+"""
+import os
+import zlib
+from typing import Dict, List
+
+import numpy as np
+import pyarrow as pa
+
+DEFAULT_SEED = 42
+DEFAULT_LOCALE = 'en_US'
+POOL_SIZE = 20_000
+DRAW_BATCH = 65_536  # values sampled ahead for draw()
+POOL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'faker_pools')
+
+COMPANY_SUFFIXES = ['Inc', 'and Sons', 'LLC', 'Group', 'PLC', 'Ltd']
+FREE_EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com']
+
+
+class FakerPools:
+    """Sampled Faker values for one (seed, locale)"""
+
+    # Providers assembled from smaller pools in combinatorial mode
+    COMBINED = ('name', 'user_name', 'email', 'company')
+
+    def __init__(self, seed: int = DEFAULT_SEED, locale: str = DEFAULT_LOCALE, size: int = POOL_SIZE,
+                 directory: str = POOL_DIR, combinatorial: bool = True, rng: np.random.Generator = None):
+        self.seed = seed
+        self.locale = locale
+        self.size = size
+        self.directory = os.path.join(directory, f"{locale}-seed{seed}-n{size}")
+        self.combinatorial = combinatorial
+        # Pools depend only on (seed, locale); sampling may use a caller's stream (e.g. one per shard)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self._pools: Dict[str, np.ndarray] = {}
+        self._ahead: Dict[str, List[str]] = {}
+
+    # ==========================================
+    # POOLS
+    # ==========================================
+
+    def _build(self, provider: str) -> np.ndarray:
+        from faker import Faker
+        faker = Faker(self.locale)
+        faker.seed_instance(self.seed ^ zlib.crc32(provider.encode()))
+        generate = getattr(faker, provider)
+        values = list(dict.fromkeys(str(generate()) for _ in range(self.size)))
+        return np.array(values, dtype=str)
+
+    def pool(self, provider: str) -> np.ndarray:
+        """Deduplicated values of one Faker provider, built on first use and cached on disk"""
+        if provider not in self._pools:
+            path = os.path.join(self.directory, f"{provider}.arrow")
+            if os.path.exists(path):
+                with pa.memory_map(path) as source:
+                    values = pa.ipc.open_file(source).read_all().column('value')
+                self._pools[provider] = np.array(values.to_pylist(), dtype=str)
+            else:
+                self._pools[provider] = self._build(provider)
+                os.makedirs(self.directory, exist_ok=True)
+                table = pa.table({'value': self._pools[provider]})
+                with pa.OSFile(f"{path}.tmp", 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+                os.replace(f"{path}.tmp", path)
+        return self._pools[provider]
+
+    def _pick(self, provider: str, n: int) -> np.ndarray:
+        values = self.pool(provider)
+        return values[self.rng.integers(0, len(values), n)]
+
+    # ==========================================
+    # COMBINATORIAL VALUES
+    # ==========================================
+
+    def _combined(self, provider: str, n: int) -> np.ndarray:
+        join = lambda *parts: np.char.add(parts[0], parts[1]) if len(parts) == 2 else join(np.char.add(parts[0], parts[1]), *parts[2:])
+        if provider == 'name':
+            return join(self._pick('first_name', n), ' ', self._pick('last_name', n))
+        if provider == 'user_name':
+            first = np.char.lower(self._pick('first_name', n))
+            last = np.char.lower(self._pick('last_name', n))
+            digits = np.char.zfill(self.rng.integers(0, 100, n).astype(str), 2)
+            initial = np.array(list('abcdefghijklmnopqrstuvwxyz'))[self.rng.integers(0, 26, n)]
+            return np.select(
+                [pattern == i for pattern in [self.rng.integers(0, 4, n)] for i in range(3)],
+                [join(last, '.', first), join(first, '.', last), join(first, digits)],
+                default=join(initial, last),
+            )
+        if provider == 'email':
+            domains = np.where(self.rng.random(n) < 0.5,
+                               np.array(FREE_EMAIL_DOMAINS)[self.rng.integers(0, len(FREE_EMAIL_DOMAINS), n)],
+                               self._pick('domain_name', n))
+            return join(self._combined('user_name', n), '@', domains)
+        if provider == 'company':
+            a, b, c = (self._pick('last_name', n) for _ in range(3))
+            suffix = np.array(COMPANY_SUFFIXES)[self.rng.integers(0, len(COMPANY_SUFFIXES), n)]
+            pattern = self.rng.integers(0, 3, n)
+            return np.select(
+                [pattern == 0, pattern == 1],
+                [join(a, ' ', suffix), join(a, '-', b)],
+                default=join(a, ', ', b, ' and ', c),
+            )
+        raise ValueError(f"no combinatorial builder for {provider}")
+
+    # ==========================================
+    # SAMPLING
+    # ==========================================
+
+    def sample(self, provider: str, n: int) -> List[str]:
+        """n values of a provider (with replacement)"""
+        if self.combinatorial and provider in self.COMBINED:
+            return self._combined(provider, n).tolist()
+        return self._pick(provider, n).tolist()
+
+    def draw(self, provider: str) -> str:
+        """One value, served from a batch sampled ahead (for row-at-a-time generators)"""
+        ahead = self._ahead.get(provider)
+        if not ahead:
+            ahead = self._ahead[provider] = self.sample(provider, DRAW_BATCH)[::-1]
+        return ahead.pop()
@@ -1,21 +1,22 @@
 """GA4 Conversions - Date-partitioned"""
 import dlt
 from datetime import datetime, timedelta
-import random, sys, os
-from faker import Faker
+import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from shared_config import *
-
-Faker.seed(SEED)
-random.seed(SEED)
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
 KEY_EVENTS = ['sign_up', 'trial_started', 'purchase', 'demo_requested']
 
-@dlt.resource(write_disposition="append", table_name="conversions_report", parallelized=True)
+@dlt.resource(write_disposition="append", table_name="conversions_report", parallelized=True, **resource_hints('google_analytics', 'conversions_report'))
+@arrow_rows(arrow_schema('google_analytics', 'conversions_report'))
 def conversions_report():
     for day in range(DAYS_OF_DATA):
         current_date = START_DATE + timedelta(days=day)
         daily_metrics = get_daily_metrics(day)
+        rand = random_stream('google_analytics', 'conversions_report', day, seed=SEED)  # one stream per day partition
         daily_records = []
         
         for source in TRAFFIC_SOURCES:
@@ -33,7 +34,7 @@ def conversions_report():
                     'source_medium': f"{source['source']}/{source['medium']}",
                     'key_events': key_events,
                     'total_revenue': revenue,
-                    'total_users': int(key_events * random.uniform(0.8, 1.0)),
+                    'total_users': int(key_events * rand.uniform(0.8, 1.0)),
                 })
         
         if day % 10 == 0:
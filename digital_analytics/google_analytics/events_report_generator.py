@@ -2,22 +2,14 @@
 GA4 Events Report - Date-partitioned
 """
 import dlt
-import polars as pl
 from datetime import datetime, timedelta
-import random
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from shared_config import *
-from faker import Faker
-
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
-
-print("Loading leads with polars...")
-leads_df = pl.read_parquet('gs://mock-source-data/customer_data_population/unified_leads_enriched.parquet')
-print(f"Loaded {len(leads_df)} leads")
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
 EVENTS = [
     {'name': 'page_view', 'is_conversion': False, 'value': 0},
@@ -30,8 +22,10 @@ EVENTS = [
 @dlt.resource(
     write_disposition="append",
     table_name="events_report",
-    parallelized=True
+    parallelized=True,
+    **resource_hints('google_analytics', 'events_report')
 )
+@arrow_rows(arrow_schema('google_analytics', 'events_report'))
 def events_report():
     """Generate daily event aggregates"""
     
@@ -39,6 +33,7 @@ def events_report():
         current_date = START_DATE + timedelta(days=day)
         date_str = current_date.strftime('%Y%m%d')
         daily_metrics = get_daily_metrics(day)
+        rand = random_stream('google_analytics', 'events_report', day, seed=SEED)  # one stream per day partition
         
         daily_records = []
         
@@ -48,15 +43,15 @@ def events_report():
             for event in EVENTS:
                 # Calculate event counts based on user behavior
                 if event['name'] == 'page_view':
-                    event_count = source_users * random.randint(3, 8)
+                    event_count = source_users * rand.randint(3, 8)
                 elif event['name'] == 'sign_up':
                     event_count = int(source_users * 0.15)  # 15% sign up
                 elif event['name'] == 'purchase':
                     event_count = int(source_users * 0.02)  # 2% purchase
                 else:
-                    event_count = int(source_users * random.uniform(0.1, 0.3))
+                    event_count = int(source_users * rand.uniform(0.1, 0.3))
                 
-                total_users = int(event_count / max(1, random.randint(1, 3)))
+                total_users = int(event_count / max(1, rand.randint(1, 3)))
                 
                 daily_records.append({
                     'event_date': date_str,
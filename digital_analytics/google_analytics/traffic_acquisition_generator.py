@@ -2,25 +2,25 @@
 import dlt
 import polars as pl
 from datetime import datetime, timedelta
-import random, sys, os
+import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from shared_config import *
-from faker import Faker
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
-
-@dlt.resource(write_disposition="append", table_name="traffic_acquisition", parallelized=True)
+@dlt.resource(write_disposition="append", table_name="traffic_acquisition", parallelized=True, **resource_hints('google_analytics', 'traffic_acquisition'))
+@arrow_rows(arrow_schema('google_analytics', 'traffic_acquisition'))
 def traffic_acquisition():
     for day in range(DAYS_OF_DATA):
         current_date = START_DATE + timedelta(days=day)
         daily_metrics = get_daily_metrics(day)
+        rand = random_stream('google_analytics', 'traffic_acquisition', day, seed=SEED)  # one stream per day partition
         daily_records = []
         
         for source in TRAFFIC_SOURCES:
             sessions = int(daily_metrics['new_users'] * source['weight'])
-            engaged_sessions = int(sessions * random.uniform(0.4, 0.7))
+            engaged_sessions = int(sessions * rand.uniform(0.4, 0.7))
             
             daily_records.append({
                 'event_date': current_date.strftime('%Y%m%d'),
@@ -30,9 +30,9 @@ def traffic_acquisition():
                 'total_sessions': sessions,
                 'engaged_sessions': engaged_sessions,
                 'engagement_rate': round(engaged_sessions / sessions, 2),
-                'event_count': sessions * random.randint(5, 15),
-                'events_per_session': round(random.uniform(4, 12), 2),
-                'total_users': int(sessions * random.uniform(0.85, 0.95)),
+                'event_count': sessions * rand.randint(5, 15),
+                'events_per_session': round(rand.uniform(4, 12), 2),
+                'total_users': int(sessions * rand.uniform(0.85, 0.95)),
                 'new_users': int(sessions * 0.3),
             })
         
@@ -1,19 +1,20 @@
 """GA4 User Acquisition - Date-partitioned"""
 import dlt
 from datetime import datetime, timedelta
-import random, sys, os
-from faker import Faker
+import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from shared_config import *
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-Faker.seed(SEED)
-random.seed(SEED)
-
-@dlt.resource(write_disposition="append", table_name="user_acquisition", parallelized=True)
+@dlt.resource(write_disposition="append", table_name="user_acquisition", parallelized=True, **resource_hints('google_analytics', 'user_acquisition'))
+@arrow_rows(arrow_schema('google_analytics', 'user_acquisition'))
 def user_acquisition():
     for day in range(DAYS_OF_DATA):
         current_date = START_DATE + timedelta(days=day)
         daily_metrics = get_daily_metrics(day)
+        rand = random_stream('google_analytics', 'user_acquisition', day, seed=SEED)  # one stream per day partition
         daily_records = []
         
         for source in TRAFFIC_SOURCES:
@@ -26,10 +27,10 @@ def user_acquisition():
                 'first_user_medium': source['medium'],
                 'new_users': new_users,
                 'total_users': new_users,
-                'engaged_sessions': int(new_users * random.uniform(0.5, 0.8)),
-                'engagement_rate': round(random.uniform(0.5, 0.8), 2),
-                'event_count': new_users * random.randint(5, 12),
-                'total_revenue': new_users * AVERAGE_TRANSACTION_VALUE * random.uniform(0.01, 0.03),
+                'engaged_sessions': int(new_users * rand.uniform(0.5, 0.8)),
+                'engagement_rate': round(rand.uniform(0.5, 0.8), 2),
+                'event_count': new_users * rand.randint(5, 12),
+                'total_revenue': new_users * AVERAGE_TRANSACTION_VALUE * rand.uniform(0.01, 0.03),
             })
         
         if day % 10 == 0:
@@ -0,0 +1,206 @@
+"""
+Content-addressed local cache for the generators' parquet inputs
+Inputs are fetched once from a backend (the checked-in customer_lead_sources/
+copy, a local directory mirroring the bucket, or GCS itself), converted to Arrow
+IPC and stored under objects/<sha256>.arrow; refs/<name>.json points a logical
+input at its object. Reads memory-map the IPC file, so every generator in a run
+(and every process) shares one page-cached copy, and nothing is loaded until an
+input is first asked for
+"""
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'inputs')
+CHECKED_IN_DIR = os.path.join(REPO_ROOT, 'customer_lead_sources')
+
+# Backend spec: 'default' (checked-in copy, then GCS), 'checked_in', 'gcs' or a
+# local directory laid out like the bucket (<dir>/<bucket>/<key> or <dir>/<file>)
+BACKEND = os.environ.get('MOCK_INPUT_BACKEND', 'default')
+
+INPUTS = {
+    'bookyourdata': 'gs://mock-source-data/customer_data_population/mock_bookyourdata/bookyourdata/1762095548.474671.701ad8b601.parquet',
+    'uplead': 'gs://mock-source-data/customer_data_population/mock_upleads/uplead/1762095612.4264941.2fb362f699.parquet',
+    'unified_leads_enriched': 'gs://mock-source-data/customer_data_population/unified_leads_enriched.parquet',
+}
+PURCHASED_LEAD_INPUTS = ['bookyourdata', 'uplead']
+
+
+# ==========================================
+# BACKENDS
+# ==========================================
+
+class DirectoryBackend:
+    """Inputs from a local directory: <root>/<bucket>/<key>, falling back to <root>/<file name>"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def locate(self, uri: str) -> Optional[str]:
+        bucket_path = uri.split('://', 1)[-1]
+        for path in (os.path.join(self.root, bucket_path), os.path.join(self.root, os.path.basename(bucket_path))):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def fingerprint(self, uri: str) -> Optional[str]:
+        """Cheap change marker (size, mtime) so an edited local file is re-imported"""
+        path = self.locate(uri)
+        if path is None:
+            return None
+        stat = os.stat(path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def read(self, uri: str) -> Optional[pa.Table]:
+        path = self.locate(uri)
+        return pq.read_table(path) if path else None
+
+
+class CheckedInBackend(DirectoryBackend):
+    """The copies committed under customer_lead_sources/"""
+
+    def __init__(self):
+        super().__init__(CHECKED_IN_DIR)
+
+
+class GCSBackend:
+    """The source bucket itself (needs gcsfs); remote objects are treated as immutable"""
+
+    def fingerprint(self, uri: str) -> Optional[str]:
+        return None
+
+    def read(self, uri: str) -> Optional[pa.Table]:
+        import fsspec
+        with fsspec.open(uri, 'rb') as f:
+            return pq.read_table(f)
+
+
+class ChainBackend:
+    """First backend that has the input wins"""
+
+    def __init__(self, *backends):
+        self.backends = backends
+
+    def fingerprint(self, uri: str) -> Optional[str]:
+        for backend in self.backends:
+            fingerprint = backend.fingerprint(uri)
+            if fingerprint is not None:
+                return fingerprint
+        return None
+
+    def read(self, uri: str) -> Optional[pa.Table]:
+        for backend in self.backends:
+            table = backend.read(uri)
+            if table is not None:
+                return table
+        return None
+
+
+def make_backend(spec: str = BACKEND):
+    if spec == 'default':
+        return ChainBackend(CheckedInBackend(), GCSBackend())
+    if spec == 'checked_in':
+        return CheckedInBackend()
+    if spec == 'gcs':
+        return GCSBackend()
+    return DirectoryBackend(spec)
+
+
+# ==========================================
+# CACHE
+# ==========================================
+
+class InputCache:
+    """Lazily imported, memory-mapped generator inputs"""
+
+    def __init__(self, backend=None, directory: str = CACHE_DIR):
+        self.backend = backend if backend is not None else make_backend()
+        self.directory = directory
+        self._tables: Dict[str, pa.Table] = {}
+        self._frames: Dict[Tuple[str, ...], object] = {}
+
+    def _ref_path(self, name: str) -> str:
+        return os.path.join(self.directory, 'refs', f"{name}.json")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, 'objects', f"{digest}.arrow")
+
+    def _resolve(self, name: str) -> Tuple[str, str]:
+        """(object path, sha256) of an input, importing it on a miss or a stale ref"""
+        uri = INPUTS[name]
+        fingerprint = self.backend.fingerprint(uri)
+        ref_path = self._ref_path(name)
+        if os.path.exists(ref_path):
+            with open(ref_path) as f:
+                ref = json.load(f)
+            path = self._object_path(ref['sha256'])
+            if ref['uri'] == uri and ref['fingerprint'] == fingerprint and os.path.exists(path):
+                return path, ref['sha256']
+
+        print(f"Importing input {name} from {uri}...")
+        table = self.backend.read(uri)
+        if table is None:
+            raise FileNotFoundError(f"input {name} ({uri}) not found by backend {type(self.backend).__name__}")
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        buffer = sink.getvalue()
+        digest = hashlib.sha256(buffer).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(buffer)
+            os.replace(f"{path}.tmp", path)
+        os.makedirs(os.path.dirname(ref_path), exist_ok=True)
+        with open(f"{ref_path}.tmp", 'w') as f:
+            json.dump({'uri': uri, 'sha256': digest, 'fingerprint': fingerprint}, f)
+        os.replace(f"{ref_path}.tmp", ref_path)
+        return path, digest
+
+    def table(self, name: str) -> pa.Table:
+        """Arrow table of an input, backed by a memory map of the cached object"""
+        if name not in self._tables:
+            path, _ = self._resolve(name)
+            self._tables[name] = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        return self._tables[name]
+
+    def num_rows(self, name: str) -> int:
+        return self.table(name).num_rows
+
+    def pandas(self, names: List[str]):
+        """Inputs concatenated into one pandas frame (rows in input order)"""
+        import pandas as pd
+        key = tuple(names)
+        if key not in self._frames:
+            self._frames[key] = pd.concat([self.table(name).to_pandas() for name in names], ignore_index=True)
+        return self._frames[key]
+
+
+# Process-wide cache shared by the generators
+_cache: Optional[InputCache] = None
+
+
+def cache() -> InputCache:
+    global _cache
+    if _cache is None:
+        _cache = InputCache()
+    return _cache
+
+
+def purchased_leads():
+    """BookYourData + UpLead leads as one pandas frame"""
+    return cache().pandas(PURCHASED_LEAD_INPUTS)
+
+
+def purchased_leads_count() -> int:
+    return sum(cache().num_rows(name) for name in PURCHASED_LEAD_INPUTS)
+
+
+def unified_leads():
+    return cache().pandas(['unified_leads_enriched'])
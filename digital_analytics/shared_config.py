@@ -3,10 +3,17 @@ Shared configuration for aligned GA4 and Amplitude mock data
 Ensures consistent volumes, conversion rates, and trends across platforms
 """
 from datetime import datetime, timedelta
+import hashlib
+import os
 import random
 
+import numpy as np
+
+from rng_streams import stream
+
+# Root seed of every named random stream (see rng_streams). Importing this module
+# draws no random numbers; helpers below take the caller's stream as `rand`
 SEED = 42
-random.seed(SEED)
 
 # Date ranges - 12 months
 START_DATE = datetime.now() - timedelta(days=365)
@@ -369,49 +376,113 @@ GEO_DISTRIBUTION = [
     {'country': 'Japan', 'weight': 0.04},
 ]
 
-def get_daily_multiplier(day_index):
+# ==========================================
+# DAILY METRICS TABLE
+# ==========================================
+# Every day's metrics are computed once per (seed, parameters), as one NumPy array
+# per metric, persisted as an Arrow IPC file and memoized in-process, so every
+# generator reads the same numbers and yearly totals are a column sum
+METRICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'daily_metrics')
+
+DAILY_METRICS = [
+    'active_users', 'new_users', 'sessions', 'transactions', 'revenue',
+    'lead_users', 'identified_leads', 'paying_leads',
+]
+
+_metrics_tables = {}
+_metrics_rows = {}
+
+
+def get_daily_multiplier(day_index, seed=SEED):
     """Apply seasonality and growth to base metrics"""
-    day_of_week = day_index % 7
-    weekly_factor = 0.7 if day_of_week in [5, 6] else 1.0
-    
-    day_of_month = day_index % 30
-    monthly_factor = 1.2 if day_of_month >= 28 else 1.0
-    
-    quarter = day_index // 90
-    growth_factor = 1.0 + (quarter * 0.05)
+    return daily_multipliers(np.array([day_index]), seed)[0].item()
+
+def daily_multipliers(day, seed=SEED):
+    """Seasonality x growth x noise for an array of day indexes"""
+    weekly_factor = np.where(day % 7 >= 5, 0.7, 1.0)
+    monthly_factor = np.where(day % 30 >= 28, 1.2, 1.0)
+    growth_factor = 1.0 + (day // 90) * 0.05
     
-    random_factor = random.uniform(0.9, 1.1)
+    # Per-day stream: the same day always gets the same factor, whoever asks first
+    random_factor = np.array([stream('shared_config', 'daily_multiplier', d, seed=seed).uniform(0.9, 1.1) for d in day])
     
     return weekly_factor * monthly_factor * growth_factor * random_factor
 
-def get_daily_metrics(day_index):
-    """Get aligned daily metrics for both platforms"""
-    multiplier = get_daily_multiplier(day_index)
+def daily_metrics_columns(day, seed=SEED):
+    """Aligned daily metrics for both platforms for an array of day indexes, one column per metric"""
+    multiplier = daily_multipliers(day, seed)
     
-    return {
-        'active_users': int(BASE_DAILY_ACTIVE_USERS * multiplier),
-        'new_users': int(BASE_DAILY_NEW_USERS * multiplier),
-        'sessions': int(BASE_DAILY_SESSIONS * multiplier),
-        'transactions': int(DAILY_TRANSACTIONS * multiplier),
-        'revenue': round(DAILY_TRANSACTIONS * multiplier * AVERAGE_TRANSACTION_VALUE, 2),
+    columns = {
+        'day': day,
+        'active_users': BASE_DAILY_ACTIVE_USERS * multiplier,
+        'new_users': BASE_DAILY_NEW_USERS * multiplier,
+        'sessions': BASE_DAILY_SESSIONS * multiplier,
+        'transactions': DAILY_TRANSACTIONS * multiplier,
+        'revenue': np.round(DAILY_TRANSACTIONS * multiplier * AVERAGE_TRANSACTION_VALUE, 2),
         
         # Lead-specific metrics
-        'lead_users': int(BASE_DAILY_ACTIVE_USERS * multiplier * LEAD_PERCENTAGE_OF_TRAFFIC),
-        'identified_leads': int(BASE_DAILY_NEW_USERS * multiplier * LEAD_PERCENTAGE_OF_TRAFFIC * LEAD_IDENTIFICATION_RATE),
-        'paying_leads': int(BASE_DAILY_NEW_USERS * multiplier * LEAD_PERCENTAGE_OF_TRAFFIC * LEAD_CONVERSION_RATE),
+        'lead_users': BASE_DAILY_ACTIVE_USERS * multiplier * LEAD_PERCENTAGE_OF_TRAFFIC,
+        'identified_leads': BASE_DAILY_NEW_USERS * multiplier * LEAD_PERCENTAGE_OF_TRAFFIC * LEAD_IDENTIFICATION_RATE,
+        'paying_leads': BASE_DAILY_NEW_USERS * multiplier * LEAD_PERCENTAGE_OF_TRAFFIC * LEAD_CONVERSION_RATE,
     }
+    # Counts truncate like int()
+    return {name: values if name == 'revenue' else values.astype(np.int64) for name, values in columns.items()}
+
+def build_daily_metrics(days=DAYS_OF_DATA, seed=SEED):
+    """Columns of the daily metrics table for days 0..days-1"""
+    return daily_metrics_columns(np.arange(days), seed)
+
+def _metrics_path(days, seed):
+    """Cache file for a table; the name hashes every input, so changing a base rate rebuilds it"""
+    inputs = (days, seed, BASE_DAILY_ACTIVE_USERS, BASE_DAILY_NEW_USERS, BASE_DAILY_SESSIONS,
+              DAILY_TRANSACTIONS, AVERAGE_TRANSACTION_VALUE, LEAD_PERCENTAGE_OF_TRAFFIC,
+              LEAD_IDENTIFICATION_RATE, LEAD_CONVERSION_RATE)
+    digest = hashlib.blake2b(repr(inputs).encode(), digest_size=8).hexdigest()
+    return os.path.join(METRICS_DIR, f"seed{seed}-d{days}-{digest}.arrow")
+
+def daily_metrics_table(days=DAYS_OF_DATA, seed=SEED):
+    """pyarrow Table of every day's metrics, built once per seed and cached on disk"""
+    import pyarrow as pa
+    key = (days, seed)
+    if key not in _metrics_tables:
+        path = _metrics_path(days, seed)
+        if os.path.exists(path):
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+        else:
+            table = pa.table(build_daily_metrics(days, seed))
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            with pa.OSFile(f"{path}.tmp", 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(f"{path}.tmp", path)
+        _metrics_tables[key] = table
+    return _metrics_tables[key]
+
+def get_daily_metrics(day_index, seed=SEED):
+    """Get aligned daily metrics for both platforms (days outside the cached table are computed directly)"""
+    if seed not in _metrics_rows:
+        _metrics_rows[seed] = daily_metrics_table(seed=seed).select(DAILY_METRICS).to_pylist()
+    rows = _metrics_rows[seed]
+    if 0 <= day_index < len(rows):
+        return dict(rows[day_index])
+    columns = daily_metrics_columns(np.array([day_index]), seed)
+    return {name: columns[name][0].item() for name in DAILY_METRICS}
+
+def metric_total(metric, seed=SEED):
+    """Sum of one daily metric over all DAYS_OF_DATA days"""
+    return daily_metrics_table(seed=seed).column(metric).to_numpy().sum().item()
 
-def is_lead_user(source_info):
+def is_lead_user(source_info, rand=random):
     """Determine if user came from lead-heavy channel"""
     if source_info.get('lead_heavy'):
-        return random.random() < (LEAD_PERCENTAGE_OF_TRAFFIC * 2)  # 2x more likely in paid
-    return random.random() < (LEAD_PERCENTAGE_OF_TRAFFIC * 0.3)  # Much less in organic
+        return rand.random() < (LEAD_PERCENTAGE_OF_TRAFFIC * 2)  # 2x more likely in paid
+    return rand.random() < (LEAD_PERCENTAGE_OF_TRAFFIC * 0.3)  # Much less in organic
 
 def get_conversion_rates(is_lead):
     """Get appropriate conversion rates based on user type"""
     return LEAD_CONVERSION_RATES if is_lead else ANONYMOUS_CONVERSION_RATES
 
-def get_campaign_for_traffic(source, medium, is_returning_user):
+def get_campaign_for_traffic(source, medium, is_returning_user, rand=random):
     """Get appropriate campaign based on traffic source and user status"""
     if medium != 'cpc':
         return None
@@ -429,7 +500,7 @@ def get_campaign_for_traffic(source, medium, is_returning_user):
         return None
     
     weights = [c['weight'] for c in available_campaigns]
-    return random.choices(available_campaigns, weights=weights)[0]
+    return rand.choices(available_campaigns, weights=weights)[0]
 
 def get_stripe_product_by_sku(sku):
     """Get product details by SKU"""
@@ -438,28 +509,28 @@ def get_stripe_product_by_sku(sku):
             return product
     return None
 
-def select_product_tier(conversion_path=None):
+def select_product_tier(conversion_path=None, rand=random):
     """Select a product tier based on conversion path"""
     if conversion_path and conversion_path in TRIAL_CONVERSION_PATHS:
         tier_dist = TRIAL_CONVERSION_PATHS[conversion_path]['tier_distribution']
         tier_names = list(tier_dist.keys())
         tier_weights = list(tier_dist.values())
-        selected_tier = random.choices(tier_names, weights=tier_weights)[0]
+        selected_tier = rand.choices(tier_names, weights=tier_weights)[0]
     else:
         # Default distribution from product weights
         tier_weights = [p['tier_weight'] for p in STRIPE_PRODUCTS]
-        selected_tier = random.choices(STRIPE_PRODUCTS, weights=tier_weights)[0]['sku'].lower()
+        selected_tier = rand.choices(STRIPE_PRODUCTS, weights=tier_weights)[0]['sku'].lower()
     
     return get_stripe_product_by_sku(selected_tier.upper())
 
-def select_form_type():
+def select_form_type(rand=random):
     """Select a form type based on distribution weights"""
     form_names = list(FORM_TYPES.keys())
     form_weights = [FORM_TYPES[f]['distribution_weight'] for f in form_names]
-    return random.choices(form_names, weights=form_weights)[0]
+    return rand.choices(form_names, weights=form_weights)[0]
 
-def get_trial_path():
+def get_trial_path(rand=random):
     """Determine if trial is self-service or sales-assisted"""
     paths = list(TRIAL_CONVERSION_PATHS.keys())
     weights = [TRIAL_CONVERSION_PATHS[p]['weight'] for p in paths]
-    return random.choices(paths, weights=weights)[0]
+    return rand.choices(paths, weights=weights)[0]
@@ -0,0 +1,134 @@
+"""
+Stripe-style object IDs (prefix + random base62 body) minted in NumPy batches
+Each generator mints through its own namespace (e.g. id_factory('stripe',
+'subscriptions'), named like rng_streams), and each (prefix, length, alphabet)
+format draws from its own generator seeded from (seed, namespace, shard, format),
+so two generators using the same format never mint the same sequence and adding
+a new ID type never shifts the others. IDs are unique within a namespace
+(duplicates are redrawn) and across the processes of a sharded run: the leading
+character(s) of the body encode the shard index
+"""
+import math
+import zlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+DEFAULT_SEED = 42
+MERGE_EVERY = 65536  # recently issued keys held in a set before merging into the sorted array
+
+BASE62 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+LOWER36 = 'abcdefghijklmnopqrstuvwxyz0123456789'
+UPPER36 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+UPPER26 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+class IdFactory:
+    """Batches of unique prefixed IDs for one shard of a run"""
+
+    def __init__(self, seed: int = DEFAULT_SEED, shard: int = 0, num_shards: int = 1, namespace: Tuple[str, ...] = ()):
+        if not 0 <= shard < num_shards:
+            raise ValueError(f"shard {shard} outside 0..{num_shards - 1}")
+        self.seed = seed
+        self.namespace = namespace
+        self.shard = shard
+        self.num_shards = num_shards
+        self._streams: Dict[Tuple[str, int, str], np.random.Generator] = {}
+        self._issued: Dict[Tuple[str, int, str], np.ndarray] = {}
+        self._recent: Dict[Tuple[str, int, str], set] = {}
+
+    def _stream(self, fmt: Tuple[str, int, str]) -> np.random.Generator:
+        if fmt not in self._streams:
+            caller = zlib.crc32('/'.join(map(str, self.namespace)).encode())
+            key = zlib.crc32('|'.join(map(str, fmt)).encode())
+            self._streams[fmt] = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(caller, self.shard, key)))
+            self._issued[fmt] = np.empty(0, dtype=np.uint64)
+            self._recent[fmt] = set()
+        return self._streams[fmt]
+
+    def _seen(self, fmt: Tuple[str, int, str], keys: np.ndarray) -> np.ndarray:
+        issued, recent = self._issued[fmt], self._recent[fmt]
+        seen = np.zeros(len(keys), dtype=bool)
+        if len(issued):
+            pos = np.minimum(np.searchsorted(issued, keys), len(issued) - 1)
+            seen = issued[pos] == keys
+        if recent:
+            seen |= np.fromiter((k in recent for k in keys.tolist()), dtype=bool, count=len(keys))
+        return seen
+
+    def _record(self, fmt: Tuple[str, int, str], keys: np.ndarray):
+        if len(keys) < MERGE_EVERY:
+            self._recent[fmt].update(keys.tolist())
+        if len(keys) >= MERGE_EVERY or len(self._recent[fmt]) >= MERGE_EVERY:
+            recent = np.fromiter(self._recent[fmt], dtype=np.uint64, count=len(self._recent[fmt]))
+            self._issued[fmt] = np.union1d(self._issued[fmt], np.concatenate([keys, recent]))
+            self._recent[fmt] = set()
+
+    def _shard_digits(self, base: int, length: int) -> np.ndarray:
+        """The shard index as fixed-width base-`base` digits (none for unsharded runs)"""
+        width = math.ceil(math.log(self.num_shards, base)) if self.num_shards > 1 else 0
+        if width >= length:
+            raise ValueError(f"{self.num_shards} shards do not fit in a {length}-character id")
+        return np.array([self.shard // base ** i % base for i in reversed(range(width))], dtype=np.uint8)
+
+    def batch(self, prefix: str, n: int, length: int = 14, alphabet: str = BASE62) -> List[str]:
+        """n unique ids: `prefix` + `length` characters from `alphabet`"""
+        if n == 0:
+            return []
+        fmt = (prefix, length, alphabet)
+        rng = self._stream(fmt)
+        base = len(alphabet)
+        head = self._shard_digits(base, length)
+        # Uniqueness is tracked on the leading digits that fit in 63 bits: a clash
+        # there only costs a redraw of an id that might have been distinct
+        key_width = min(length, int(63 / math.log2(base)))
+        weights = np.array([base ** i for i in reversed(range(key_width))], dtype=np.uint64)
+        if len(self._issued[fmt]) + len(self._recent[fmt]) + n > base ** (key_width - len(head)):
+            raise ValueError(f"{prefix} ids of length {length} are exhausted for this shard")
+
+        digits = np.empty((n, length), dtype=np.uint8)
+        digits[:, :len(head)] = head
+        pending = np.arange(n)
+        while len(pending):
+            digits[pending, len(head):] = rng.integers(0, base, (len(pending), length - len(head)), dtype=np.uint8)
+            keys = digits[:, :key_width].astype(np.uint64) @ weights
+            _, first = np.unique(keys, return_index=True)
+            fresh = np.zeros(n, dtype=bool)
+            fresh[first] = True
+            fresh &= ~self._seen(fmt, keys)
+            pending = np.flatnonzero(~fresh)
+        self._record(fmt, keys)
+
+        chars = np.frombuffer(alphabet.encode(), dtype=np.uint8)[digits]
+        return np.char.add(prefix, chars.view(f'S{length}').ravel().astype(str)).tolist()
+
+    def one(self, prefix: str, length: int = 14, alphabet: str = BASE62) -> str:
+        return self.batch(prefix, 1, length, alphabet)[0]
+
+
+# Process-wide factories, one per namespace
+_config = (DEFAULT_SEED, 0, 1)
+_factories: Dict[Tuple[str, ...], IdFactory] = {}
+
+
+def configure(seed: int = DEFAULT_SEED, shard: int = 0, num_shards: int = 1):
+    """Reset the process-wide factories (call once per shard process)"""
+    global _config
+    _config = (seed, shard, num_shards)
+    _factories.clear()
+
+
+def id_factory(*names: str) -> IdFactory:
+    """The process-wide factory of one caller, e.g. id_factory('stripe', 'subscriptions')"""
+    if names not in _factories:
+        _factories[names] = IdFactory(*_config, namespace=names)
+    return _factories[names]
+
+
+def new_ids(prefix: str, n: int, length: int = 14, alphabet: str = BASE62) -> List[str]:
+    """Ids from the shared default namespace; generators should mint through id_factory"""
+    return id_factory().batch(prefix, n, length, alphabet)
+
+
+def new_id(prefix: str, length: int = 14, alphabet: str = BASE62) -> str:
+    return id_factory().one(prefix, length, alphabet)
@@ -0,0 +1,578 @@
+"""
+Schema registry for every generated table
+Each table is declared once as an Arrow schema that also carries its dlt hints:
+column types, nullability (key columns are non-nullable), the nesting strategy
+of nested columns and partition columns. Nested columns are stored natively as
+struct/list columns by default; free-form objects with no fixed shape (Facebook
+targeting specs, empty Stripe sub-objects, ...) are JSON strings (json_field)
+and list<struct> columns that are better queried as rows become a
+<table>__<column> child table (child_field).
+
+Generators yield through arrow_chunks.arrow_rows(arrow_schema(...)), so every
+chunk reaches dlt as a typed pyarrow.Table, and their @dlt.resource takes
+**resource_hints(...): the column hints derived from the same schema plus a
+frozen column/data type contract, so normalize infers nothing and a generator
+change that drifts from the declaration fails instead of evolving the schema
+"""
+import base64
+import copy
+import gzip
+from typing import Dict
+
+import pyarrow as pa
+from dlt.common.libs.pyarrow import py_arrow_to_table_schema_columns
+
+from arrow_chunks import (TIMESTAMP, CONTACT_LIST, INT_LIST, NESTING, JSON, CHILD, PRIMARY_KEY, PARTITION,
+                          TABLE_NAME, json_field, child_field, has_flag, child_schema, table_name)
+
+STR = pa.string()
+INT = pa.int64()
+FLOAT = pa.float64()
+BOOL = pa.bool_()
+DATE = pa.date32()
+STR_LIST = pa.list_(STR)
+
+# Declared tables may gain new tables (child tables), never undeclared columns or new types
+SCHEMA_CONTRACT = {'tables': 'evolve', 'columns': 'freeze', 'data_type': 'freeze'}
+
+
+def struct(*specs):
+    return pa.struct([spec if isinstance(spec, pa.Field) else pa.field(*spec) for spec in specs])
+
+
+def table(name: str, *specs, key: str = None, required=(), partition: str = None) -> pa.Schema:
+    """Declared table from (name, type) pairs and ready-made fields; the key and
+    required columns are non-nullable, partition marks the partition column"""
+    fields = []
+    for spec in specs:
+        field = spec if isinstance(spec, pa.Field) else pa.field(*spec)
+        metadata = dict(field.metadata or {})
+        if field.name == key:
+            metadata[PRIMARY_KEY] = b'true'
+        if field.name == partition:
+            metadata[PARTITION] = b'true'
+        nullable = field.name != key and field.name not in required
+        fields.append(pa.field(field.name, field.type, nullable, metadata or None))
+    schema = pa.schema(fields, metadata={TABLE_NAME: name.encode()})
+    undeclared = {key, partition, *required} - {None, *schema.names}
+    if undeclared:
+        raise ValueError(f"{name}: hinted columns not declared: {sorted(undeclared)}")
+    return schema
+
+
+def name_of(schema: pa.Schema) -> str:
+    return schema.metadata[TABLE_NAME].decode()
+
+
+def registry(*schemas) -> Dict[str, pa.Schema]:
+    return {name_of(schema): schema for schema in schemas}
+
+
+# ==========================================
+# FACEBOOK ADS
+# ==========================================
+
+# insights action breakdowns: [{'action_type': ..., 'value': '...'}]
+ACTION_LIST = pa.list_(struct(('action_type', STR), ('value', STR)))
+
+FACEBOOK_ADS = registry(
+    table(
+        'ad_account',
+        ('account_id', STR), ('id', STR), ('account_status', INT), ('age', INT), ('name', STR),
+        ('amount_spent', STR), ('balance', STR), ('spend_cap', STR), ('currency', STR),
+        ('business', struct(('id', STR), ('name', STR))),
+        ('business_name', STR), ('business_city', STR), ('business_state', STR), ('business_country_code', STR),
+        ('business_street', STR), ('business_street2', STR), ('business_zip', STR),
+        ('can_create_brand_lift_study', BOOL), ('capabilities', STR_LIST),
+        ('is_direct_deals_enabled', BOOL), ('is_notifications_enabled', BOOL), ('is_personal', INT),
+        ('is_prepay_account', BOOL), ('is_tax_id_required', BOOL), ('is_attribution_spec_system_default', BOOL),
+        ('is_in_3ds_authorization_enabled_market', BOOL),
+        ('created_time', TIMESTAMP), ('has_migrated_permissions', BOOL), ('offsite_pixels_tos_accepted', BOOL),
+        ('owner', INT), ('fb_entity', INT), ('funding_source', INT),
+        ('partner', STR), ('media_agency', STR), ('end_advertiser', STR), ('end_advertiser_name', STR),
+        ('funding_source_details', struct(('display_string', STR), ('id', STR), ('type', INT))),
+        ('extended_credit_invoice_group', STR),
+        json_field('rf_spec'),
+        ('tos_accepted', struct(('mobile', INT), ('web', INT))),
+        ('user_tos_accepted', struct(('mobile', INT), ('web', INT))),
+        ('min_campaign_group_spend_cap', INT), ('min_daily_budget', INT), ('disable_reason', INT),
+        json_field('failed_delivery_checks'), json_field('user_tasks'),
+        ('tax_id', STR), ('tax_id_status', STR), ('tax_id_type', STR),
+        ('timezone_id', INT), ('timezone_name', STR), ('timezone_offset_hours_utc', INT),
+        ('io_number', STR), json_field('line_numbers'),
+        ('_generated_at', TIMESTAMP),
+        key='id', required=('account_id', '_generated_at'),
+    ),
+    table(
+        'ad_creatives',
+        ('id', STR), ('account_id', STR), ('name', STR), ('title', STR), ('body', STR), ('status', STR),
+        ('object_type', STR), ('image_url', STR), ('image_hash', STR), ('thumbnail_url', STR),
+        ('thumbnail_data_url', STR), ('video_id', STR), ('link_url', STR), ('object_url', STR),
+        ('template_url', STR), ('url_tags', STR), ('call_to_action_type', STR), ('object_id', STR),
+        ('object_story_id', STR), ('effective_object_story_id', STR), ('link_og_id', STR), ('actor_id', STR),
+        ('instagram_actor_id', STR), ('instagram_story_id', STR), ('effective_instagram_story_id', STR),
+        ('instagram_permalink_url', STR), ('source_instagram_media_id', STR),
+        ('object_story_spec', struct(
+            ('link_data', struct(
+                ('call_to_action', struct(('type', STR), ('value', struct(('link', STR))))),
+                ('link', STR), ('message', STR), ('name', STR),
+            )),
+            ('page_id', STR),
+        )),
+        json_field('asset_feed_spec'), json_field('template_url_spec'), json_field('image_crops'),
+        ('applink_treatment', STR), ('product_set_id', STR), json_field('adlabels'),
+        ('_generated_at', TIMESTAMP),
+        key='id', required=('account_id', '_generated_at'),
+    ),
+    table(
+        'ad_sets',
+        ('id', STR), ('account_id', STR), ('campaign_id', STR), ('name', STR), ('effective_status', STR),
+        ('daily_budget', FLOAT), ('lifetime_budget', FLOAT), ('budget_remaining', FLOAT),
+        ('bid_strategy', STR), ('bid_amount', FLOAT), json_field('bid_info'), json_field('bid_constraints'),
+        ('created_time', TIMESTAMP), ('updated_time', TIMESTAMP), ('start_time', TIMESTAMP), ('end_time', TIMESTAMP),
+        json_field('promoted_object'), json_field('targeting'), json_field('adlabels'),
+        ('_generated_at', TIMESTAMP),
+        key='id', required=('account_id', 'campaign_id', '_generated_at'),
+    ),
+    table(
+        'ads',
+        ('id', STR), ('account_id', STR), ('campaign_id', STR), ('adset_id', STR), ('name', STR),
+        ('status', STR), ('effective_status', STR), ('bid_type', STR), ('bid_amount', INT), json_field('bid_info'),
+        ('creative', struct(('id', STR), ('name', STR), ('object_type', STR))),
+        json_field('targeting'), ('created_time', TIMESTAMP), ('updated_time', TIMESTAMP),
+        json_field('tracking_specs'), json_field('conversion_specs'), json_field('adlabels'),
+        json_field('recommendations'), ('source_ad_id', STR), ('last_updated_by_app_id', STR),
+        ('_generated_at', TIMESTAMP),
+        key='id', required=('account_id', 'campaign_id', 'adset_id', '_generated_at'),
+    ),
+    table(
+        'ads_insights',
+        ('account_id', STR), ('account_name', STR), ('account_currency', STR),
+        ('campaign_id', STR), ('campaign_name', STR), ('adset_id', STR), ('adset_name', STR),
+        ('ad_id', STR), ('ad_name', STR), ('date_start', DATE), ('date_stop', DATE),
+        ('created_time', TIMESTAMP), ('updated_time', TIMESTAMP),
+        ('objective', STR), ('optimization_goal', STR), ('buying_type', STR), ('attribution_setting', STR),
+        ('impressions', INT), ('reach', INT), ('frequency', FLOAT), ('clicks', INT), ('unique_clicks', INT),
+        ('spend', FLOAT), ('social_spend', FLOAT), ('inline_link_clicks', INT), ('unique_inline_link_clicks', INT),
+        ('inline_link_click_ctr', FLOAT), ('unique_inline_link_click_ctr', FLOAT), ('inline_post_engagement', INT),
+        ('cpc', FLOAT), ('cpm', FLOAT), ('cpp', FLOAT), ('ctr', FLOAT), ('unique_ctr', FLOAT),
+        ('cost_per_inline_link_click', FLOAT), ('cost_per_unique_click', FLOAT),
+        ('cost_per_unique_inline_link_click', FLOAT), ('cost_per_inline_post_engagement', FLOAT),
+        ('actions', ACTION_LIST), ('action_values', ACTION_LIST), ('unique_actions', ACTION_LIST),
+        ('conversions', ACTION_LIST), ('conversion_values', ACTION_LIST), ('cost_per_conversion', ACTION_LIST),
+        ('cost_per_action_type', ACTION_LIST), ('outbound_clicks', ACTION_LIST),
+        ('unique_outbound_clicks', ACTION_LIST), ('cost_per_outbound_click', ACTION_LIST),
+        ('outbound_clicks_ctr', ACTION_LIST), ('unique_outbound_clicks_ctr', ACTION_LIST),
+        ('purchase_roas', ACTION_LIST), ('website_purchase_roas', ACTION_LIST),
+        ('video_play_actions', ACTION_LIST), ('video_30_sec_watched_actions', ACTION_LIST),
+        ('video_p25_watched_actions', ACTION_LIST), ('video_p50_watched_actions', ACTION_LIST),
+        ('video_p75_watched_actions', ACTION_LIST), ('video_p100_watched_actions', ACTION_LIST),
+        ('quality_ranking', STR), ('engagement_rate_ranking', STR), ('conversion_rate_ranking', STR),
+        ('auction_bid', FLOAT), ('auction_competitiveness', FLOAT), ('auction_max_competitor_bid', FLOAT),
+        ('estimated_ad_recallers', INT), ('cost_per_estimated_ad_recallers', FLOAT),
+        ('full_view_impressions', INT), ('full_view_reach', INT),
+        ('canvas_avg_view_percent', FLOAT), ('canvas_avg_view_time', FLOAT),
+        ('instant_experience_clicks_to_open', INT), ('instant_experience_clicks_to_start', INT),
+        ('_generated_at', TIMESTAMP),
+        required=('account_id', 'campaign_id', 'adset_id', 'ad_id', 'date_start', 'date_stop', '_generated_at'),
+        partition='date_start',
+    ),
+    table(
+        'campaigns',
+        ('id', STR), ('account_id', STR), ('name', STR), ('objective', STR), ('buying_type', STR),
+        ('bid_strategy', STR), ('daily_budget', FLOAT), ('lifetime_budget', FLOAT), ('spend_cap', FLOAT),
+        ('budget_remaining', FLOAT), ('budget_rebalance_flag', BOOL), ('status', STR), ('configured_status', STR),
+        ('effective_status', STR), ('created_time', TIMESTAMP), ('updated_time', TIMESTAMP),
+        ('start_time', TIMESTAMP), ('stop_time', TIMESTAMP), ('special_ad_category', STR),
+        ('special_ad_category_country', STR_LIST), json_field('adlabels'), json_field('issues_info'),
+        ('boosted_object_id', STR), ('source_campaign_id', STR), ('smart_promotion_type', STR),
+        ('_generated_at', TIMESTAMP), ('_campaign_type', STR), ('_targeting', STR),
+        key='id', required=('account_id', '_generated_at'),
+    ),
+    table(
+        'custom_conversions',
+        ('id', STR), ('account_id', STR), ('business', STR), ('name', STR), ('description', STR),
+        ('custom_event_type', STR), ('rule', STR), ('default_conversion_value', FLOAT), ('event_source_type', STR),
+        ('data_sources', pa.list_(struct(('id', STR), ('source_type', STR)))),
+        ('creation_time', TIMESTAMP), ('first_fired_time', TIMESTAMP), ('last_fired_time', TIMESTAMP),
+        ('is_archived', BOOL), ('is_unavailable', BOOL), ('retention_days', INT),
+        ('offline_conversion_data_set', STR), ('_generated_at', TIMESTAMP),
+        key='id', required=('account_id', '_generated_at'),
+    ),
+)
+
+
+# ==========================================
+# GOOGLE ADS
+# ==========================================
+
+GOOGLE_ADS = registry(
+    table(
+        'customer',
+        ('customer_id', INT), ('resource_name', STR), ('descriptive_name', STR), ('currency_code', STR),
+        ('time_zone', STR), ('auto_tagging_enabled', BOOL), ('test_account', BOOL), ('manager', BOOL),
+        ('status', STR), ('tracking_url_template', STR), ('final_url_suffix', STR),
+        ('conversion_tracking_setting_conversion_tracking_id', INT),
+        ('conversion_tracking_setting_conversion_tracking_status', STR),
+        ('conversion_tracking_setting_enhanced_conversions_for_leads_enabled', BOOL),
+        ('conversion_tracking_setting_google_ads_conversion_customer', STR),
+        ('call_reporting_setting_call_reporting_enabled', BOOL),
+        ('call_reporting_setting_call_conversion_reporting_enabled', BOOL),
+        ('call_reporting_setting_call_conversion_action', STR),
+        ('remarketing_setting_google_global_site_tag', STR),
+        ('optimization_score', FLOAT), ('optimization_score_weight', FLOAT),
+        ('customer_agreement_setting_accepted_lead_form_terms', BOOL), ('has_partners_badge', BOOL),
+        ('pay_per_conversion_eligibility_failure_reasons', STR_LIST),
+        ('image_asset_auto_migration_done', BOOL), ('image_asset_auto_migration_done_date_time', TIMESTAMP),
+        ('location_asset_auto_migration_done', BOOL), ('location_asset_auto_migration_done_date_time', TIMESTAMP),
+        ('video_brand_safety_suitability', STR), ('_generated_at', TIMESTAMP),
+        key='customer_id', required=('resource_name', '_generated_at'),
+    ),
+    table(
+        'campaigns',
+        ('customer_id', INT), ('campaign_id', INT), ('campaign_name', STR), ('resource_name', STR),
+        ('campaign_status', STR), ('serving_status', STR), ('ad_serving_optimization_status', STR),
+        ('advertising_channel_type', STR), ('advertising_channel_sub_type', STR), ('campaign_budget', STR),
+        ('bidding_strategy_type', STR), ('target_cpa_target_cpa_micros', INT),
+        ('target_cpa_cpc_bid_ceiling_micros', INT), ('target_cpa_cpc_bid_floor_micros', INT),
+        ('start_date', STR), ('end_date', STR),
+        ('network_settings_target_google_search', BOOL), ('network_settings_target_search_network', BOOL),
+        ('network_settings_target_content_network', BOOL), ('network_settings_target_partner_search_network', BOOL),
+        ('tracking_url_template', STR), ('final_url_suffix', STR), ('optimization_score', FLOAT),
+        ('experiment_type', STR), ('base_campaign', STR),
+        ('_generated_at', TIMESTAMP), ('_campaign_type', STR), ('_targeting', STR),
+        key='campaign_id', required=('customer_id', 'resource_name', '_generated_at'),
+    ),
+    table(
+        'ad_group',
+        ('customer_id', INT), ('ad_group_id', INT), ('campaign_id', INT), ('ad_group_name', STR),
+        ('resource_name', STR), ('campaign', STR), ('status', STR), ('type', STR), ('ad_rotation_mode', STR),
+        ('cpc_bid_micros', INT), ('target_cpa_micros', INT), ('effective_target_cpa_micros', INT),
+        ('optimized_targeting_enabled', BOOL), ('_generated_at', TIMESTAMP),
+        key='ad_group_id', required=('customer_id', 'campaign_id', 'resource_name', '_generated_at'),
+    ),
+    table(
+        'ad_group_ad',
+        ('customer_id', INT), ('ad_group_id', INT), ('ad_id', INT), ('resource_name', STR), ('ad_group', STR),
+        ('ad_resource_name', STR), ('status', STR), ('ad_type', STR), ('ad_strength', STR),
+        ('headlines', STR_LIST), ('descriptions', STR_LIST), ('final_urls', STR_LIST),
+        ('policy_summary_approval_status', STR), ('_generated_at', TIMESTAMP),
+        key='resource_name', required=('customer_id', 'ad_group_id', 'ad_id', '_generated_at'),
+    ),
+    table(
+        'ad_group_criterion',
+        ('customer_id', INT), ('ad_group_id', INT), ('criterion_id', INT), ('resource_name', STR),
+        ('ad_group', STR), ('type', STR), ('status', STR), ('negative', BOOL), ('keyword_text', STR),
+        ('keyword_match_type', STR), ('cpc_bid_micros', INT), ('effective_cpc_bid_micros', INT),
+        ('quality_info_quality_score', INT), ('approval_status', STR), ('_generated_at', TIMESTAMP),
+        key='resource_name', required=('customer_id', 'ad_group_id', 'criterion_id', '_generated_at'),
+    ),
+    table(
+        'campaign_criterion',
+        ('customer_id', INT), ('campaign_id', INT), ('criterion_id', INT), ('campaign', STR),
+        ('resource_name', STR), ('type', STR), ('status', STR), ('negative', BOOL), ('bid_modifier', FLOAT),
+        ('location_geo_target_constant', STR), ('display_name', STR), ('device_type', STR),
+        ('_generated_at', TIMESTAMP),
+        key='resource_name', required=('customer_id', 'campaign_id', 'criterion_id', '_generated_at'),
+    ),
+    table(
+        'click_view',
+        ('gclid', STR), ('resource_name', STR), ('ad_group_ad', STR), ('campaign_location_target', STR),
+        ('keyword', STR), ('user_list', STR), ('keyword_text', STR), ('keyword_match_type', STR),
+        ('page_number', INT), ('area_of_interest_city', STR), ('area_of_interest_country', STR),
+        ('area_of_interest_metro', STR), ('area_of_interest_region', STR), ('area_of_interest_most_specific', STR),
+        ('location_city', STR), ('location_country', STR), ('location_metro', STR), ('location_region', STR),
+        ('location_most_specific', STR), ('date', DATE), ('ad_network_type', STR), ('click_type', STR),
+        ('device', STR), ('month_of_year', STR), ('slot', STR), ('clicks', INT), ('_extracted_at', TIMESTAMP),
+        key='gclid', required=('resource_name', 'date', '_extracted_at'), partition='date',
+    ),
+)
+
+
+# ==========================================
+# STRIPE
+# ==========================================
+
+# Stripe metadata is a free-form string -> string map
+METADATA = pa.map_(STR, STR)
+
+PLAN = struct(
+    ('id', STR), ('object', STR), ('active', BOOL), ('amount', INT), ('amount_decimal', STR),
+    ('billing_scheme', STR), ('created', INT), ('currency', STR), ('interval', STR), ('interval_count', INT),
+    ('livemode', BOOL), ('metadata', METADATA), ('nickname', STR), ('product', STR), ('tiers_mode', STR),
+    ('transform_usage', STR), ('trial_period_days', INT), ('usage_type', STR),
+)
+
+STRIPE = registry(
+    table(
+        'customers',
+        ('id', STR), ('object', STR),
+        ('address', struct(('city', STR), ('country', STR), ('line1', STR), ('postal_code', STR), ('state', STR))),
+        ('balance', INT), ('created', INT), ('currency', STR), ('default_source', STR), ('delinquent', BOOL),
+        ('description', STR), ('email', STR), ('invoice_prefix', STR),
+        ('invoice_settings', struct(
+            ('custom_fields', pa.list_(struct(('name', STR), ('value', STR)))),
+            ('default_payment_method', STR), ('footer', STR), ('rendering_options', STR),
+        )),
+        ('livemode', BOOL), ('metadata', METADATA), ('name', STR), ('next_invoice_sequence', INT),
+        ('phone', STR), ('preferred_locales', STR_LIST), json_field('shipping'), ('tax_exempt', STR),
+        ('test_clock', STR), ('_generated_at', TIMESTAMP), ('_source', STR),
+        key='id', required=('_generated_at', '_source'),
+    ),
+    table('plans', *PLAN, ('_generated_at', TIMESTAMP), key='id', required=('product', '_generated_at')),
+    table(
+        'products',
+        ('id', STR), ('object', STR), ('active', BOOL), ('created', INT), ('default_price', STR),
+        ('description', STR), ('images', STR_LIST), json_field('marketing_features'), ('livemode', BOOL),
+        ('metadata', METADATA), ('name', STR), json_field('package_dimensions'), ('shippable', BOOL),
+        ('statement_descriptor', STR), ('tax_code', STR), ('unit_label', STR), ('updated', INT), ('url', STR),
+        ('_generated_at', TIMESTAMP),
+        key='id', required=('name', '_generated_at'),
+    ),
+    table(
+        'subscriptions',
+        ('id', STR), ('object', STR), ('application', STR), ('application_fee_percent', FLOAT),
+        ('automatic_tax', struct(('enabled', BOOL), ('liability', STR))),
+        ('billing_cycle_anchor', INT), json_field('billing_cycle_anchor_config'), ('billing_mode', STR),
+        json_field('billing_thresholds'), ('cancel_at', INT), ('cancel_at_period_end', BOOL), ('canceled_at', INT),
+        ('cancellation_details', struct(('comment', STR), ('feedback', STR), ('reason', STR))),
+        ('collection_method', STR), ('created', INT), ('currency', STR), ('customer', STR),
+        ('days_until_due', INT), ('default_payment_method', STR), ('default_source', STR),
+        json_field('default_tax_rates'), ('description', STR), json_field('discounts'), ('ended_at', INT),
+        ('invoice_settings', struct(('issuer', struct(('type', STR))))),
+        ('items', struct(
+            ('data', pa.list_(struct(
+                ('created', INT), ('id', STR), ('metadata', METADATA), ('object', STR), ('plan', PLAN),
+                ('quantity', INT),
+            ))),
+            ('has_more', BOOL), ('object', STR), ('total_count', INT),
+        )),
+        ('latest_invoice', STR), ('livemode', BOOL),
+        ('metadata', struct(('conversion_day', INT), ('product_sku', STR), ('trial_path', STR))),
+        ('next_pending_invoice_item_invoice', INT), ('on_behalf_of', STR), json_field('pause_collection'),
+        ('payment_settings', struct(
+            ('payment_method_options', STR), ('payment_method_types', STR_LIST),
+            ('save_default_payment_method', STR),
+        )),
+        json_field('pending_invoice_item_interval'), ('pending_setup_intent', STR), json_field('pending_update'),
+        ('schedule', STR), ('start_date', INT), ('status', STR), ('test_clock', STR), json_field('transfer_data'),
+        ('trial_end', INT),
+        ('trial_settings', struct(('end_behavior', struct(('missing_payment_method', STR))))),
+        ('trial_start', INT), ('current_period_start', INT), ('current_period_end', INT),
+        ('_generated_at', TIMESTAMP), ('_subscription_type', STR),
+        key='id', required=('customer', 'status', 'created', '_generated_at'),
+    ),
+    table(
+        'transfers',
+        ('id', STR), ('object', STR), ('amount', INT), ('amount_reversed', INT), ('balance_transaction', STR),
+        ('created', INT), ('currency', STR), ('description', STR), ('destination', STR),
+        ('destination_payment', STR), ('livemode', BOOL), ('metadata', METADATA), json_field('reversals'),
+        ('reversed', BOOL), ('source_transaction', STR), ('source_type', STR), ('transfer_group', STR),
+        ('_generated_at', TIMESTAMP),
+        key='id', required=('amount', 'created', '_generated_at'),
+    ),
+)
+
+
+# ==========================================
+# GOOGLE ANALYTICS (GA4 reports)
+# ==========================================
+
+GOOGLE_ANALYTICS = registry(
+    table(
+        'conversions_report',
+        ('event_date', STR), ('event_month', STR), ('event_name', STR), ('source_medium', STR),
+        ('key_events', INT), ('total_revenue', FLOAT), ('total_users', INT),
+        required=('event_date', 'event_month', 'event_name'),
+    ),
+    table(
+        'events_report',
+        ('event_date', STR), ('event_month', STR), ('event_name', STR), ('source_medium', STR),
+        ('event_count', INT), ('total_users', INT), ('event_count_per_user', FLOAT), ('total_revenue', FLOAT),
+        required=('event_date', 'event_month', 'event_name'),
+    ),
+    table(
+        'traffic_acquisition',
+        ('event_date', STR), ('event_month', STR), ('session_source', STR), ('session_medium', STR),
+        ('total_sessions', INT), ('engaged_sessions', INT), ('engagement_rate', FLOAT), ('event_count', INT),
+        ('events_per_session', FLOAT), ('total_users', INT), ('new_users', INT),
+        required=('event_date', 'event_month'),
+    ),
+    table(
+        'user_acquisition',
+        ('event_date', STR), ('event_month', STR), ('first_user_source', STR), ('first_user_medium', STR),
+        ('new_users', INT), ('total_users', INT), ('engaged_sessions', INT), ('engagement_rate', FLOAT),
+        ('event_count', INT), ('total_revenue', FLOAT),
+        required=('event_date', 'event_month'),
+    ),
+)
+
+
+# ==========================================
+# PIPEDRIVE
+# ==========================================
+
+PERSON_ADDRESS = struct(
+    ('value', STR), ('country', STR), ('admin_area_level_1', STR), ('locality', STR), ('route', STR),
+    ('street_number', STR), ('postal_code', STR),
+)
+
+PIPEDRIVE = registry(
+    table(
+        'persons',
+        ('id', INT), ('name', STR), ('first_name', STR), ('last_name', STR), ('owner_id', INT), ('org_id', INT),
+        ('add_time', TIMESTAMP), ('update_time', TIMESTAMP), ('email', CONTACT_LIST), ('phone', CONTACT_LIST),
+        ('is_deleted', BOOL), ('visible_to', INT), ('label_ids', INT_LIST), ('picture_id', INT), ('notes', STR),
+        ('im', CONTACT_LIST), ('birthday', STR), ('job_title', STR), ('address', PERSON_ADDRESS),
+        ('next_activity_id', INT), ('last_activity_id', INT), ('activities_count', INT),
+        ('done_activities_count', INT), ('undone_activities_count', INT),
+        ('open_deals_count', INT), ('related_open_deals_count', INT), ('closed_deals_count', INT),
+        ('related_closed_deals_count', INT), ('participant_open_deals_count', INT),
+        ('participant_closed_deals_count', INT), ('won_deals_count', INT), ('related_won_deals_count', INT),
+        ('lost_deals_count', INT), ('related_lost_deals_count', INT),
+        ('email_messages_count', INT), ('files_count', INT), ('notes_count', INT), ('followers_count', INT),
+        ('last_incoming_mail_time', TIMESTAMP), ('last_outgoing_mail_time', TIMESTAMP),
+        ('linkedin_url', STR), ('lead_source', STR), ('company', STR), ('industry', STR),
+        ('_generated_at', TIMESTAMP), ('_source', STR), ('_is_customer', BOOL),
+        key='id', required=('owner_id', 'add_time', 'update_time', '_generated_at', '_source'),
+    ),
+    table(
+        'leads',
+        ('id', STR), ('title', STR), ('owner_id', INT), ('creator_id', INT), ('person_id', INT),
+        ('organization_id', INT), ('source_name', STR), ('origin', STR), ('origin_id', STR), ('channel', STR),
+        ('channel_id', STR), ('is_archived', BOOL), ('was_seen', BOOL), ('value', INT), ('currency', STR),
+        ('expected_close_date', STR), ('next_activity_id', INT), ('add_time', TIMESTAMP),
+        ('update_time', TIMESTAMP), ('visible_to', STR), ('cc_email', STR),
+        ('email', STR), ('phone', STR), ('job_title', STR), ('company', STR), ('industry', STR),
+        ('company_size', STR), ('country', STR), ('state', STR), ('city', STR),
+        ('lifecycle_stage', STR), ('form_type', STR), ('trial_path', STR), ('trial_start_date', STR),
+        ('sales_priority', STR), ('expected_activities', INT),
+        ('_generated_at', TIMESTAMP), ('_source', STR), ('_form_type', STR), ('_converted_to_customer', BOOL),
+        key='id', required=('add_time', 'update_time', '_generated_at', '_source'), partition='add_time',
+    ),
+    table(
+        'organizations',
+        ('id', INT), ('name', STR), ('owner_id', INT), ('org_id', INT),
+        ('add_time', TIMESTAMP), ('update_time', TIMESTAMP),
+        ('address', STR), ('country', STR), ('admin_area_level_1', STR), ('locality', STR), ('route', STR),
+        ('street_number', STR), ('postal_code', STR),
+        ('is_deleted', BOOL), ('visible_to', INT), ('label_ids', INT_LIST),
+        ('next_activity_id', INT), ('last_activity_id', INT), ('activities_count', INT),
+        ('done_activities_count', INT), ('undone_activities_count', INT),
+        ('open_deals_count', INT), ('related_open_deals_count', INT), ('closed_deals_count', INT),
+        ('related_closed_deals_count', INT), ('won_deals_count', INT), ('related_won_deals_count', INT),
+        ('lost_deals_count', INT), ('related_lost_deals_count', INT),
+        ('people_count', INT), ('email_messages_count', INT), ('files_count', INT), ('notes_count', INT),
+        ('followers_count', INT), ('industry', STR), ('company_size', STR), ('website', STR),
+        ('annual_revenue', INT), ('_generated_at', TIMESTAMP), ('_source', STR), ('_is_customer', BOOL),
+        key='id', required=('add_time', 'update_time', '_generated_at', '_source'),
+    ),
+    table(
+        'deals',
+        ('id', INT), ('title', STR), ('creator_user_id', INT), ('owner_id', INT), ('value', FLOAT),
+        ('person_id', INT), ('org_id', INT), ('stage_id', INT), ('pipeline_id', INT), ('currency', STR),
+        ('archive_time', TIMESTAMP), ('add_time', TIMESTAMP), ('update_time', TIMESTAMP),
+        ('stage_change_time', TIMESTAMP), ('status', STR), ('is_archived', BOOL), ('is_deleted', BOOL),
+        ('probability', INT), ('lost_reason', STR), ('visible_to', INT),
+        ('close_time', TIMESTAMP), ('won_time', TIMESTAMP), ('lost_time', TIMESTAMP),
+        ('local_won_date', STR), ('local_lost_date', STR), ('local_close_date', STR), ('expected_close_date', STR),
+        ('label_ids', INT_LIST), ('origin', STR), ('origin_id', STR), ('channel', INT), ('channel_id', STR),
+        ('acv', FLOAT), ('arr', FLOAT), ('mrr', FLOAT), ('next_activity_id', INT), ('last_activity_id', INT),
+        ('first_won_time', TIMESTAMP), ('products_count', INT), ('files_count', INT), ('notes_count', INT),
+        ('followers_count', INT), ('email_messages_count', INT), ('activities_count', INT),
+        ('done_activities_count', INT), ('undone_activities_count', INT), ('participants_count', INT),
+        ('last_incoming_mail_time', TIMESTAMP), ('last_outgoing_mail_time', TIMESTAMP),
+        ('product_sku', STR), ('product_name', STR), ('billing_interval', STR), ('trial_path', STR),
+        ('trial_start_date', STR), ('conversion_day', INT), ('source_form_type', STR),
+        ('_generated_at', TIMESTAMP), ('_deal_type', STR),
+        key='id', required=('person_id', 'org_id', 'stage_id', 'pipeline_id', 'add_time', '_generated_at', '_deal_type'),
+        partition='add_time',
+    ),
+    table(
+        'activities',
+        ('id', INT), ('subject', STR), ('type', STR), ('owner_id', INT), ('creator_user_id', INT),
+        ('is_deleted', BOOL), ('add_time', TIMESTAMP), ('update_time', TIMESTAMP), ('deal_id', INT),
+        ('lead_id', STR), ('person_id', INT), ('org_id', INT), ('project_id', INT),
+        ('due_date', STR), ('due_time', STR), ('duration', STR), ('busy', BOOL), ('done', BOOL),
+        ('marked_as_done_time', TIMESTAMP), ('location', STR),
+        child_field('participants', pa.list_(struct(('person_id', INT), ('primary', BOOL)))),
+        json_field('attendees'), ('conference_meeting_client', STR), ('conference_meeting_url', STR),
+        ('conference_meeting_id', STR), ('public_description', STR), ('priority', INT), ('note', STR),
+        ('_generated_at', TIMESTAMP), ('_activity_key', STR), ('_form_type', STR), ('_trial_path', STR),
+        key='id', required=('add_time', '_generated_at', '_activity_key'), partition='add_time',
+    ),
+)
+
+
+SCHEMAS = {
+    'facebook_ads': FACEBOOK_ADS,
+    'google_ads': GOOGLE_ADS,
+    'stripe': STRIPE,
+    'google_analytics': GOOGLE_ANALYTICS,
+    'pipedrive': PIPEDRIVE,
+}
+
+
+def arrow_schema(source: str, table: str) -> pa.Schema:
+    """Declared schema of a generated table (source = the pipeline's dataset name)"""
+    return SCHEMAS[source][table]
+
+
+def nested_type(type: pa.DataType) -> str:
+    """dlt's x-nested-type hint (arrow-ipc: gzipped IPC schema) with a fixed gzip mtime.
+    dlt's own encoding embeds the current time, so the hint would differ on every run
+    and a frozen column contract would reject nested columns of an existing table"""
+    ipc = pa.schema([pa.field('c', type)]).serialize().to_pybytes()
+    return 'arrow-ipc:' + base64.b64encode(gzip.compress(ipc, mtime=0)).decode('ascii')
+
+
+def arrow_columns(schema: pa.Schema) -> dict:
+    columns = py_arrow_to_table_schema_columns(schema)
+    for field in schema:
+        if 'x-nested-type' in columns[field.name]:
+            columns[field.name]['x-nested-type'] = nested_type(field.type)
+    return columns
+
+
+def column_hints(schema: pa.Schema) -> dict:
+    """dlt column hints of a declared table (child columns live in their own tables)"""
+    parent = pa.schema([f for f in schema if not has_flag(f, NESTING, CHILD)])
+    columns = arrow_columns(parent)
+    for field in parent:
+        column = columns[field.name]
+        if has_flag(field, NESTING, JSON):
+            column['data_type'] = 'json'
+        if has_flag(field, PRIMARY_KEY):
+            column['primary_key'] = True
+        if has_flag(field, PARTITION):
+            column['partition'] = True
+    return columns
+
+
+def _child_tables(schema: pa.Schema) -> Dict[str, pa.Schema]:
+    return {name_of(child): child
+            for child in (child_schema(schema, f) for f in schema if has_flag(f, NESTING, CHILD))}
+
+
+def _compile(schema: pa.Schema) -> dict:
+    """dlt resource hints of a declared table. A table with child tables yields Arrow
+    items for several tables, so its table name and columns are resolved per item
+    from the table name each item carries in its schema metadata"""
+    children = _child_tables(schema)
+    if not children:
+        return {'columns': column_hints(schema), 'schema_contract': SCHEMA_CONTRACT}
+    columns = {name_of(schema): column_hints(schema)}
+    columns.update({name: arrow_columns(child) for name, child in children.items()})
+    return {'table_name': table_name, 'columns': lambda item: columns[table_name(item)], 'schema_contract': SCHEMA_CONTRACT}
+
+
+# Precompiled once at import: the hints every @dlt.resource passes to dlt
+RESOURCE_HINTS = {
+    source: {name: _compile(schema) for name, schema in tables.items()}
+    for source, tables in SCHEMAS.items()
+}
+
+
+def resource_hints(source: str, table: str) -> dict:
+    """@dlt.resource(..., **resource_hints(source, table)) keyword arguments"""
+    return copy.deepcopy(RESOURCE_HINTS[source][table])
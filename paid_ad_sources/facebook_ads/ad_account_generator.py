@@ -5,8 +5,14 @@ Generates ad account data following Facebook Ads ad_account schema
 """
 import dlt
 from datetime import datetime
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-@dlt.resource(write_disposition="replace", table_name="ad_account")
+@dlt.resource(write_disposition="replace", table_name="ad_account", **resource_hints('facebook_ads', 'ad_account'))
+@arrow_rows(arrow_schema('facebook_ads', 'ad_account'))
 def ad_accounts():
     """Generate single Facebook Ads ad account"""
     
@@ -5,15 +5,19 @@ Generates ad creative data following Facebook Ads ad_creatives schema
 """
 import dlt
 from datetime import datetime
-import random
-from faker import Faker
 import hashlib
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import random_stream, faker_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
+fake = faker_stream('facebook_ads', 'ad_creatives', seed=42)
+rand = random_stream('facebook_ads', 'ad_creatives', seed=42)
 
-@dlt.resource(write_disposition="replace", table_name="ad_creatives")
+@dlt.resource(write_disposition="replace", table_name="ad_creatives", **resource_hints('facebook_ads', 'ad_creatives'))
+@arrow_rows(arrow_schema('facebook_ads', 'ad_creatives'))
 def ad_creatives():
     """Generate Facebook Ads ad creative data"""
     
@@ -24,7 +28,7 @@ def ad_creatives():
     # Generate 80 creatives matching 80 ads
     for i in range(80):
         creative_id = f"23857{40000000 + i}"
-        object_type = random.choice(object_types)
+        object_type = rand.choice(object_types)
         has_video = object_type == 'VIDEO'
         
         yield {
@@ -44,13 +48,13 @@ def ad_creatives():
             'object_url': fake.url(),
             'template_url': None,
             'url_tags': f"utm_source=facebook&utm_medium=paid_social&utm_campaign=campaign_{i//10}",
-            'call_to_action_type': random.choice(call_to_actions),
+            'call_to_action_type': rand.choice(call_to_actions),
             'object_id': f"23857{60000000 + i}",
-            'object_story_id': f"{random.randint(100000000000, 999999999999)}_{random.randint(100000000000, 999999999999)}",
-            'effective_object_story_id': f"{random.randint(100000000000, 999999999999)}_{random.randint(100000000000, 999999999999)}",
+            'object_story_id': f"{rand.randint(100000000000, 999999999999)}_{rand.randint(100000000000, 999999999999)}",
+            'effective_object_story_id': f"{rand.randint(100000000000, 999999999999)}_{rand.randint(100000000000, 999999999999)}",
             'link_og_id': None,
             'actor_id': f"1000{i:04d}",
-            'instagram_actor_id': f"2000{i:04d}" if random.random() > 0.5 else None,
+            'instagram_actor_id': f"2000{i:04d}" if rand.random() > 0.5 else None,
             'instagram_story_id': None,
             'effective_instagram_story_id': None,
             'instagram_permalink_url': None,
@@ -62,11 +66,11 @@ def ad_creatives():
                     'message': fake.sentence(),
                     'name': fake.catch_phrase(),
                     'call_to_action': {
-                        'type': random.choice(call_to_actions),
+                        'type': rand.choice(call_to_actions),
                         'value': {'link': fake.url()}
                     }
                 }
-            } if random.random() > 0.5 else {},
+            } if rand.random() > 0.5 else {},
             'asset_feed_spec': {},
             'template_url_spec': {},
             'image_crops': {
@@ -5,12 +5,15 @@ Facebook Ads Ad Set Data Generator
 import dlt
 import pandas as pd
 from datetime import datetime, timedelta
-import random
-from faker import Faker
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import random_stream, faker_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
+fake = faker_stream('facebook_ads', 'ad_sets', seed=42)
+rand = random_stream('facebook_ads', 'ad_sets', seed=42)
 
 CAMPAIGN_IDS = [f"23857{10000000 + i}" for i in range(8)]
 
@@ -22,7 +25,8 @@ AD_SET_TEMPLATES = [
     ("Interest - Tech Enthusiasts", "US,GB,AU"),
 ]
 
-@dlt.resource(write_disposition="replace", table_name="ad_sets")
+@dlt.resource(write_disposition="replace", table_name="ad_sets", **resource_hints('facebook_ads', 'ad_sets'))
+@arrow_rows(arrow_schema('facebook_ads', 'ad_sets'))
 def ad_sets():
     """Generate ad sets - 5 per campaign"""
     
@@ -37,19 +41,19 @@ def ad_sets():
             
             created = datetime.now() - timedelta(days=360)
             
-            daily_budget = round(random.uniform(50, 200), 2)
+            daily_budget = round(rand.uniform(50, 200), 2)
             
             yield {
                 'id': adset_id,
                 'account_id': account_id,
                 'campaign_id': campaign_id,
                 'name': template_name,
-                'effective_status': random.choice(['ACTIVE', 'PAUSED']),
+                'effective_status': rand.choice(['ACTIVE', 'PAUSED']),
                 'daily_budget': daily_budget,
                 'lifetime_budget': None,
-                'budget_remaining': round(random.uniform(100, 2000), 2),
-                'bid_strategy': random.choice(bid_strategies),
-                'bid_amount': round(random.uniform(1, 5), 2),
+                'budget_remaining': round(rand.uniform(100, 2000), 2),
+                'bid_strategy': rand.choice(bid_strategies),
+                'bid_amount': round(rand.uniform(1, 5), 2),
                 'bid_info': {},
                 'bid_constraints': {},
                 'created_time': created.strftime('%Y-%m-%dT%H:%M:%S+0000'),
@@ -5,18 +5,22 @@ Facebook Ads Ad Data Generator
 import dlt
 import pandas as pd
 from datetime import datetime, timedelta
-import random
-from faker import Faker
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import random_stream, faker_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
+fake = faker_stream('facebook_ads', 'ads', seed=42)
+rand = random_stream('facebook_ads', 'ads', seed=42)
 
 # Match ad set count
 AD_SET_COUNT = 40  # 8 campaigns * 5 ad sets
 AD_CREATIVE_VARIANTS = ["Carousel", "Video", "Image", "Story"]
 
-@dlt.resource(write_disposition="replace", table_name="ads")
+@dlt.resource(write_disposition="replace", table_name="ads", **resource_hints('facebook_ads', 'ads'))
+@arrow_rows(arrow_schema('facebook_ads', 'ads'))
 def ads():
     """Generate 2 ad creatives per ad set"""
     
@@ -27,7 +31,7 @@ def ads():
         adset_id = f"23857{20000000 + i}"
         campaign_id = f"23857{10000000 + (i // 5)}"  # 5 ad sets per campaign
         
-        for j, creative_type in enumerate(random.sample(AD_CREATIVE_VARIANTS, 2)):
+        for j, creative_type in enumerate(rand.sample(AD_CREATIVE_VARIANTS, 2)):
             ad_id = f"23857{30000000 + (i * 2) + j}"
             
             created = datetime.now() - timedelta(days=350)
@@ -38,8 +42,8 @@ def ads():
                 'campaign_id': campaign_id,
                 'adset_id': adset_id,
                 'name': f"{creative_type} Ad - Variant {j+1}",
-                'status': random.choice(statuses),
-                'effective_status': random.choice(statuses),
+                'status': rand.choice(statuses),
+                'effective_status': rand.choice(statuses),
                 'bid_type': 'CPC',
                 'bid_amount': None,
                 'bid_info': {},
@@ -5,12 +5,14 @@ Facebook Ads Insights - 365 days of performance data
 import dlt
 import pandas as pd
 from datetime import datetime, timedelta
-import random
-from faker import Faker
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import random_stream, faker_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
+fake = faker_stream('facebook_ads', 'ads_insights', seed=42)
 
 CAMPAIGN_NAMES = [
     "Spring Sale 2024",
@@ -23,7 +25,8 @@ CAMPAIGN_NAMES = [
     "Re-engagement Campaign"
 ]
 
-@dlt.resource(write_disposition="replace", table_name="ads_insights")
+@dlt.resource(write_disposition="replace", table_name="ads_insights", **resource_hints('facebook_ads', 'ads_insights'))
+@arrow_rows(arrow_schema('facebook_ads', 'ads_insights'))
 def ads_insights():
     """Generate 365 days of insights for all ads"""
     
@@ -41,9 +44,10 @@ def ads_insights():
     for day in range(365):
         current_date = start_date + timedelta(days=day)
         date_str = current_date.strftime('%Y-%m-%d')
+        rand = random_stream('facebook_ads', 'ads_insights', day, seed=42)  # one stream per day partition
         
         # Generate insights for 20 active ads per day (rotating subset)
-        active_ads = random.sample(range(ad_count), 20)
+        active_ads = rand.sample(range(ad_count), 20)
         
         for ad_index in active_ads:
             campaign_index = ad_index // 10
@@ -53,13 +57,13 @@ def ads_insights():
             adset_id = f"23857{20000000 + ad_set_index}"
             ad_id = f"23857{30000000 + ad_index}"
             
-            impressions = random.randint(1000, 20000)
-            reach = int(impressions * random.uniform(0.7, 0.9))
-            clicks = int(impressions * random.uniform(0.01, 0.04))
-            spend = round(random.uniform(50, 300), 2)
+            impressions = rand.randint(1000, 20000)
+            reach = int(impressions * rand.uniform(0.7, 0.9))
+            clicks = int(impressions * rand.uniform(0.01, 0.04))
+            spend = round(rand.uniform(50, 300), 2)
             
-            conversions_count = int(clicks * random.uniform(0.02, 0.08))
-            conversion_value = round(conversions_count * random.uniform(50, 150), 2)
+            conversions_count = int(clicks * rand.uniform(0.02, 0.08))
+            conversion_value = round(conversions_count * rand.uniform(50, 150), 2)
             
             yield {
                 'account_id': account_id,
@@ -75,8 +79,8 @@ def ads_insights():
                 'date_stop': date_str,
                 'created_time': current_date.strftime('%Y-%m-%dT%H:%M:%S+0000'),
                 'updated_time': datetime.now().strftime('%Y-%m-%dT%H:%M:%S+0000'),
-                'objective': random.choice(objectives),
-                'optimization_goal': random.choice(optimization_goals),
+                'objective': rand.choice(objectives),
+                'optimization_goal': rand.choice(optimization_goals),
                 'buying_type': 'AUCTION',
                 'attribution_setting': '7d_click_1d_view',
                 'impressions': impressions,
@@ -136,12 +140,12 @@ def ads_insights():
                 'video_p50_watched_actions': [],
                 'video_p75_watched_actions': [],
                 'video_p100_watched_actions': [],
-                'quality_ranking': random.choice(['AVERAGE', 'ABOVE_AVERAGE']),
-                'engagement_rate_ranking': random.choice(['AVERAGE', 'ABOVE_AVERAGE']),
-                'conversion_rate_ranking': random.choice(['AVERAGE', 'ABOVE_AVERAGE']),
-                'auction_bid': round(random.uniform(1, 3), 2),
-                'auction_competitiveness': round(random.uniform(0.5, 0.9), 2),
-                'auction_max_competitor_bid': round(random.uniform(1.5, 4), 2),
+                'quality_ranking': rand.choice(['AVERAGE', 'ABOVE_AVERAGE']),
+                'engagement_rate_ranking': rand.choice(['AVERAGE', 'ABOVE_AVERAGE']),
+                'conversion_rate_ranking': rand.choice(['AVERAGE', 'ABOVE_AVERAGE']),
+                'auction_bid': round(rand.uniform(1, 3), 2),
+                'auction_competitiveness': round(rand.uniform(0.5, 0.9), 2),
+                'auction_max_competitor_bid': round(rand.uniform(1.5, 4), 2),
                 'estimated_ad_recallers': int(reach * 0.2),
                 'cost_per_estimated_ad_recallers': round(spend / (reach * 0.2), 2),
                 'full_view_impressions': int(impressions * 0.85),
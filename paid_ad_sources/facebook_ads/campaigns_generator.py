@@ -6,22 +6,23 @@ Generates campaign data following Facebook Ads campaigns schema
 import dlt
 import pandas as pd
 from datetime import datetime, timedelta
-import random
 import sys
 import os
 # Path to digital_analytics where shared_config lives
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
 from shared_config import PAID_CAMPAIGNS
-from faker import Faker
+from rng_streams import random_stream, faker_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
+fake = faker_stream('facebook_ads', 'campaigns', seed=42)
+rand = random_stream('facebook_ads', 'campaigns', seed=42)
 
 # Get Facebook campaign names from shared config
 FACEBOOK_CAMPAIGNS = PAID_CAMPAIGNS['facebook_cpc']
 
-@dlt.resource(write_disposition="replace", table_name="campaigns")
+@dlt.resource(write_disposition="replace", table_name="campaigns", **resource_hints('facebook_ads', 'campaigns'))
+@arrow_rows(arrow_schema('facebook_ads', 'campaigns'))
 def campaigns():
     """Generate Facebook Ads campaign data"""
     
@@ -38,27 +39,27 @@ def campaigns():
         
         # Campaigns started throughout the year
         created = datetime.now() - timedelta(days=365 - (campaign['id'] % 100 * 4))
-        updated = datetime.now() - timedelta(days=random.randint(1, 7))
+        updated = datetime.now() - timedelta(days=rand.randint(1, 7))
         start = created
         stop = None  # Keep campaigns running
         
-        daily_budget = round(random.uniform(100, 1000), 2)
+        daily_budget = round(rand.uniform(100, 1000), 2)
         
         yield {
             'id': campaign_id,
             'account_id': account_id,
             'name': campaign_name,
-            'objective': random.choice(objectives),
+            'objective': rand.choice(objectives),
             'buying_type': 'AUCTION',
-            'bid_strategy': random.choice(bid_strategies),
+            'bid_strategy': rand.choice(bid_strategies),
             'daily_budget': daily_budget,
             'lifetime_budget': None,
             'spend_cap': round(daily_budget * 180, 2),
-            'budget_remaining': round(random.uniform(1000, 10000), 2),
+            'budget_remaining': round(rand.uniform(1000, 10000), 2),
             'budget_rebalance_flag': False,
-            'status': random.choice(statuses),
-            'configured_status': random.choice(statuses),
-            'effective_status': random.choice(statuses),
+            'status': rand.choice(statuses),
+            'configured_status': rand.choice(statuses),
+            'effective_status': rand.choice(statuses),
             'created_time': created.strftime('%Y-%m-%dT%H:%M:%S+0000'),
             'updated_time': updated.strftime('%Y-%m-%dT%H:%M:%S+0000'),
             'start_time': start.strftime('%Y-%m-%dT%H:%M:%S+0000'),
@@ -5,14 +5,17 @@ Generates custom conversion definitions following Facebook Ads custom_conversion
 """
 import dlt
 from datetime import datetime, timedelta
-import random
-from faker import Faker
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import faker_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-fake = Faker()
-Faker.seed(42)
-random.seed(42)
+fake = faker_stream('facebook_ads', 'custom_conversions', seed=42)
 
-@dlt.resource(write_disposition="replace", table_name="custom_conversions")
+@dlt.resource(write_disposition="replace", table_name="custom_conversions", **resource_hints('facebook_ads', 'custom_conversions'))
+@arrow_rows(arrow_schema('facebook_ads', 'custom_conversions'))
 def custom_conversions():
     """Generate Facebook Ads custom conversion definitions"""
     
@@ -4,9 +4,14 @@ Google Ads Ad Group Ad Data Generator
 """
 import dlt
 from datetime import datetime
-import random
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-random.seed(54321)
+rand = random_stream('google_ads', 'ad_group_ads', seed=54321)
 
 HEADLINE_TEMPLATES = [
     "Best {topic} Software",
@@ -24,7 +29,8 @@ DESCRIPTION_TEMPLATES = [
 
 TOPICS = ['Marketing', 'Sales', 'Analytics', 'CRM', 'Automation']
 
-@dlt.resource(write_disposition="replace")
+@dlt.resource(write_disposition="replace", **resource_hints('google_ads', 'ad_group_ad'))
+@arrow_rows(arrow_schema('google_ads', 'ad_group_ad'))
 def ad_group_ad():
     """Generate 2-3 ads per ad group"""
     
@@ -32,13 +38,13 @@ def ad_group_ad():
     ad_id = 20001
     
     for ad_group_id in range(5001, 5041):  # 40 ad groups
-        num_ads = random.randint(2, 3)
+        num_ads = rand.randint(2, 3)
         
         for _ in range(num_ads):
-            topic = random.choice(TOPICS)
+            topic = rand.choice(TOPICS)
             
-            headlines = [t.format(topic=topic)[:30] for t in random.sample(HEADLINE_TEMPLATES, 5)]
-            descriptions = [t.format(topic=topic)[:90] for t in random.sample(DESCRIPTION_TEMPLATES, 2)]
+            headlines = [t.format(topic=topic)[:30] for t in rand.sample(HEADLINE_TEMPLATES, 5)]
+            descriptions = [t.format(topic=topic)[:90] for t in rand.sample(DESCRIPTION_TEMPLATES, 2)]
             
             yield {
                 'customer_id': customer_id,
@@ -47,9 +53,9 @@ def ad_group_ad():
                 'resource_name': f"customers/{customer_id}/adGroupAds/{ad_group_id}~{ad_id}",
                 'ad_group': f"customers/{customer_id}/adGroups/{ad_group_id}",
                 'ad_resource_name': f"customers/{customer_id}/ads/{ad_id}",
-                'status': 'ENABLED' if random.random() < 0.85 else 'PAUSED',
+                'status': 'ENABLED' if rand.random() < 0.85 else 'PAUSED',
                 'ad_type': 'RESPONSIVE_SEARCH_AD',
-                'ad_strength': random.choices(['POOR', 'AVERAGE', 'GOOD', 'EXCELLENT'], weights=[0.1, 0.3, 0.4, 0.2])[0],
+                'ad_strength': rand.choices(['POOR', 'AVERAGE', 'GOOD', 'EXCELLENT'], weights=[0.1, 0.3, 0.4, 0.2])[0],
                 'headlines': headlines,
                 'descriptions': descriptions,
                 'final_urls': ['https://example.com/landing'],
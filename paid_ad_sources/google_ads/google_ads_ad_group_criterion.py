@@ -4,9 +4,14 @@ Google Ads Ad Group Criterion (Keywords) Data Generator
 """
 import dlt
 from datetime import datetime
-import random
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-random.seed(54321)
+rand = random_stream('google_ads', 'ad_group_criterion', seed=54321)
 
 KEYWORD_TEMPLATES = [
     '{topic} software', '{topic} platform', '{topic} solution',
@@ -15,7 +20,8 @@ KEYWORD_TEMPLATES = [
 
 TOPICS = ['marketing', 'sales', 'crm', 'analytics', 'automation', 'collaboration', 'productivity']
 
-@dlt.resource(write_disposition="replace")
+@dlt.resource(write_disposition="replace", **resource_hints('google_ads', 'ad_group_criterion'))
+@arrow_rows(arrow_schema('google_ads', 'ad_group_criterion'))
 def ad_group_criterion():
     """Generate 15-20 keywords per ad group"""
     
@@ -23,16 +29,16 @@ def ad_group_criterion():
     criterion_id = 10001
     
     for ad_group_id in range(5001, 5041):  # 40 ad groups
-        num_keywords = random.randint(15, 20)
+        num_keywords = rand.randint(15, 20)
         
         for _ in range(num_keywords):
-            template = random.choice(KEYWORD_TEMPLATES)
-            topic = random.choice(TOPICS)
+            template = rand.choice(KEYWORD_TEMPLATES)
+            topic = rand.choice(TOPICS)
             keyword_text = template.format(topic=topic)
             
-            match_type = random.choices(['EXACT', 'PHRASE', 'BROAD_MATCH'], weights=[0.3, 0.5, 0.2])[0]
-            cpc_bid = random.randint(1500000, 12000000)
-            quality_score = random.choices([3,4,5,6,7,8,9,10], weights=[0.05,0.10,0.15,0.20,0.20,0.15,0.10,0.05])[0]
+            match_type = rand.choices(['EXACT', 'PHRASE', 'BROAD_MATCH'], weights=[0.3, 0.5, 0.2])[0]
+            cpc_bid = rand.randint(1500000, 12000000)
+            quality_score = rand.choices([3,4,5,6,7,8,9,10], weights=[0.05,0.10,0.15,0.20,0.20,0.15,0.10,0.05])[0]
             
             yield {
                 'customer_id': customer_id,
@@ -41,7 +47,7 @@ def ad_group_criterion():
                 'resource_name': f"customers/{customer_id}/adGroupCriteria/{ad_group_id}~{criterion_id}",
                 'ad_group': f"customers/{customer_id}/adGroups/{ad_group_id}",
                 'type': 'KEYWORD',
-                'status': 'ENABLED' if random.random() < 0.85 else 'PAUSED',
+                'status': 'ENABLED' if rand.random() < 0.85 else 'PAUSED',
                 'negative': False,
                 'keyword_text': keyword_text,
                 'keyword_match_type': match_type,
@@ -4,9 +4,14 @@ Google Ads Ad Group Data Generator
 """
 import dlt
 from datetime import datetime
-import random
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-random.seed(54321)
+rand = random_stream('google_ads', 'ad_groups', seed=54321)
 
 AD_GROUP_TEMPLATES = [
     "Prospecting - 25-34",
@@ -16,7 +21,8 @@ AD_GROUP_TEMPLATES = [
     "Interest - Tech Decision Makers"
 ]
 
-@dlt.resource(write_disposition="replace")
+@dlt.resource(write_disposition="replace", **resource_hints('google_ads', 'ad_group'))
+@arrow_rows(arrow_schema('google_ads', 'ad_group'))
 def ad_group():
     """Generate 5 ad groups per campaign"""
     
@@ -25,7 +31,7 @@ def ad_group():
     
     for campaign_id in range(1001, 1009):  # 8 campaigns
         for template in AD_GROUP_TEMPLATES:
-            base_cpc = random.randint(2000000, 8000000)
+            base_cpc = rand.randint(2000000, 8000000)
             
             yield {
                 'customer_id': customer_id,
@@ -34,13 +40,13 @@ def ad_group():
                 'ad_group_name': template,
                 'resource_name': f"customers/{customer_id}/adGroups/{ad_group_id}",
                 'campaign': f"customers/{customer_id}/campaigns/{campaign_id}",
-                'status': 'ENABLED' if random.random() < 0.9 else 'PAUSED',
+                'status': 'ENABLED' if rand.random() < 0.9 else 'PAUSED',
                 'type': 'SEARCH_STANDARD',
                 'ad_rotation_mode': 'OPTIMIZE',
                 'cpc_bid_micros': base_cpc,
-                'target_cpa_micros': base_cpc * random.randint(8, 15),
-                'effective_target_cpa_micros': base_cpc * random.randint(8, 15),
-                'optimized_targeting_enabled': random.choice([True, False]),
+                'target_cpa_micros': base_cpc * rand.randint(8, 15),
+                'effective_target_cpa_micros': base_cpc * rand.randint(8, 15),
+                'optimized_targeting_enabled': rand.choice([True, False]),
                 '_generated_at': datetime.now().isoformat()
             }
             ad_group_id += 1
@@ -4,13 +4,19 @@ Google Ads Campaign Criterion (Targeting) Data Generator
 """
 import dlt
 from datetime import datetime
-import random
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-random.seed(54321)
+rand = random_stream('google_ads', 'campaign_criterion', seed=54321)
 
 STATES = ['CA', 'NY', 'TX', 'FL', 'IL', 'PA', 'OH', 'GA', 'NC', 'MI']
 
-@dlt.resource(write_disposition="replace")
+@dlt.resource(write_disposition="replace", **resource_hints('google_ads', 'campaign_criterion'))
+@arrow_rows(arrow_schema('google_ads', 'campaign_criterion'))
 def campaign_criterion():
     """Generate targeting criteria per campaign"""
     
@@ -19,7 +25,7 @@ def campaign_criterion():
     
     for campaign_id in range(1001, 1009):
         # Location targeting - 4-6 states
-        for state in random.sample(STATES, random.randint(4, 6)):
+        for state in rand.sample(STATES, rand.randint(4, 6)):
             geo_target_id = 1000000 + abs(hash(state)) % 9000000
             
             yield {
@@ -31,7 +37,7 @@ def campaign_criterion():
                 'type': 'LOCATION',
                 'status': 'ENABLED',
                 'negative': False,
-                'bid_modifier': round(random.uniform(0.9, 1.2), 2),
+                'bid_modifier': round(rand.uniform(0.9, 1.2), 2),
                 'location_geo_target_constant': f"geoTargetConstants/{geo_target_id}",
                 'display_name': f"{state}, USA",
                 '_generated_at': datetime.now().isoformat()
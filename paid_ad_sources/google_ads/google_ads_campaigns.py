@@ -4,19 +4,22 @@ Google Ads Campaigns Data Generator
 """
 import dlt
 from datetime import datetime, timedelta
-import random
 import sys
 import os
 # Path to digital_analytics where shared_config lives
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
 from shared_config import PAID_CAMPAIGNS
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-random.seed(54321)
+rand = random_stream('google_ads', 'campaigns', seed=54321)
 
 # Get Google campaign names from shared config
 GOOGLE_CAMPAIGNS = PAID_CAMPAIGNS['google_cpc']
 
-@dlt.resource(write_disposition="replace")
+@dlt.resource(write_disposition="replace", **resource_hints('google_ads', 'campaigns'))
+@arrow_rows(arrow_schema('google_ads', 'campaigns'))
 def campaigns():
     """Generate campaigns with consistent IDs"""
     
@@ -40,9 +43,9 @@ def campaigns():
             'advertising_channel_sub_type': 'UNSPECIFIED',
             'campaign_budget': f"customers/{customer_id}/campaignBudgets/{campaign_id}",
             'bidding_strategy_type': 'TARGET_CPA',
-            'target_cpa_target_cpa_micros': int(random.uniform(65, 100) * 1_000_000),
-            'target_cpa_cpc_bid_ceiling_micros': int(random.uniform(15, 25) * 1_000_000),
-            'target_cpa_cpc_bid_floor_micros': int(random.uniform(2, 5) * 1_000_000),
+            'target_cpa_target_cpa_micros': int(rand.uniform(65, 100) * 1_000_000),
+            'target_cpa_cpc_bid_ceiling_micros': int(rand.uniform(15, 25) * 1_000_000),
+            'target_cpa_cpc_bid_floor_micros': int(rand.uniform(2, 5) * 1_000_000),
             'start_date': start_date,
             'end_date': '2037-12-30',
             'network_settings_target_google_search': True,
@@ -51,7 +54,7 @@ def campaigns():
             'network_settings_target_partner_search_network': False,
             'tracking_url_template': f'https://example.com/?utm_source=google&utm_medium=cpc&utm_campaign={campaign_name}',
             'final_url_suffix': 'gclid={gclid}',
-            'optimization_score': round(random.uniform(0.70, 0.95), 3),
+            'optimization_score': round(rand.uniform(0.70, 0.95), 3),
             'experiment_type': 'BASE',
             'base_campaign': f"customers/{customer_id}/campaigns/{campaign_id}",
             '_generated_at': datetime.now().isoformat(),
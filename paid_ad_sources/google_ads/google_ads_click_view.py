@@ -4,13 +4,16 @@ Google Ads Click View Data Generator - 365 days
 """
 import dlt
 from datetime import datetime, timedelta
-import random
 import string
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from rng_streams import random_stream
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-random.seed(54321)
-
-def generate_gclid():
-    return 'Cj0KCQiA' + ''.join(random.choices(string.ascii_letters + string.digits + '_-', k=20))
+def generate_gclid(rand):
+    return 'Cj0KCQiA' + ''.join(rand.choices(string.ascii_letters + string.digits + '_-', k=20))
 
 CITIES = [
     ('1014221', '2840', 'San Francisco'),
@@ -22,7 +25,8 @@ CITIES = [
 
 KEYWORDS = ['b2b software', 'enterprise solutions', 'business platform', 'saas product', 'marketing tool']
 
-@dlt.resource(write_disposition="replace")
+@dlt.resource(write_disposition="replace", **resource_hints('google_ads', 'click_view'))
+@arrow_rows(arrow_schema('google_ads', 'click_view'))
 def click_view():
     """Generate 365 days of click data"""
     
@@ -30,27 +34,28 @@ def click_view():
     end_date = datetime.now()
     start_date = end_date - timedelta(days=365)
     
-    for single_date in pd.date_range(start_date, end_date):
+    for day, single_date in enumerate(pd.date_range(start_date, end_date)):
         date_str = single_date.strftime('%Y-%m-%d')
-        num_clicks = random.randint(30, 120)  # More clicks per day
+        rand = random_stream('google_ads', 'click_view', day, seed=54321)  # one stream per day partition
+        num_clicks = rand.randint(30, 120)  # More clicks per day
         
         for _ in range(num_clicks):
-            campaign_id = random.randint(1001, 1008)
-            ad_group_id = random.randint(5001, 5040)
-            ad_id = random.randint(20001, 20100)
+            campaign_id = rand.randint(1001, 1008)
+            ad_group_id = rand.randint(5001, 5040)
+            ad_id = rand.randint(20001, 20100)
             
-            city_id, country_id, city_name = random.choice(CITIES)
+            city_id, country_id, city_name = rand.choice(CITIES)
             
             yield {
-                'gclid': generate_gclid(),
-                'resource_name': f"customers/{customer_id}/clickViews/{date_str}~{generate_gclid()}",
+                'gclid': generate_gclid(rand),
+                'resource_name': f"customers/{customer_id}/clickViews/{date_str}~{generate_gclid(rand)}",
                 'ad_group_ad': f"customers/{customer_id}/adGroupAds/{ad_group_id}~{ad_id}",
                 'campaign_location_target': None,
-                'keyword': f"customers/{customer_id}/adGroupCriteria/{ad_group_id}~{random.randint(10001, 10999)}",
+                'keyword': f"customers/{customer_id}/adGroupCriteria/{ad_group_id}~{rand.randint(10001, 10999)}",
                 'user_list': None,
-                'keyword_text': random.choice(KEYWORDS),
-                'keyword_match_type': random.choice(['EXACT', 'PHRASE', 'BROAD']),
-                'page_number': random.randint(1, 3),
+                'keyword_text': rand.choice(KEYWORDS),
+                'keyword_match_type': rand.choice(['EXACT', 'PHRASE', 'BROAD']),
+                'page_number': rand.randint(1, 3),
                 'area_of_interest_city': f"geoTargetConstants/{city_id}",
                 'area_of_interest_country': f"geoTargetConstants/{country_id}",
                 'area_of_interest_metro': None,
@@ -62,11 +67,11 @@ def click_view():
                 'location_region': None,
                 'location_most_specific': f"geoTargetConstants/{city_id}",
                 'date': date_str,
-                'ad_network_type': random.choice(['SEARCH', 'SEARCH_PARTNERS']),
-                'click_type': random.choice(['HEADLINE', 'SITELINK', 'URL_CLICKS']),
-                'device': random.choice(['DESKTOP', 'MOBILE', 'TABLET']),
+                'ad_network_type': rand.choice(['SEARCH', 'SEARCH_PARTNERS']),
+                'click_type': rand.choice(['HEADLINE', 'SITELINK', 'URL_CLICKS']),
+                'device': rand.choice(['DESKTOP', 'MOBILE', 'TABLET']),
                 'month_of_year': single_date.strftime('%B').upper(),
-                'slot': random.choice(['SEARCH_TOP', 'SEARCH_SIDE', 'SEARCH_OTHER']),
+                'slot': rand.choice(['SEARCH_TOP', 'SEARCH_SIDE', 'SEARCH_OTHER']),
                 'clicks': 1,
                 '_extracted_at': datetime.utcnow().isoformat(),
             }
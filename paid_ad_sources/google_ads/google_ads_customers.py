@@ -4,8 +4,14 @@ Google Ads Customer Data Generator
 """
 import dlt
 from datetime import datetime
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'digital_analytics')))
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-@dlt.resource(write_disposition="replace", table_name="customer")
+@dlt.resource(write_disposition="replace", table_name="customer", **resource_hints('google_ads', 'customer'))
+@arrow_rows(arrow_schema('google_ads', 'customer'))
 def customers():
     """Generate single Google Ads customer account"""
     
@@ -3,34 +3,43 @@ Stripe Customers Generator
 ~97K total: 5% identified leads + anonymous purchasers
 """
 import dlt
-import pandas as pd
 from datetime import datetime, timedelta
-import random
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
 from shared_config import *
+from rng_streams import stream, random_stream
+from stripe_ids import id_factory, LOWER36, UPPER26, UPPER36
+from faker_pools import FakerPools
+import input_cache
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-from faker import Faker
+# Faker values are sampled from cached per-provider pools (see faker_pools)
+fake = FakerPools(SEED, rng=stream('stripe', 'customers', 'faker_pools', seed=SEED))
+rand = random_stream('stripe', 'customers', seed=SEED)
+ids = id_factory('stripe', 'customers')
 
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
-
-print("Loading lead data...")
-purchased_leads = pd.read_parquet('gs://mock-source-data/customer_data_population/unified_leads_enriched.parquet')
-print(f"Loaded {len(purchased_leads)} leads")
+def customer_ids(n):
+    """IDs for n customers, minted in batches: (customer, invoice prefix, default payment method)"""
+    return zip(
+        ids.batch('cus_', n, 10, UPPER26),
+        ids.batch('', n, 8, UPPER36),
+        ids.batch('pm_', n, 20, LOWER36),
+    )
 
 
-@dlt.resource(write_disposition="append", table_name="customers")
+@dlt.resource(write_disposition="append", table_name="customers", **resource_hints('stripe', 'customers'))
+@arrow_rows(arrow_schema('stripe', 'customers'))
 def customers():
     """Generate Stripe customers: identified leads + anonymous purchasers"""
     
-    total_leads = len(purchased_leads) + sum(get_daily_metrics(d)['identified_leads'] for d in range(DAYS_OF_DATA))
+    purchased_leads = input_cache.unified_leads()
+    total_leads = len(purchased_leads) + metric_total('identified_leads')
     lead_customers = int(total_leads * LEAD_CONVERSION_RATE)
     
     # Anonymous purchases: 1.8% of sessions over 365 days
-    total_sessions = sum(get_daily_metrics(d)['sessions'] for d in range(DAYS_OF_DATA))
+    total_sessions = metric_total('sessions')
     anonymous_purchase_rate = (ANONYMOUS_CONVERSION_RATES['add_to_cart'] * 
                                ANONYMOUS_CONVERSION_RATES['checkout_start'] * 
                                ANONYMOUS_CONVERSION_RATES['purchase'])
@@ -42,17 +51,17 @@ def customers():
     # 1. Lead customers (from purchased lists)
     paying_leads = purchased_leads.sample(min(int(len(purchased_leads) * LEAD_CONVERSION_RATE), len(purchased_leads)))
     
-    for idx, lead in paying_leads.iterrows():
-        created_time = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 30))
+    for (idx, lead), (customer_id, invoice_prefix, payment_method_id) in zip(paying_leads.iterrows(), customer_ids(len(paying_leads))):
+        created_time = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA - 30))
         
         yield {
-            'id': f"cus_{fake.bothify(text='??????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ')}",
+            'id': customer_id,
             'object': 'customer',
             'address': {
-                'line1': lead.get('address', fake.street_address()),
-                'city': lead.get('city', fake.city()),
-                'state': lead.get('state', fake.state_abbr()),
-                'postal_code': fake.postcode(),
+                'line1': lead.get('address', fake.draw('street_address')),
+                'city': lead.get('city', fake.draw('city')),
+                'state': lead.get('state', fake.draw('state_abbr')),
+                'postal_code': fake.draw('postcode'),
                 'country': lead.get('country', 'US'),
             },
             'balance': 0,
@@ -60,24 +69,24 @@ def customers():
             'currency': 'usd',
             'default_source': None,
             'delinquent': False,
-            'description': f"Customer from {lead.get('company', fake.company())}",
-            'email': lead.get('email', fake.email()),
-            'invoice_prefix': fake.bothify(text='????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'),
+            'description': f"Customer from {lead.get('company', fake.draw('company'))}",
+            'email': lead.get('email', fake.draw('email')),
+            'invoice_prefix': invoice_prefix,
             'invoice_settings': {
                 'custom_fields': None,
-                'default_payment_method': f"pm_{fake.bothify(text='????????????????????', letters='abcdefghijklmnopqrstuvwxyz0123456789')}",
+                'default_payment_method': payment_method_id,
                 'footer': None,
                 'rendering_options': None,
             },
             'livemode': False,
             'metadata': {
-                'company': lead.get('company', fake.company()),
-                'industry': lead.get('industry', fake.bs()),
+                'company': lead.get('company', fake.draw('company')),
+                'industry': lead.get('industry', fake.draw('bs')),
                 'source': 'identified_lead',
             },
-            'name': f"{lead.get('first_name', fake.first_name())} {lead.get('last_name', fake.last_name())}",
-            'next_invoice_sequence': random.randint(1, 24),
-            'phone': lead.get('phone', fake.phone_number()),
+            'name': f"{lead.get('first_name', fake.draw('first_name'))} {lead.get('last_name', fake.draw('last_name'))}",
+            'next_invoice_sequence': rand.randint(1, 24),
+            'phone': lead.get('phone', fake.draw('phone_number')),
             'preferred_locales': ['en-US'],
             'shipping': None,
             'tax_exempt': 'none',
@@ -90,18 +99,18 @@ def customers():
     # 2. Form-fill lead customers
     form_fill_lead_customers = lead_customers - len(paying_leads)
     
-    for _ in range(form_fill_lead_customers):
-        created_time = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA))
+    for customer_id, invoice_prefix, payment_method_id in customer_ids(form_fill_lead_customers):
+        created_time = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA))
         
         yield {
-            'id': f"cus_{fake.bothify(text='??????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ')}",
+            'id': customer_id,
             'object': 'customer',
             'address': {
-                'line1': fake.street_address(),
-                'city': fake.city(),
-                'state': fake.state_abbr(),
-                'postal_code': fake.postcode(),
-                'country': random.choices([g['country'][:2] for g in GEO_DISTRIBUTION], 
+                'line1': fake.draw('street_address'),
+                'city': fake.draw('city'),
+                'state': fake.draw('state_abbr'),
+                'postal_code': fake.draw('postcode'),
+                'country': rand.choices([g['country'][:2] for g in GEO_DISTRIBUTION], 
                                         weights=[g['weight'] for g in GEO_DISTRIBUTION])[0],
             },
             'balance': 0,
@@ -109,24 +118,24 @@ def customers():
             'currency': 'usd',
             'default_source': None,
             'delinquent': False,
-            'description': f"Customer from {fake.company()}",
-            'email': fake.email(),
-            'invoice_prefix': fake.bothify(text='????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'),
+            'description': f"Customer from {fake.draw('company')}",
+            'email': fake.draw('email'),
+            'invoice_prefix': invoice_prefix,
             'invoice_settings': {
                 'custom_fields': None,
-                'default_payment_method': f"pm_{fake.bothify(text='????????????????????', letters='abcdefghijklmnopqrstuvwxyz0123456789')}",
+                'default_payment_method': payment_method_id,
                 'footer': None,
                 'rendering_options': None,
             },
             'livemode': False,
             'metadata': {
-                'company': fake.company(),
-                'industry': fake.bs(),
-                'source': random.choice(['google_ads', 'facebook_ads', 'organic_web']),
+                'company': fake.draw('company'),
+                'industry': fake.draw('bs'),
+                'source': rand.choice(['google_ads', 'facebook_ads', 'organic_web']),
             },
-            'name': fake.name(),
-            'next_invoice_sequence': random.randint(1, 24),
-            'phone': fake.phone_number(),
+            'name': fake.draw('name'),
+            'next_invoice_sequence': rand.randint(1, 24),
+            'phone': fake.draw('phone_number'),
             'preferred_locales': ['en-US'],
             'shipping': None,
             'tax_exempt': 'none',
@@ -137,18 +146,18 @@ def customers():
         }
     
     # 3. Anonymous purchasers (no lead trail)
-    for _ in range(anonymous_customers):
-        created_time = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA))
+    for customer_id, invoice_prefix, payment_method_id in customer_ids(anonymous_customers):
+        created_time = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA))
         
         yield {
-            'id': f"cus_{fake.bothify(text='??????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ')}",
+            'id': customer_id,
             'object': 'customer',
             'address': {
-                'line1': fake.street_address(),
-                'city': fake.city(),
-                'state': fake.state_abbr(),
-                'postal_code': fake.postcode(),
-                'country': random.choices([g['country'][:2] for g in GEO_DISTRIBUTION], 
+                'line1': fake.draw('street_address'),
+                'city': fake.draw('city'),
+                'state': fake.draw('state_abbr'),
+                'postal_code': fake.draw('postcode'),
+                'country': rand.choices([g['country'][:2] for g in GEO_DISTRIBUTION], 
                                         weights=[g['weight'] for g in GEO_DISTRIBUTION])[0],
             },
             'balance': 0,
@@ -157,11 +166,11 @@ def customers():
             'default_source': None,
             'delinquent': False,
             'description': None,
-            'email': fake.email(),
-            'invoice_prefix': fake.bothify(text='????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'),
+            'email': fake.draw('email'),
+            'invoice_prefix': invoice_prefix,
             'invoice_settings': {
                 'custom_fields': None,
-                'default_payment_method': f"pm_{fake.bothify(text='????????????????????', letters='abcdefghijklmnopqrstuvwxyz0123456789')}",
+                'default_payment_method': payment_method_id,
                 'footer': None,
                 'rendering_options': None,
             },
@@ -169,9 +178,9 @@ def customers():
             'metadata': {
                 'source': 'anonymous_purchase',
             },
-            'name': fake.name(),
-            'next_invoice_sequence': random.randint(1, 12),
-            'phone': fake.phone_number() if random.random() < 0.7 else None,
+            'name': fake.draw('name'),
+            'next_invoice_sequence': rand.randint(1, 12),
+            'phone': fake.draw('phone_number') if rand.random() < 0.7 else None,
             'preferred_locales': ['en-US'],
             'shipping': None,
             'tax_exempt': 'none',
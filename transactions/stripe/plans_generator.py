@@ -5,29 +5,26 @@ Subscription plans matching product tiers
 import dlt
 import sys
 import os
-
-# Debug the path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
 from shared_config import *
-print(f"Looking for: {config_path}")
-print(f"Exists: {os.path.exists(config_path)}")
-
-from shared_config import *
+from stripe_ids import id_factory
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 from datetime import datetime
 
-from faker import Faker
-fake = Faker()
-Faker.seed(SEED)
+ids = id_factory('stripe', 'plans')
 
 
-@dlt.resource(write_disposition="append", table_name="plans")
+@dlt.resource(write_disposition="append", table_name="plans", **resource_hints('stripe', 'plans'))
+@arrow_rows(arrow_schema('stripe', 'plans'))
 def plans():
     """Generate subscription plans"""
     
-    for product in STRIPE_PRODUCTS:
+    plan_ids = ids.batch('plan_', 2 * len(STRIPE_PRODUCTS), 14)
+    for product, monthly_id, annual_id in zip(STRIPE_PRODUCTS, plan_ids[0::2], plan_ids[1::2]):
         # Monthly plan
         yield {
-            'id': f"plan_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'id': monthly_id,
             'object': 'plan',
             'active': True,
             'amount': product['price_monthly'],
@@ -50,7 +47,7 @@ def plans():
         
         # Annual plan
         yield {
-            'id': f"plan_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'id': annual_id,
             'object': 'plan',
             'active': True,
             'amount': product['price_annual'],
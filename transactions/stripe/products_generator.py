@@ -5,16 +5,19 @@ Product offerings for subscription tiers
 import dlt
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
 from shared_config import *
+from stripe_ids import id_factory
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 from datetime import datetime
 
-from faker import Faker
-fake = Faker()
-Faker.seed(SEED)
+ids = id_factory('stripe', 'products')
 
 
-@dlt.resource(write_disposition="append", table_name="products")
+
+@dlt.resource(write_disposition="append", table_name="products", **resource_hints('stripe', 'products'))
+@arrow_rows(arrow_schema('stripe', 'products'))
 def products():
     """Generate product offerings"""
     
@@ -41,13 +44,14 @@ def products():
         },
     ]
     
-    for tier in tiers:
+    id_pairs = zip(ids.batch('prod_', len(tiers), 14), ids.batch('price_', len(tiers), 18))
+    for tier, (product_id, price_id) in zip(tiers, id_pairs):
         yield {
-            'id': f"prod_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'id': product_id,
             'object': 'product',
             'active': True,
             'created': int(START_DATE.timestamp()),
-            'default_price': f"price_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'default_price': price_id,
             'description': tier['description'],
             'images': [],
             'marketing_features': [],
@@ -5,19 +5,20 @@ Creates subscriptions linked to product SKUs with proper trial tracking
 import dlt
 import pandas as pd
 from datetime import datetime, timedelta
-import random
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
 from shared_config import *
+from rng_streams import random_stream
+from stripe_ids import id_factory, LOWER36
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-from faker import Faker
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
+rand = random_stream('stripe', 'subscriptions', seed=SEED)
+ids = id_factory('stripe', 'subscriptions')
 
 # Calculate total conversions (same as deals)
-total_form_fills = sum(get_daily_metrics(d)['identified_leads'] for d in range(DAYS_OF_DATA))
+total_form_fills = metric_total('identified_leads')
 
 # Trial conversions
 trial_signups = int(total_form_fills * 0.35)
@@ -48,7 +49,19 @@ active_trials = int(trial_non_converted * 0.20)  # 20% still in trial period
 print(f"Active trials (not yet converted): {active_trials}")
 
 
-@dlt.resource(write_disposition="append", table_name="subscriptions")
+def subscription_ids(n):
+    """IDs for n subscriptions, minted in batches: (subscription, customer, payment method, item, invoice)"""
+    return zip(
+        ids.batch('sub_', n, 18),
+        ids.batch('cus_', n, 14),
+        ids.batch('pm_', n, 20, LOWER36),
+        ids.batch('si_', n, 14),
+        ids.batch('in_', n, 18),
+    )
+
+
+@dlt.resource(write_disposition="append", table_name="subscriptions", **resource_hints('stripe', 'subscriptions'))
+@arrow_rows(arrow_schema('stripe', 'subscriptions'))
 def subscriptions():
     """Generate Stripe subscriptions linked to product SKUs"""
     
@@ -58,12 +71,12 @@ def subscriptions():
     # 1. TRIAL SELF-SERVICE CONVERSIONS
     # ==========================================
     
-    for _ in range(trial_ss_conversions):
+    for sub_id, customer_id, payment_method_id, item_id, invoice_id in subscription_ids(trial_ss_conversions):
         # Trial started
-        trial_start = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 20))
+        trial_start = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA - 20))
         
         # Self-service converts on day 12 average
-        conversion_day = int(random.gauss(12, 2))
+        conversion_day = int(rand.gauss(12, 2))
         conversion_day = max(10, min(16, conversion_day))
         
         # Subscription created ON TRIAL START
@@ -76,10 +89,10 @@ def subscriptions():
         conversion_date = trial_start + timedelta(days=conversion_day)
         
         # Select product tier
-        product = select_product_tier('self_service')
+        product = select_product_tier('self_service', rand=rand)
         
         # Billing interval
-        billing_interval = 'year' if random.random() < 0.15 else 'month'
+        billing_interval = 'year' if rand.random() < 0.15 else 'month'
         amount = product['price_annual'] if billing_interval == 'year' else product['price_monthly']
         
         # Current period
@@ -91,7 +104,7 @@ def subscriptions():
             current_period_end = conversion_date + timedelta(days=365)
         
         yield {
-            'id': f"sub_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'id': sub_id,
             'object': 'subscription',
             'application': None,
             'application_fee_percent': None,
@@ -107,9 +120,9 @@ def subscriptions():
             'collection_method': 'charge_automatically',
             'created': int(created_date.timestamp()),
             'currency': 'usd',
-            'customer': f"cus_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'customer': customer_id,
             'days_until_due': None,
-            'default_payment_method': f"pm_{fake.bothify(text='????????????????????', letters='abcdefghijklmnopqrstuvwxyz0123456789')}",
+            'default_payment_method': payment_method_id,
             'default_source': None,
             'default_tax_rates': [],
             'description': None,
@@ -119,7 +132,7 @@ def subscriptions():
             'items': {
                 'object': 'list',
                 'data': [{
-                    'id': f"si_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+                    'id': item_id,
                     'object': 'subscription_item',
                     'created': int(created_date.timestamp()),
                     'metadata': {},
@@ -148,7 +161,7 @@ def subscriptions():
                 'has_more': False,
                 'total_count': 1,
             },
-            'latest_invoice': f"in_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'latest_invoice': invoice_id,
             'livemode': False,
             'metadata': {
                 'trial_path': 'self_service',
@@ -186,12 +199,12 @@ def subscriptions():
     # 2. TRIAL SALES-ASSISTED CONVERSIONS
     # ==========================================
     
-    for _ in range(trial_sa_conversions):
+    for sub_id, customer_id, payment_method_id, item_id, invoice_id in subscription_ids(trial_sa_conversions):
         # Trial started
-        trial_start = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 20))
+        trial_start = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA - 20))
         
         # Sales-assisted converts on day 14 average
-        conversion_day = int(random.gauss(14, 1))
+        conversion_day = int(rand.gauss(14, 1))
         conversion_day = max(12, min(16, conversion_day))
         
         # Subscription created ON TRIAL START
@@ -202,10 +215,10 @@ def subscriptions():
         conversion_date = trial_start + timedelta(days=conversion_day)
         
         # Select product tier
-        product = select_product_tier('sales_assisted')
+        product = select_product_tier('sales_assisted', rand=rand)
         
         # Billing interval (more annual for sales-assisted)
-        billing_interval = 'year' if random.random() < 0.30 else 'month'
+        billing_interval = 'year' if rand.random() < 0.30 else 'month'
         amount = product['price_annual'] if billing_interval == 'year' else product['price_monthly']
         
         # Current period
@@ -217,7 +230,7 @@ def subscriptions():
             current_period_end = conversion_date + timedelta(days=365)
         
         yield {
-            'id': f"sub_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'id': sub_id,
             'object': 'subscription',
             'application': None,
             'application_fee_percent': None,
@@ -233,9 +246,9 @@ def subscriptions():
             'collection_method': 'charge_automatically',
             'created': int(created_date.timestamp()),
             'currency': 'usd',
-            'customer': f"cus_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'customer': customer_id,
             'days_until_due': None,
-            'default_payment_method': f"pm_{fake.bothify(text='????????????????????', letters='abcdefghijklmnopqrstuvwxyz0123456789')}",
+            'default_payment_method': payment_method_id,
             'default_source': None,
             'default_tax_rates': [],
             'description': None,
@@ -245,7 +258,7 @@ def subscriptions():
             'items': {
                 'object': 'list',
                 'data': [{
-                    'id': f"si_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+                    'id': item_id,
                     'object': 'subscription_item',
                     'created': int(created_date.timestamp()),
                     'metadata': {},
@@ -274,7 +287,7 @@ def subscriptions():
                 'has_more': False,
                 'total_count': 1,
             },
-            'latest_invoice': f"in_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'latest_invoice': invoice_id,
             'livemode': False,
             'metadata': {
                 'trial_path': 'sales_assisted',
@@ -314,15 +327,15 @@ def subscriptions():
     
     other_conversions = demo_conversions + pricing_conversions + contact_conversions + whitepaper_conversions
     
-    for _ in range(other_conversions):
+    for sub_id, customer_id, payment_method_id, item_id, invoice_id in subscription_ids(other_conversions):
         # Subscription starts after sales cycle
-        start_date = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA - 60))
+        start_date = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA - 60))
         
         # Select product tier (mixed distribution)
-        product = select_product_tier()
+        product = select_product_tier(rand=rand)
         
         # Billing interval
-        billing_interval = 'year' if random.random() < 0.20 else 'month'
+        billing_interval = 'year' if rand.random() < 0.20 else 'month'
         amount = product['price_annual'] if billing_interval == 'year' else product['price_monthly']
         
         # Current period
@@ -334,7 +347,7 @@ def subscriptions():
             current_period_end = start_date + timedelta(days=365)
         
         yield {
-            'id': f"sub_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'id': sub_id,
             'object': 'subscription',
             'application': None,
             'application_fee_percent': None,
@@ -350,9 +363,9 @@ def subscriptions():
             'collection_method': 'charge_automatically',
             'created': int(start_date.timestamp()),
             'currency': 'usd',
-            'customer': f"cus_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'customer': customer_id,
             'days_until_due': None,
-            'default_payment_method': f"pm_{fake.bothify(text='????????????????????', letters='abcdefghijklmnopqrstuvwxyz0123456789')}",
+            'default_payment_method': payment_method_id,
             'default_source': None,
             'default_tax_rates': [],
             'description': None,
@@ -362,7 +375,7 @@ def subscriptions():
             'items': {
                 'object': 'list',
                 'data': [{
-                    'id': f"si_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+                    'id': item_id,
                     'object': 'subscription_item',
                     'created': int(start_date.timestamp()),
                     'metadata': {},
@@ -391,7 +404,7 @@ def subscriptions():
                 'has_more': False,
                 'total_count': 1,
             },
-            'latest_invoice': f"in_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'latest_invoice': invoice_id,
             'livemode': False,
             'metadata': {
                 'trial_path': None,
@@ -429,24 +442,24 @@ def subscriptions():
     # 4. ACTIVE TRIALS (Not Yet Converted)
     # ==========================================
     
-    for _ in range(active_trials):
+    for sub_id, customer_id, payment_method_id, item_id, invoice_id in subscription_ids(active_trials):
         # Trial started recently
-        days_ago = random.randint(1, 14)
+        days_ago = rand.randint(1, 14)
         trial_start = datetime.now() - timedelta(days=days_ago)
         trial_end = trial_start + timedelta(days=14)
         
         # Determine trial path
-        trial_path = get_trial_path()
+        trial_path = get_trial_path(rand)
         
         # Select product tier
-        product = select_product_tier(trial_path)
+        product = select_product_tier(trial_path, rand=rand)
         
         # Billing interval
         billing_interval = 'month'  # Default for trials
         amount = product['price_monthly']
         
         yield {
-            'id': f"sub_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'id': sub_id,
             'object': 'subscription',
             'application': None,
             'application_fee_percent': None,
@@ -462,9 +475,9 @@ def subscriptions():
             'collection_method': 'charge_automatically',
             'created': int(trial_start.timestamp()),
             'currency': 'usd',
-            'customer': f"cus_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'customer': customer_id,
             'days_until_due': None,
-            'default_payment_method': f"pm_{fake.bothify(text='????????????????????', letters='abcdefghijklmnopqrstuvwxyz0123456789')}",
+            'default_payment_method': payment_method_id,
             'default_source': None,
             'default_tax_rates': [],
             'description': None,
@@ -474,7 +487,7 @@ def subscriptions():
             'items': {
                 'object': 'list',
                 'data': [{
-                    'id': f"si_{fake.bothify(text='??????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+                    'id': item_id,
                     'object': 'subscription_item',
                     'created': int(trial_start.timestamp()),
                     'metadata': {},
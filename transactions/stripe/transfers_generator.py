@@ -4,41 +4,50 @@ Platform fee transfers to connected accounts
 """
 import dlt
 from datetime import datetime, timedelta
-import random
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'digital_analytics'))
 from shared_config import *
+from rng_streams import random_stream
+from stripe_ids import id_factory
+from arrow_chunks import arrow_rows
+from table_schemas import arrow_schema, resource_hints
 
-from faker import Faker
-fake = Faker()
-Faker.seed(SEED)
-random.seed(SEED)
+rand = random_stream('stripe', 'transfers', seed=SEED)
+ids = id_factory('stripe', 'transfers')
 
 
-@dlt.resource(write_disposition="append", table_name="transfers")
+@dlt.resource(write_disposition="append", table_name="transfers", **resource_hints('stripe', 'transfers'))
+@arrow_rows(arrow_schema('stripe', 'transfers'))
 def transfers():
     """Generate platform transfers for marketplace transactions"""
     
     # ~5% of transactions involve partner/marketplace transfers
-    total_transactions = sum(get_daily_metrics(d)['transactions'] for d in range(DAYS_OF_DATA))
+    total_transactions = metric_total('transactions')
     transfer_count = int(total_transactions * 0.05)
     
-    for _ in range(transfer_count):
-        transfer_date = START_DATE + timedelta(days=random.randint(0, DAYS_OF_DATA))
-        amount = int(AVERAGE_TRANSACTION_VALUE * random.uniform(0.1, 0.3) * 100)  # 10-30% platform fee
+    id_rows = zip(
+        ids.batch('tr_', transfer_count, 18),
+        ids.batch('txn_', transfer_count, 18),
+        ids.batch('acct_', transfer_count, 16),
+        ids.batch('py_', transfer_count, 18),
+        ids.batch('ch_', transfer_count, 18),
+    )
+    for transfer_id, balance_transaction_id, account_id, payment_id, charge_id in id_rows:
+        transfer_date = START_DATE + timedelta(days=rand.randint(0, DAYS_OF_DATA))
+        amount = int(AVERAGE_TRANSACTION_VALUE * rand.uniform(0.1, 0.3) * 100)  # 10-30% platform fee
         
         yield {
-            'id': f"tr_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'id': transfer_id,
             'object': 'transfer',
             'amount': amount,
             'amount_reversed': 0,
-            'balance_transaction': f"txn_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'balance_transaction': balance_transaction_id,
             'created': int(transfer_date.timestamp()),
             'currency': 'usd',
-            'description': random.choice(['Platform fee', 'Partner payout', 'Referral commission', None]),
-            'destination': f"acct_{fake.bothify(text='????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
-            'destination_payment': f"py_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
+            'description': rand.choice(['Platform fee', 'Partner payout', 'Referral commission', None]),
+            'destination': account_id,
+            'destination_payment': payment_id,
             'livemode': False,
             'metadata': {},
             'reversals': {
@@ -46,12 +55,12 @@ def transfers():
                 'data': [],
                 'has_more': False,
                 'total_count': 0,
-                'url': f"/v1/transfers/tr_{fake.bothify(text='??????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ')}/reversals",
+                'url': f"/v1/transfers/{transfer_id}/reversals",
             },
             'reversed': False,
-            'source_transaction': f"ch_{fake.bothify(text='??????????????????', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')}",
-            'source_type': random.choice(['card', 'bank_account']),
-            'transfer_group': f"ORDER_{random.randint(1000, 99999)}",
+            'source_transaction': charge_id,
+            'source_type': rand.choice(['card', 'bank_account']),
+            'transfer_group': f"ORDER_{rand.randint(1000, 99999)}",
             '_generated_at': datetime.now().isoformat(),
         }
 
@@ -65,4 +74,4 @@ if __name__ == "__main__":
     
     load_info = pipeline.run(transfers(), loader_file_format="parquet")
     
-    print(f"\n✓ Stripe transfers: ~{int(sum(get_daily_metrics(d)['transactions'] for d in range(DAYS_OF_DATA)) * 0.05)} platform payouts")
+    print(f"\n✓ Stripe transfers: ~{int(metric_total('transactions') * 0.05)} platform payouts")
@@ -4,6 +4,15 @@ import pyarrow.compute as pc
 from typing import Iterator
 from datetime import datetime, timedelta
 
+# Opt-in HyperLogLog distinct counts for the event-level traffic metrics (DuckDB's
+# approx_count_distinct): bounded memory instead of exact COUNT(DISTINCT) hash sets
+APPROX_DISTINCT = False
+
+
+def count_distinct(expr: str, approx: bool = APPROX_DISTINCT) -> str:
+    """COUNT(DISTINCT expr), or its HLL approximation"""
+    return f"approx_count_distinct({expr})" if approx else f"COUNT(DISTINCT {expr})"
+
 # ============================================================================
 # CONFORMED DIMENSIONS
 # ============================================================================
@@ -284,10 +293,11 @@ def entity_customer() -> Iterator[pa.Table]:
 
 
 @dlt.resource(name="entity_campaign", write_disposition="replace", primary_key="campaign_key")
-def entity_campaign() -> Iterator[pa.Table]:
+def entity_campaign(approx_distinct: bool = APPROX_DISTINCT) -> Iterator[pa.Table]:
     """
     ECM: Campaign entity with performance metrics
     Supports CAC, ROAS, attribution analysis
+    approx_distinct: HLL estimates for unique_users / sessions / engaged_sessions
     """
     pipeline = dlt.pipeline(
         pipeline_name="staging",
@@ -295,7 +305,8 @@ def entity_campaign() -> Iterator[pa.Table]:
         dataset_name="analytics_staging"
     )
     
-    query = """
+    engaged_session = "CASE WHEN ep.param_key = 'session_engaged' AND ep.value = '1' THEN e.session_id END"
+    query = f"""
     WITH campaign_base AS (
         SELECT * FROM dim_campaign
     ),
@@ -303,12 +314,9 @@ def entity_campaign() -> Iterator[pa.Table]:
     traffic_metrics AS (
         SELECT
             dc.campaign_key,
-            COUNT(DISTINCT e.user_pseudo_id) as unique_users,
-            COUNT(DISTINCT e.session_id) as sessions,
-            COUNT(DISTINCT CASE 
-                WHEN ep.param_key = 'session_engaged' AND ep.value = '1' 
-                THEN e.session_id 
-            END) as engaged_sessions,
+            {count_distinct('e.user_pseudo_id', approx_distinct)} as unique_users,
+            {count_distinct('e.session_id', approx_distinct)} as sessions,
+            {count_distinct(engaged_session, approx_distinct)} as engaged_sessions,
             COUNT(*) as events
         FROM dim_campaign dc
         JOIN ga4_staging.events e ON MD5(CONCAT(